@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Fold the host-side preprocessing of YOLOX / RTMPose into their ONNX graphs.
+
+The workers spend CPU on every frame casting the letterboxed / warped uint8
+image to float32, normalizing it with mean / std and transposing it from HWC
+to NCHW before each session run. This prepends those ops to the graph so the
+exported model takes the uint8 NHWC image (N, H, W, 3) directly and the math
+runs in ONNX Runtime's kernels:
+
+  uint8 NHWC -> Transpose NCHW -> Cast(float) -> [Gather BGR->RGB] -> [Sub mean, Mul 1/std]
+
+Defaults reproduce what the services feed today: YOLOX gets the raw BGR
+pixels, RTMPose BGR pixels normalized with rtmlib's mean / std (rtmlib does
+not swap channels, so neither does this unless --bgr-to-rgb is given).
+
+``--dynamic-batch`` also makes the batch axis of a batch-1 export (the
+stock rtmpose-m zip) dynamic, so BatchedRTMPose runs all persons of a frame
+in one session run instead of one run per box; the result is checked
+against per-item runs before it is written.
+
+``--nms`` additionally appends box decoding, objectness x person score and
+NonMaxSuppression to a raw-head YOLOX export (output (1, A, 5 + classes)),
+producing rtmlib's (1, K, 5) ``dets`` layout. The rtmlib zips already end in
+NMS, so this is only needed for plain YOLOX exports; it fixes the batch to 1.
+
+The YOLOX / RTMPose workers detect a uint8 model input and skip their own
+preprocessing; point MODEL_URL at the output file.
+
+Usage:
+  python cmds/fold_preprocess.py --kind yolox --out models/yolox_m_folded.onnx
+  python cmds/fold_preprocess.py --kind rtmpose --model models/rtmpose_m_int8.onnx \
+      --out models/rtmpose_m_int8_folded.onnx
+  python cmds/fold_preprocess.py --kind rtmpose --dynamic-batch --out models/rtmpose_m_folded_dyn.onnx
+  python cmds/fold_preprocess.py --kind yolox --model yolox_m_raw.onnx --nms --out models/yolox_m_nms.onnx
+"""
+
+import os
+import argparse
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+from rtmlib.tools.file import download_checkpoint
+
+DEFAULT_MODELS = {
+    'yolox': 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+             'yolox_m_8xb8-300e_humanart-c2c7a14a.zip',
+    'rtmpose': 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+               'rtmpose-m_simcc-body7_pt-body7_420e-256x192-e48f03d0_20230504.zip',
+}
+# rtmlib's RTMPose defaults; YOLOX is fed unnormalized
+DEFAULT_MEAN = {'yolox': None, 'rtmpose': (123.675, 116.28, 103.53)}
+DEFAULT_STD = {'yolox': None, 'rtmpose': (58.395, 57.12, 57.375)}
+
+PREFIX = 'fold_'
+INPUT_NAME = 'image_uint8'
+
+
+def resolve_model(path_or_url):
+    return path_or_url if os.path.exists(path_or_url) else download_checkpoint(path_or_url)
+
+
+def parse_floats(value):
+    return None if value is None else tuple(float(v) for v in value.split(','))
+
+
+def _dim(dim):
+    """Copy an ONNX dimension (static value or symbolic name)."""
+    return dim.dim_value if dim.HasField('dim_value') else (dim.dim_param or None)
+
+
+def _const(name, array):
+    return numpy_helper.from_array(np.asarray(array), name=PREFIX + name)
+
+
+def fold_input(model, mean=None, std=None, bgr_to_rgb=False, batch=None):
+    """Replace the NCHW float input with a uint8 NHWC input plus the preprocessing ops."""
+    graph = model.graph
+    initializers = {init.name for init in graph.initializer}
+    inputs = [inp for inp in graph.input if inp.name not in initializers]
+    if len(inputs) != 1:
+        raise ValueError(f"expected a single image input, found {[inp.name for inp in inputs]}")
+    old = inputs[0]
+    if old.type.tensor_type.elem_type == TensorProto.UINT8:
+        raise ValueError(f"input '{old.name}' is already uint8, model is folded")
+
+    n, c, h, w = (_dim(d) for d in old.type.tensor_type.shape.dim)
+    if c not in (3, None):
+        raise ValueError(f"expected a 3-channel NCHW input, got {c} channels")
+    new_input = helper.make_tensor_value_info(INPUT_NAME, TensorProto.UINT8,
+                                              [batch or n or 'batch', h, w, 3])
+
+    # transpose the uint8 tensor first: cheaper to move, and per-channel Sub / Mul
+    # broadcast over contiguous H*W planes instead of a 3-wide inner axis
+    nodes, consts = [], []
+    nodes.append(helper.make_node('Transpose', [INPUT_NAME], [PREFIX + 'nchw'], perm=[0, 3, 1, 2],
+                                  name=PREFIX + 'to_nchw'))
+    steps = [('Cast', [], dict(to=TensorProto.FLOAT))]
+    if bgr_to_rgb:
+        consts.append(_const('rgb_order', np.array([2, 1, 0], dtype=np.int64)))
+        steps.append(('Gather', [PREFIX + 'rgb_order'], dict(axis=1)))
+    if mean is not None:
+        consts.append(_const('mean', np.asarray(mean, dtype=np.float32).reshape(1, 3, 1, 1)))
+        steps.append(('Sub', [PREFIX + 'mean'], {}))
+    if std is not None:
+        consts.append(_const('inv_std', (1.0 / np.asarray(std, dtype=np.float32)).reshape(1, 3, 1, 1)))
+        steps.append(('Mul', [PREFIX + 'inv_std'], {}))
+
+    x = PREFIX + 'nchw'
+    for i, (op, extra_inputs, attrs) in enumerate(steps):
+        # the last op writes the original input tensor, so the rest of the graph is untouched
+        out = old.name if i == len(steps) - 1 else PREFIX + op.lower()
+        nodes.append(helper.make_node(op, [x] + extra_inputs, [out], name=PREFIX + op.lower(), **attrs))
+        x = out
+
+    graph.input.remove(old)
+    graph.input.insert(0, new_input)
+    graph.initializer.extend(consts)
+    existing = list(graph.node)
+    del graph.node[:]
+    graph.node.extend(nodes + existing)
+    return h, w
+
+
+def make_batch_dynamic(model, name='batch'):
+    """Turn the static batch axis of a batch-1 export into a symbolic one.
+
+    The input and every output get ``name`` as their first dimension, the
+    static intermediate shapes are dropped, and Reshape targets that
+    hard-code the batch (a leading 1 in an initializer or Constant) copy it
+    from their input instead (0). Returns the number of rewritten targets;
+    ``check_dynamic_batch`` confirms the result on real data.
+    """
+    graph = model.graph
+    initializers = {init.name: init for init in graph.initializer}
+    for value in list(graph.input) + list(graph.output):
+        if value.name not in initializers and value.type.tensor_type.shape.dim:
+            dim = value.type.tensor_type.shape.dim[0]
+            dim.Clear()
+            dim.dim_param = name
+    del graph.value_info[:]
+
+    constants = {node.output[0]: node for node in graph.node if node.op_type == 'Constant'}
+    rewritten = 0
+    for i, node in enumerate(graph.node):
+        if node.op_type != 'Reshape' or len(node.input) < 2:
+            continue
+        if node.input[1] in initializers:
+            target = numpy_helper.to_array(initializers[node.input[1]])
+        elif node.input[1] in constants:
+            target = numpy_helper.to_array(constants[node.input[1]].attribute[0].t)
+        else:
+            continue  # computed at run time, follows the input already
+        if target.ndim != 1 or len(target) < 2 or target[0] != 1:
+            continue
+        target = target.copy()
+        target[0] = 0
+        # a new constant per node: the original may be shared with other ops
+        shape_name = f"{PREFIX}batch_shape_{i}"
+        graph.initializer.append(numpy_helper.from_array(target, name=shape_name))
+        node.input[1] = shape_name
+        rewritten += 1
+    return rewritten
+
+
+def check_dynamic_batch(model, batch=3, seed=0):
+    """Max abs difference between one run on ``batch`` random inputs and ``batch`` single runs."""
+    import onnxruntime as ort
+
+    session = ort.InferenceSession(model.SerializeToString(), providers=['CPUExecutionProvider'])
+    model_input = session.get_inputs()[0]
+    shape = [batch] + [d if isinstance(d, int) else 1 for d in model_input.shape[1:]]
+    rng = np.random.default_rng(seed)
+    if model_input.type == 'tensor(uint8)':
+        data = rng.integers(0, 256, shape, dtype=np.uint8)
+    else:
+        data = rng.random(shape, dtype=np.float32)
+    batched = session.run(None, {model_input.name: data})
+    singles = [session.run(None, {model_input.name: data[i:i + 1]}) for i in range(batch)]
+    return max(float(np.abs(out - np.concatenate([single[k] for single in singles])).max(initial=0.0))
+               for k, out in enumerate(batched))
+
+
+def append_yolox_nms(model, input_size, nms_thr=0.45, score_thr=0.3, max_det=300):
+    """Decode a raw YOLOX head (1, A, 5 + C) and append person NMS -> dets (1, K, 5)."""
+    graph = model.graph
+    if len(graph.output) != 1:
+        raise ValueError("--nms expects a raw YOLOX export with a single (1, A, 5 + C) output")
+    opset = max(op.version for op in model.opset_import if op.domain in ('', 'ai.onnx'))
+    if opset < 11:
+        raise ValueError(f"--nms needs opset >= 11, model has {opset}")
+    raw = graph.output[0].name
+
+    in_h, in_w = input_size
+    grids, strides = [], []
+    for stride in (8, 16, 32):
+        hsize, wsize = in_h // stride, in_w // stride
+        xv, yv = np.meshgrid(np.arange(wsize), np.arange(hsize))
+        grids.append(np.stack((xv, yv), 2).reshape(-1, 2))
+        strides.append(np.full((hsize * wsize, 1), stride))
+    consts = [
+        _const('grids', np.concatenate(grids)[None].astype(np.float32)),
+        _const('strides', np.concatenate(strides)[None].astype(np.float32)),
+        _const('half', np.array(0.5, dtype=np.float32)),
+        _const('axes', np.array([2], dtype=np.int64)),
+        _const('box_index', np.array(2, dtype=np.int64)),
+        _const('max_det', np.array([max_det], dtype=np.int64)),
+        _const('nms_thr', np.array([nms_thr], dtype=np.float32)),
+        _const('score_thr', np.array([score_thr], dtype=np.float32)),
+    ]
+    for name, (start, end) in {'xy': (0, 2), 'wh': (2, 4), 'obj': (4, 5), 'person': (5, 6)}.items():
+        consts += [_const(f'{name}_start', np.array([start], dtype=np.int64)),
+                   _const(f'{name}_end', np.array([end], dtype=np.int64))]
+
+    def slice_node(name):
+        return helper.make_node('Slice', [raw, PREFIX + f'{name}_start', PREFIX + f'{name}_end', PREFIX + 'axes'],
+                                [PREFIX + f'raw_{name}'], name=PREFIX + f'slice_{name}')
+
+    p = PREFIX
+    nodes = [slice_node(name) for name in ('xy', 'wh', 'obj', 'person')] + [
+        helper.make_node('Add', [p + 'raw_xy', p + 'grids'], [p + 'xy_grid']),
+        helper.make_node('Mul', [p + 'xy_grid', p + 'strides'], [p + 'xy']),
+        helper.make_node('Exp', [p + 'raw_wh'], [p + 'wh_exp']),
+        helper.make_node('Mul', [p + 'wh_exp', p + 'strides'], [p + 'wh']),
+        helper.make_node('Mul', [p + 'wh', p + 'half'], [p + 'half_wh']),
+        helper.make_node('Sub', [p + 'xy', p + 'half_wh'], [p + 'x1y1']),
+        helper.make_node('Add', [p + 'xy', p + 'half_wh'], [p + 'x2y2']),
+        helper.make_node('Concat', [p + 'x1y1', p + 'x2y2'], [p + 'boxes'], axis=2),
+        helper.make_node('Mul', [p + 'raw_obj', p + 'raw_person'], [p + 'scores']),            # (1, A, 1)
+        helper.make_node('Transpose', [p + 'scores'], [p + 'scores_t'], perm=[0, 2, 1]),      # (1, 1, A)
+        helper.make_node('NonMaxSuppression',
+                         [p + 'boxes', p + 'scores_t', p + 'max_det', p + 'nms_thr', p + 'score_thr'],
+                         [p + 'selected'], center_point_box=0),                               # (K, 3)
+        helper.make_node('Gather', [p + 'selected', p + 'box_index'], [p + 'keep'], axis=1),  # (K,)
+        helper.make_node('Concat', [p + 'boxes', p + 'scores'], [p + 'all_dets'], axis=2),    # (1, A, 5)
+        helper.make_node('Gather', [p + 'all_dets', p + 'keep'], ['dets'], axis=1),           # (1, K, 5)
+    ]
+    graph.node.extend(nodes)
+    graph.initializer.extend(consts)
+    del graph.output[:]
+    graph.output.append(helper.make_tensor_value_info('dets', TensorProto.FLOAT, [1, 'num_dets', 5]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fold preprocessing (and optionally NMS) into an ONNX model")
+    parser.add_argument('--kind', choices=('yolox', 'rtmpose'), required=True)
+    parser.add_argument('--model', default=None, help='onnx file or rtmlib zip url')
+    parser.add_argument('--mean', default=None, help='comma separated, default: what rtmlib uses for --kind')
+    parser.add_argument('--std', default=None)
+    parser.add_argument('--bgr-to-rgb', action='store_true', help='swap channels in the graph (rtmlib does not)')
+    parser.add_argument('--dynamic-batch', action='store_true', help='make a static batch-1 axis dynamic')
+    parser.add_argument('--nms', action='store_true', help='YOLOX only: append decoding + person NMS')
+    parser.add_argument('--input-size', default=None, help='YOLOX h,w for --nms if the model input is dynamic')
+    parser.add_argument('--nms-thr', type=float, default=0.45)
+    parser.add_argument('--score-thr', type=float, default=0.3)
+    parser.add_argument('--max-det', type=int, default=300)
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+
+    if args.nms and args.kind != 'yolox':
+        parser.error("--nms is only supported for --kind yolox")
+    if args.nms and args.dynamic_batch:
+        parser.error("--nms fixes the batch to 1, it can't be combined with --dynamic-batch")
+
+    model_path = resolve_model(args.model or DEFAULT_MODELS[args.kind])
+    model = onnx.load(model_path)
+    mean = parse_floats(args.mean) if args.mean else DEFAULT_MEAN[args.kind]
+    std = parse_floats(args.std) if args.std else DEFAULT_STD[args.kind]
+
+    h, w = fold_input(model, mean=mean, std=std, bgr_to_rgb=args.bgr_to_rgb, batch=1 if args.nms else None)
+    if args.nms:
+        input_size = tuple(int(v) for v in args.input_size.split(',')) if args.input_size else (h, w)
+        if not all(isinstance(v, int) and v > 0 for v in input_size):
+            parser.error("model input is dynamic, pass --input-size h,w")
+        append_yolox_nms(model, input_size, args.nms_thr, args.score_thr, args.max_det)
+    if args.dynamic_batch:
+        rewritten = make_batch_dynamic(model)
+        max_diff = check_dynamic_batch(model)
+        print(f"Dynamic batch: {rewritten} Reshape targets rewritten, batch of 3 vs. single runs max diff {max_diff:.1e}")
+        if max_diff > 1e-3:
+            raise SystemExit("the graph does not batch correctly (a hard-coded batch this tool can't rewrite), "
+                             "export the model with a dynamic batch axis instead")
+
+    onnx.helper.set_model_props(model, {
+        **{p.key: p.value for p in model.metadata_props},
+        'stride_preprocess': 'uint8_nhwc' + ('_rgb' if args.bgr_to_rgb else '_bgr') + ('_nms' if args.nms else '')
+                             + ('_dynbatch' if args.dynamic_batch else ''),
+    })
+    onnx.checker.check_model(model)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    onnx.save(model, args.out)
+    print(f"Wrote {args.out}: input {INPUT_NAME} uint8 NHWC, mean={mean}, std={std}, "
+          f"bgr_to_rgb={args.bgr_to_rgb}, nms={args.nms}, dynamic_batch={args.dynamic_batch}")
+    print(f"Compare with: python test_scripts/test_folded_preprocess.py --kind {args.kind} "
+          f"--model {model_path} --folded {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Static INT8 quantization of the YOLOX / RTMPose ONNX models for CPU-only nodes.
+
+Calibration tensors are built from a recorded clip (e.g. the output of
+analyzer/save_rtsp_frames.py) with rtmlib's own preprocessing, so the
+quantization ranges match what the workers feed at run time. RTMPose is
+calibrated on person crops found by the FP32 detector. The result is a QDQ
+ONNX file that the services load like any other model:
+
+  MODEL_URL=/models/yolox_m_int8.onnx BACKEND=onnxruntime DEVICES=cpu
+
+Usage:
+  python cmds/quantize_int8.py --kind yolox --video capture.mp4 --out models/yolox_m_int8.onnx
+  python cmds/quantize_int8.py --kind rtmpose --video capture.mp4 --out models/rtmpose_m_int8.onnx \
+      --input-size 192,256
+"""
+
+import os
+import argparse
+import tempfile
+
+import cv2
+import numpy as np
+from onnxruntime.quantization import (CalibrationDataReader, CalibrationMethod, QuantFormat,
+                                      QuantType, quantize_static)
+from onnxruntime.quantization.shape_inference import quant_pre_process
+from rtmlib.tools.file import download_checkpoint
+from rtmlib.tools.object_detection import YOLOX
+from rtmlib.tools.pose_estimation import RTMPose
+
+DEFAULT_MODELS = {
+    'yolox': 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+             'yolox_m_8xb8-300e_humanart-c2c7a14a.zip',
+    'rtmpose': 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+               'rtmpose-m_simcc-body7_pt-body7_420e-256x192-e48f03d0_20230504.zip',
+}
+CALIBRATION_METHODS = {
+    'minmax': CalibrationMethod.MinMax,
+    'entropy': CalibrationMethod.Entropy,
+    'percentile': CalibrationMethod.Percentile,
+}
+
+
+def resolve_model(path_or_url):
+    return path_or_url if os.path.exists(path_or_url) else download_checkpoint(path_or_url)
+
+
+def sample_frames(video, count, skip=0):
+    """``count`` frames spread evenly over the clip, after ``skip`` frames, decoded one at a time."""
+    cap = cv2.VideoCapture(video)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or count
+    picks = set(np.linspace(skip, max(skip, total - 1), count).astype(int).tolist())
+    read, idx = 0, 0
+    try:
+        while read < len(picks):
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if idx in picks:
+                read += 1
+                yield frame
+            idx += 1
+    finally:
+        cap.release()
+    if not read:
+        raise RuntimeError(f"No frames read from {video}")
+
+
+def as_boxes(output):
+    """rtmlib versions return either boxes or (boxes, scores)."""
+    boxes = output[0] if isinstance(output, tuple) else output
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+
+class ToolCalibrationReader(CalibrationDataReader):
+    """Feeds preprocessed NCHW float32 tensors, one per calibration sample.
+
+    ``tensors`` is consumed as the calibrator asks for samples; ``count``
+    is the number fed so far. This does not bound memory: ONNX Runtime's
+    calibrator keeps the activations of every sample (all of them for the
+    entropy and percentile methods), so lower ``--num-calib`` if it runs
+    out of memory.
+    """
+
+    def __init__(self, input_name, tensors):
+        self.input_name = input_name
+        self._tensors = iter(tensors)
+        self.count = 0
+
+    def get_next(self):
+        tensor = next(self._tensors, None)
+        if tensor is None:
+            return None
+        self.count += 1
+        return {self.input_name: tensor}
+
+
+def yolox_tensors(model_path, frames, input_size):
+    tool = YOLOX(model_path, model_input_size=input_size, backend='onnxruntime', device='cpu')
+    for frame in frames:
+        img, _ = tool.preprocess(frame)
+        yield np.ascontiguousarray(img.transpose(2, 0, 1)[None], dtype=np.float32)
+
+
+def rtmpose_tensors(model_path, det_model_path, frames, input_size, max_persons):
+    tool = RTMPose(model_path, model_input_size=input_size, backend='onnxruntime', device='cpu')
+    detector = YOLOX(det_model_path, model_input_size=(640, 640), backend='onnxruntime', device='cpu')
+    for frame in frames:
+        for bbox in as_boxes(detector(frame))[:max_persons]:
+            img, _, _ = tool.preprocess(frame, bbox)
+            yield np.ascontiguousarray(img.transpose(2, 0, 1)[None], dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Static INT8 quantization of YOLOX / RTMPose")
+    parser.add_argument('--kind', choices=('yolox', 'rtmpose'), required=True)
+    parser.add_argument('--model', default=None, help='FP32 onnx file or rtmlib zip url')
+    parser.add_argument('--det-model', default=DEFAULT_MODELS['yolox'], help='detector for RTMPose crops')
+    parser.add_argument('--video', required=True, help='recorded clip for calibration')
+    parser.add_argument('--num-calib', type=int, default=200, help='calibration frames')
+    parser.add_argument('--skip', type=int, default=0, help='frames to skip at the start of the clip')
+    parser.add_argument('--max-persons', type=int, default=8, help='RTMPose crops per calibration frame')
+    parser.add_argument('--input-size', default=None, help='YOLOX h,w (640,640) or RTMPose w,h (192,256)')
+    parser.add_argument('--method', choices=tuple(CALIBRATION_METHODS), default='percentile')
+    parser.add_argument('--per-channel', action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument('--reduce-range', action='store_true', help='7-bit weights for pre-VNNI CPUs')
+    parser.add_argument('--exclude-nodes', default='', help='comma separated node names kept in FP32')
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+
+    model_path = resolve_model(args.model or DEFAULT_MODELS[args.kind])
+    default_size = '640,640' if args.kind == 'yolox' else '192,256'
+    input_size = tuple(int(v) for v in (args.input_size or default_size).split(','))
+
+    frames = sample_frames(args.video, args.num_calib, args.skip)
+    print(f"Calibrating {args.kind} on up to {args.num_calib} frames from {args.video} ({args.method})")
+    if args.kind == 'yolox':
+        tensors = yolox_tensors(model_path, frames, input_size)
+    else:
+        tensors = rtmpose_tensors(model_path, resolve_model(args.det_model), frames, input_size,
+                                  args.max_persons)
+
+    import onnxruntime as ort
+    input_name = ort.InferenceSession(model_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+    reader = ToolCalibrationReader(input_name, tensors)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        # shape inference + graph optimization, recommended before static quantization
+        prepped = os.path.join(tmp, 'prepped.onnx')
+        quant_pre_process(model_path, prepped, skip_symbolic_shape=True)
+
+        quantize_static(
+            prepped,
+            args.out,
+            reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=args.per_channel,
+            reduce_range=args.reduce_range,
+            calibrate_method=CALIBRATION_METHODS[args.method],
+            nodes_to_exclude=[n for n in args.exclude_nodes.split(',') if n],
+        )
+
+    print(f"{reader.count} calibration samples")
+    size_fp32 = os.path.getsize(model_path) / 1e6
+    size_int8 = os.path.getsize(args.out) / 1e6
+    print(f"Wrote {args.out}: {size_int8:.1f} MB (FP32 {size_fp32:.1f} MB)")
+    print(f"Evaluate with: python test_scripts/test_int8_accuracy.py --video {args.video} "
+          f"--{args.kind}-int8 {args.out}")
+
+
+if __name__ == "__main__":
+    main()
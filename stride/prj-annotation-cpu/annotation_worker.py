@@ -30,8 +30,10 @@ class AnnotationWorker(BaseWorker):
         track_scores = input[1]['results']['track_scores']
         scale = input[1]['results']['scale']
         keypoints = input[2]['results']['keypoints']
+        keypoint_scale = input[2]['results'].get('scale', 1)
 
-        annotated_frame = self.model(frame=frame, frame_id=frame_id, bboxes=bboxes, track_ids=track_ids, track_scores=track_scores, scale=scale, keypoints=keypoints)
+        annotated_frame = self.model(frame=frame, frame_id=frame_id, bboxes=bboxes, track_ids=track_ids, track_scores=track_scores, scale=scale, keypoints=keypoints,
+                                     keypoint_scale=keypoint_scale)
 
         return {'img': annotated_frame}
 
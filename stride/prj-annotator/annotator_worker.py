@@ -30,6 +30,7 @@ class AnnotatorWorker(BaseWorker):
         track_scores = input[1]['results']['track_scores']
         scale = input[1]['results']['scale']
         keypoints = input[2]['results']['keypoints']
+        keypoint_scale = input[2]['results'].get('scale', 1)
 
         if len(input) > 3:
             proj_matrix = input[3]['results']['proj_matrix'] if 'proj_matrix' in input[3]['results'] else None
@@ -41,7 +42,7 @@ class AnnotatorWorker(BaseWorker):
             for track_id, numbers in zip(input[4]['results']['track_ids'], input[4]['results']['numbers']) if numbers != -1
         }
 
-        annotated_frame = self.model(frame=frame, frame_id=frame_id, bboxes=bboxes, track_ids=track_ids, track_scores=track_scores, scale=scale, keypoints=keypoints, 
+        annotated_frame = self.model(frame=frame, frame_id=frame_id, bboxes=bboxes, track_ids=track_ids, track_scores=track_scores, scale=scale, keypoints=keypoints, keypoint_scale=keypoint_scale,
                                      proj_matrix=proj_matrix, jersey_mapper=jersey_mapper)
 
         return {'img': annotated_frame}
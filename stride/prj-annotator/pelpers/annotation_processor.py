@@ -69,6 +69,7 @@ class AnnotationData:
     track_scores: List[float] = field(default_factory=list)
     bboxes: List[List[float]] = field(default_factory=list)
     scale: float = 1.0
+    keypoint_scale: float = 1.0  # RTMPose publishes keypoints in full-frame coordinates
     arrival_ts: float = field(default_factory=time.time)
     proj_matrix: Optional[np.ndarray] = None  # 2x3 matrix for ECC translation
     jersey_mapper: Dict[int, int] = field(default_factory=dict)  # track_id -> jersey number
@@ -540,8 +541,8 @@ class AnnotationProcessor:
             for x, y in person_kps:  # person_kps is a list of (x, y) tuples
                 keypoints.append(
                     Keypoint(
-                        x=x / annotation.scale,
-                        y=y / annotation.scale
+                        x=x / annotation.keypoint_scale,
+                        y=y / annotation.keypoint_scale
                     )
                 )
             scaled_skeletons.append(Skeleton(keypoints=keypoints))
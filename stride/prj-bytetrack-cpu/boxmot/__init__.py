@@ -8,16 +8,19 @@ from boxmot.trackers.bytetrack.bytetrack import ByteTrack
 # from boxmot.trackers.deepocsort.deepocsort import DeepOcSort
 # from boxmot.trackers.hybridsort.hybridsort import HybridSort
 from boxmot.trackers.ocsort.ocsort import OcSort
+from boxmot.trackers.ocsort.vectorized_ocsort import VectorizedOcSort
 # from boxmot.trackers.strongsort.strongsort import StrongSort
 
 TRACKERS = [
     "bytetrack",
     "ocsort",
+    "vectorized_ocsort",
 ]
 
 __all__ = (
     "__version__",
     "OcSort",
+    "VectorizedOcSort",
     "ByteTrack",
     "create_tracker",
     "get_tracker_config",
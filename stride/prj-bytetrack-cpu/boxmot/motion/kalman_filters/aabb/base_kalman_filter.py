@@ -26,15 +26,21 @@ class BaseKalmanFilter:
     Base class for Kalman filters tracking bounding boxes in image space.
     """
 
-    def __init__(self, ndim: int):
+    def __init__(self, ndim: int, dtype=np.float64):
         self.ndim = ndim
         self.dt = 1.0
+        self.dtype = np.dtype(dtype)
 
         # Create Kalman filter model matrices.
-        self._motion_mat = np.eye(2 * ndim, 2 * ndim)  # State transition matrix
+        self._motion_mat = np.eye(2 * ndim, 2 * ndim, dtype=self.dtype)  # State transition matrix
         for i in range(ndim):
             self._motion_mat[i, ndim + i] = self.dt
-        self._update_mat = np.eye(ndim, 2 * ndim)  # Observation matrix
+        self._update_mat = np.eye(ndim, 2 * ndim, dtype=self.dtype)  # Observation matrix
+        # constant transposes and diagonal indices for the batched (multi_*) paths
+        self._motion_mat_T = np.ascontiguousarray(self._motion_mat.T)
+        self._update_mat_T = np.ascontiguousarray(self._update_mat.T)
+        self._state_diag = np.arange(2 * ndim)
+        self._measurement_diag = np.arange(ndim)
 
         # Motion and observation uncertainty weights.
         self._std_weight_position = 1.0 / 20
@@ -113,16 +119,19 @@ class BaseKalmanFilter:
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Run Kalman filter prediction step (Vectorized version).
+
+        mean (N, 2*ndim), covariance (N, 2*ndim, 2*ndim): one batched matmul
+        for all tracks, the process noise is written onto the diagonal.
         """
+        mean = np.asarray(mean, dtype=self.dtype)
+        covariance = np.asarray(covariance, dtype=self.dtype)
         std_pos, std_vel = self._get_multi_process_noise_std(mean)
         sqr = np.square(np.r_[std_pos, std_vel]).T
 
-        motion_cov = [np.diag(sqr[i]) for i in range(len(mean))]
-        motion_cov = np.asarray(motion_cov)
-
-        mean = np.dot(mean, self._motion_mat.T)
-        left = np.dot(self._motion_mat, covariance).transpose((1, 0, 2))
-        covariance = np.dot(left, self._motion_mat.T) + motion_cov
+        diag = self._state_diag
+        covariance = self._motion_mat @ covariance @ self._motion_mat_T
+        covariance[:, diag, diag] += sqr
+        mean = mean @ self._motion_mat_T
 
         return mean, covariance
 
@@ -154,6 +163,66 @@ class BaseKalmanFilter:
         )
         return new_mean, new_covariance
 
+    def multi_initiate(self, measurement: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Create tracks from (N, ndim) unassociated measurements (Vectorized ``initiate``).
+        """
+        measurement = np.asarray(measurement, dtype=self.dtype)
+        n = len(measurement)
+        mean = np.concatenate([measurement, np.zeros_like(measurement)], axis=1)
+
+        std = np.broadcast_arrays(*self._get_initial_covariance_std(measurement.T))
+        covariance = np.zeros((n, 2 * self.ndim, 2 * self.ndim), dtype=self.dtype)
+        covariance[:, self._state_diag, self._state_diag] = np.square(np.stack(std, axis=1))
+        return mean, covariance
+
+    def multi_project(
+        self, mean: np.ndarray, covariance: np.ndarray, confidence=0.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Project N state distributions to measurement space (Vectorized ``project``).
+        ``confidence`` is a scalar or an (N,) array.
+        """
+        std = np.stack(np.broadcast_arrays(*self._get_measurement_noise_std(mean.T, confidence)), axis=1)
+        std = (1 - np.reshape(confidence, (-1, 1))) * std
+
+        diag = self._measurement_diag
+        projected_mean = mean @ self._update_mat_T
+        projected_cov = self._update_mat @ covariance @ self._update_mat_T
+        projected_cov[:, diag, diag] += np.square(std)
+        return projected_mean, projected_cov
+
+    def multi_update(
+        self,
+        mean: np.ndarray,
+        covariance: np.ndarray,
+        measurement: np.ndarray,
+        confidence=0.0,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run Kalman filter correction step for N tracks at once (Vectorized ``update``).
+
+        The (N, ndim, ndim) innovation covariances are symmetric positive
+        definite, so the Kalman gains come out of one batched ``solve``
+        instead of a Cholesky factorization per track.
+        """
+        mean = np.asarray(mean, dtype=self.dtype)
+        covariance = np.asarray(covariance, dtype=self.dtype)
+        measurement = np.asarray(measurement, dtype=self.dtype)
+        if len(mean) == 0:
+            return mean, covariance
+
+        projected_mean, projected_cov = self.multi_project(mean, covariance, confidence)
+
+        # K = P H^T S^-1  <=>  S K^T = (P H^T)^T
+        cross_cov = covariance @ self._update_mat_T
+        kalman_gain = np.linalg.solve(projected_cov, cross_cov.transpose(0, 2, 1)).transpose(0, 2, 1)
+        innovation = measurement - projected_mean
+
+        new_mean = mean + np.einsum('nij,nj->ni', kalman_gain, innovation)
+        new_covariance = covariance - kalman_gain @ projected_cov @ kalman_gain.transpose(0, 2, 1)
+        return new_mean, new_covariance
+
     def _get_multi_process_noise_std(
         self, mean: np.ndarray
     ) -> Tuple[np.ndarray, np.ndarray]:
@@ -11,8 +11,8 @@ class KalmanFilterXYAH(BaseKalmanFilter):
         x, y, a, h, vx, vy, va, vh
     """
 
-    def __init__(self):
-        super().__init__(ndim=4)
+    def __init__(self, dtype=np.float64):
+        super().__init__(ndim=4, dtype=dtype)
 
     def _get_initial_covariance_std(self, measurement: np.ndarray) -> np.ndarray:
         # initial uncertainty in the aspect ratio is very low,
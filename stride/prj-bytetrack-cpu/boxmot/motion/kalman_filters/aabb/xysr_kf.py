@@ -200,7 +200,7 @@ class KalmanFilterXYSR(object):
             for i in range(index2 - index1):
                 x, y = x1 + (i + 1) * dx, y1 + (i + 1) * dy
                 w, h = w1 + (i + 1) * dw, h1 + (i + 1) * dh
-                s, r = w * h, w / float(h)
+                s, r = w * h, w / h  # (1,) arrays, float() of those fails on numpy 2
                 new_box = np.array([x, y, s, r]).reshape((4, 1))
                 self.update(new_box)
                 if not i == (index2 - index1 - 1):
@@ -290,6 +290,33 @@ class KalmanFilterXYSR(object):
         # save history of observations
         self.history_obs.append(z)
 
+    def multi_predict(self, x, P):
+        """
+        ``predict`` of N filters sharing this filter's F and Q: x (N, dim_x),
+        P (N, dim_x, dim_x). One batched matmul per product, the same float
+        steps as N calls of ``predict``. Returns the new (x, P).
+        """
+        x = np.matmul(self.F, x[..., None])[..., 0]
+        P = self._alpha_sq * np.matmul(np.matmul(self.F, P), self.F.T) + self.Q
+        return x, P
+
+    def multi_update(self, x, P, z):
+        """
+        ``update`` arithmetic of N filters sharing this filter's H and R with
+        measurements z (N, dim_z), same float steps as N calls of ``update``.
+        Only the correction: no history, freeze / unfreeze or saved posteriors.
+        Returns the new (x, P).
+        """
+        H, R = self.H, self.R
+        y = z[..., None] - np.matmul(H, x[..., None])
+        PHT = np.matmul(P, H.T)
+        S = np.matmul(H, PHT) + R
+        K = np.matmul(PHT, self.inv(S))
+        x = x + np.matmul(K, y)[..., 0]
+        I_KH = self._I - np.matmul(K, H)
+        P = np.matmul(np.matmul(I_KH, P), I_KH.swapaxes(1, 2)) + np.matmul(np.matmul(K, R), K.swapaxes(1, 2))
+        return x, P
+
     def update_steadystate(self, z, H=None):
         """Update Kalman filter using the Kalman gain and state covariance
         matrix as computed for the steady state. Only x is updated, and the
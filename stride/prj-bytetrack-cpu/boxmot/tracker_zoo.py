@@ -56,6 +56,7 @@ def create_tracker(
     tracker_mapping = {
         "strongsort": "boxmot.trackers.strongsort.strongsort.StrongSort",
         "ocsort"    : "boxmot.trackers.ocsort.ocsort.OcSort",
+        "vectorized_ocsort": "boxmot.trackers.ocsort.vectorized_ocsort.VectorizedOcSort",
         "bytetrack" : "boxmot.trackers.bytetrack.bytetrack.ByteTrack",
         "botsort"   : "boxmot.trackers.botsort.botsort.BotSort",
         "deepocsort": "boxmot.trackers.deepocsort.deepocsort.DeepOcSort",
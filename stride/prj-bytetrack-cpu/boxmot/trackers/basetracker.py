@@ -1,6 +1,8 @@
 import colorsys
+import copy
 import hashlib
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2 as cv
 import numpy as np
@@ -10,6 +12,9 @@ from boxmot.utils.iou import AssociationFunction
 
 
 class BaseTracker(ABC):
+    # state that per_class tracking keeps separately for every class, each starts as an empty container
+    per_class_attrs = ('active_tracks',)
+
     def __init__(
         self,
         det_thresh: float = 0.3,
@@ -21,6 +26,7 @@ class BaseTracker(ABC):
         per_class: bool = False,
         asso_func: str = "iou",
         is_obb: bool = False,
+        per_class_workers: int = 0,
     ):
         """
         Initialize the BaseTracker object with detection threshold, maximum age, minimum hits,
@@ -31,6 +37,7 @@ class BaseTracker(ABC):
         - max_age (int): Maximum age of a track before it is considered lost.
         - min_hits (int): Minimum number of detection hits before a track is considered confirmed.
         - iou_threshold (float): IOU threshold for determining match between detection and tracks.
+        - per_class_workers (int): With per_class, update up to this many classes in parallel threads (0: in turn).
 
         Attributes:
         - frame_count (int): Counter for the frames processed.
@@ -49,16 +56,12 @@ class BaseTracker(ABC):
 
         self.frame_count = 0
         self.active_tracks = []  # This might be handled differently in derived classes
-        self.per_class_active_tracks = None
+        self.per_class_trackers = {}  # class id -> tracker holding that class's per_class_attrs
+        self.per_class_workers = per_class_workers
+        self._per_class_executor = None
         self._first_frame_processed = False  # Flag to track if the first frame has been processed
         self._first_dets_processed = False
 
-        # Initialize per-class active tracks
-        if self.per_class:
-            self.per_class_active_tracks = {}
-            for i in range(self.nr_classes):
-                self.per_class_active_tracks[i] = []
-
         if self.max_age >= self.max_obs:
             LOGGER.warning("Max age > max observations, increasing size of max observations...")
             self.max_obs = self.max_age + 5
@@ -80,6 +83,88 @@ class BaseTracker(ABC):
         """
         raise NotImplementedError("The update method needs to be implemented by the subclass.")
     
+    @property
+    def per_class_active_tracks(self) -> dict:
+        return {cls_id: tracker.active_tracks for cls_id, tracker in self.per_class_trackers.items()}
+
+    def _class_tracker(self, cls_id: int) -> "BaseTracker":
+        """The tracker of one class: a shallow copy sharing config and models, with its own empty per_class_attrs."""
+        tracker = self.per_class_trackers.get(cls_id)
+        if tracker is None:
+            tracker = copy.copy(self)
+            tracker.per_class = False
+            tracker.per_class_trackers = {}
+            tracker._per_class_executor = None
+            self._init_class_tracker(tracker)
+            self.per_class_trackers[cls_id] = tracker
+        return tracker
+
+    def _init_class_tracker(self, tracker: "BaseTracker"):
+        for attr in self.per_class_attrs:
+            setattr(tracker, attr, type(getattr(self, attr))())
+
+    def _has_tracks(self) -> bool:
+        return any(len(getattr(self, attr)) for attr in self.per_class_attrs)
+
+    def snapshot(self) -> dict:
+        """
+        Tracker state as a dict of numpy arrays (``np.savez``-able, no pickle), for ``restore``.
+
+        Every held track is one row of the columns ``_snapshot_tracks``
+        returns (class trackers in class id order), plus ``frame_count`` and
+        the track id counter ``id_count``.
+        """
+        # a per_class tracker holds no tracks itself, it still gives the columns when no class has any
+        trackers = [self] + [tracker for _, tracker in sorted(self.per_class_trackers.items())]
+        parts = [tracker._snapshot_tracks() for tracker in trackers]
+        state = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        state['frame_count'] = np.int64(self.frame_count)
+        state['id_count'] = np.int64(self._id_count)
+        return state
+
+    def restore(self, state: dict):
+        """
+        Replace the tracker state with a ``snapshot``: the next ``update`` continues
+        exactly where the snapshotted tracker was. With per_class the tracks are
+        split into class trackers by their ``cls`` column.
+        """
+        self.frame_count = int(state['frame_count'])
+        self._id_count = int(state['id_count'])
+        self.per_class_trackers = {}
+        columns = {name: state[name] for name in state if name not in ('frame_count', 'id_count')}
+        if not self.per_class:
+            self._restore_tracks(columns)
+            return
+        self._restore_tracks({name: column[:0] for name, column in columns.items()})
+        classes = columns['cls'].astype(int)
+        for cls_id in np.unique(classes).tolist():
+            tracker = self._class_tracker(cls_id)
+            tracker.frame_count = self.frame_count
+            tracker._restore_tracks({name: column[classes == cls_id] for name, column in columns.items()})
+
+    def _snapshot_tracks(self) -> dict:
+        """Held tracks of this tracker (not its class trackers) as a dict of equal-length columns."""
+        raise NotImplementedError(f"{type(self).__name__} does not support snapshots")
+
+    def _restore_tracks(self, columns: dict):
+        """Replace the held tracks of this tracker with ``_snapshot_tracks`` columns."""
+        raise NotImplementedError(f"{type(self).__name__} does not support snapshots")
+
+    @property
+    def _id_count(self) -> int:
+        """Last track id handed out (the id allocator state saved by ``snapshot``)."""
+        raise NotImplementedError(f"{type(self).__name__} does not support snapshots")
+
+    @staticmethod
+    def group_by_class(dets: np.ndarray):
+        """(class ids, index arrays): one stable argsort, indices in detection order within each class."""
+        if len(dets) == 0:
+            return np.empty(0, dtype=int), []
+        order = np.argsort(dets[:, 5], kind="stable")
+        classes = dets[order, 5]
+        starts = np.flatnonzero(np.r_[True, classes[1:] != classes[:-1]])
+        return classes[starts].astype(int), np.split(order, starts[1:])
+
     def get_class_dets_n_embs(self, dets, embs, cls_id):
         # Initialize empty arrays for detections and embeddings
         class_dets = np.empty((0, 6))
@@ -147,7 +232,7 @@ class BaseTracker(ABC):
                 self._first_frame_processed = True
 
             # Call the original method with the unwrapped `dets`
-            return method(self, dets, **kwargs)
+            return method(self, dets, *args[1:], **kwargs)
 
         return wrapper
     
@@ -155,47 +240,58 @@ class BaseTracker(ABC):
     def per_class_decorator(update_method):
         """
         Decorator for the update method to handle per-class processing.
+
+        Every class has its own tracker (``_class_tracker``). Detections are
+        grouped with one argsort and only the classes present in the frame or
+        still holding tracks are updated, in class id order; the others cost
+        nothing. With ``per_class_workers`` > 0 the classes run in a thread pool.
         """
 
-        def wrapper(self, dets: np.ndarray):
+        def wrapper(self, dets: np.ndarray, embs: np.ndarray = None):
             # handle different types of inputs
             if dets is None or len(dets) == 0:
                 dets = np.empty((0, 6))
 
             if not self.per_class:
                 # Process all detections at once if per_class is False
-                return update_method(self, dets=dets)
-            # else:
-            # Initialize an array to store the tracks for each class
-            per_class_tracks = []
+                if embs is None:
+                    return update_method(self, dets=dets)
+                return update_method(self, dets=dets, embs=embs)
+
+            classes, indices = self.group_by_class(dets)
+            class_dets = dict(zip(classes.tolist(), indices))
+            busy = [cls_id for cls_id, tracker in self.per_class_trackers.items() if tracker._has_tracks()]
+            visit = sorted(set(class_dets) | set(busy))
 
             # same frame count for all classes
             frame_count = self.frame_count
 
-            for cls_id in range(self.nr_classes):
-                # Get detections and embeddings for the current class
-                class_dets, class_embs = self.get_class_dets_n_embs(dets, embs, cls_id)
-
-                LOGGER.debug(f"Processing class {int(cls_id)}: {class_dets.shape} with embeddings"
-                      f" {class_embs.shape if class_embs is not None else None}")
-
-                # Activate the specific active tracks for this class id
-                self.active_tracks = self.per_class_active_tracks[cls_id]
-
-                # Reset frame count for every class
-                self.frame_count = frame_count
-
-                # Update detections using the decorated method
-                tracks = update_method(self, dets=class_dets)
-
-                # Save the updated active tracks
-                self.per_class_active_tracks[cls_id] = self.active_tracks
-
-                if tracks.size > 0:
-                    per_class_tracks.append(tracks)
+            def update_class(cls_id):
+                idx = class_dets.get(cls_id, np.empty(0, dtype=int))
+                LOGGER.debug(f"Processing class {cls_id}: {len(idx)} detections")
+                tracker = self._class_tracker(cls_id)
+                tracker.frame_count = frame_count
+                if embs is None:
+                    return update_method(tracker, dets=dets[idx])
+                return update_method(tracker, dets=dets[idx], embs=embs[idx])
+
+            for cls_id in visit:
+                self._class_tracker(cls_id)  # create new class trackers before any thread runs
+            if self.per_class_workers > 0 and len(visit) > 1:
+                if self._per_class_executor is None:
+                    self._per_class_executor = ThreadPoolExecutor(max_workers=self.per_class_workers)
+                per_class_tracks = list(self._per_class_executor.map(update_class, visit))
+            else:
+                per_class_tracks = [update_class(cls_id) for cls_id in visit]
+
+            # classes that left the scene drop their tracker
+            for cls_id in visit:
+                if not self.per_class_trackers[cls_id]._has_tracks():
+                    del self.per_class_trackers[cls_id]
 
             # Increase frame count by 1
             self.frame_count = frame_count + 1
+            per_class_tracks = [tracks for tracks in per_class_tracks if tracks.size > 0]
             return np.vstack(per_class_tracks) if per_class_tracks else np.empty((0, 8))
 
         return wrapper
@@ -1,5 +1,6 @@
 # Mikel Broström 🔥 Yolo Tracking 🧾 AGPL-3.0 license
 
+import threading
 from collections import OrderedDict
 
 import numpy as np
@@ -12,8 +13,32 @@ class TrackState(object):
     Removed = 3
 
 
+class TrackIdCounter(object):
+    """Track id allocator: ids 1, 2, ... of one tracker (and its per_class trackers), thread-safe."""
+
+    def __init__(self, count: int = 0):
+        self.count = count  # last id handed out
+        self.lock = threading.Lock()  # per_class_workers activate tracks from several threads
+
+    def next_id(self) -> int:
+        with self.lock:
+            self.count += 1
+            return self.count
+
+    def take(self, n: int) -> int:
+        """Reserve ``n`` consecutive ids, returns the first one."""
+        with self.lock:
+            first = self.count + 1
+            self.count += n
+            return first
+
+    def clear(self):
+        with self.lock:
+            self.count = 0
+
+
 class BaseTrack(object):
-    _count = 0
+    ids = TrackIdCounter()  # shared by tracks activated without a tracker's own counter
 
     track_id = 0
     is_activated = False
@@ -36,8 +61,7 @@ class BaseTrack(object):
 
     @staticmethod
     def next_id():
-        BaseTrack._count += 1
-        return BaseTrack._count
+        return BaseTrack.ids.next_id()
 
     def activate(self, *args):
         raise NotImplementedError
@@ -56,4 +80,4 @@ class BaseTrack(object):
 
     @staticmethod
     def clear_count():
-        BaseTrack._count = 0
+        BaseTrack.ids.clear()
@@ -6,7 +6,8 @@ import numpy as np
 
 from boxmot.motion.kalman_filters.aabb.xyah_kf import KalmanFilterXYAH
 from boxmot.trackers.basetracker import BaseTracker
-from boxmot.trackers.bytetrack.basetrack import BaseTrack, TrackState
+from boxmot.trackers.bytetrack.basetrack import BaseTrack, TrackIdCounter, TrackState
+from boxmot.trackers.bytetrack.track_store import SNAPSHOT_COLUMNS, mean_to_xyxy, pack_history, unpack_history
 from boxmot.utils.matching import fuse_score, iou_distance, linear_assignment
 from boxmot.utils.ops import tlwh2xyah, xywh2tlwh, xywh2xyxy, xyxy2xywh
 
@@ -51,10 +52,38 @@ class STrack(BaseTrack):
                 stracks[i].mean = mean
                 stracks[i].covariance = cov
 
-    def activate(self, kalman_filter, frame_id):
-        """Start a new tracklet"""
+    @staticmethod
+    def multi_update(stracks, detections, frame_id):
+        """
+        ``update`` (for tracked tracks) or ``re_activate`` (for the others) of
+        every track with its matched detection, with one batched Kalman correction.
+        """
+        if len(stracks) == 0:
+            return
+        for st in stracks:
+            if st.state == TrackState.Tracked:
+                st.tracklet_len += 1
+                st.history_observations.append(st.xyxy)
+            else:
+                st.tracklet_len = 0
+        multi_mean, multi_covariance = STrack.shared_kalman.multi_update(
+            np.asarray([st.mean for st in stracks]),
+            np.asarray([st.covariance for st in stracks]),
+            np.asarray([det.xyah for det in detections]),
+        )
+        for st, det, mean, cov in zip(stracks, detections, multi_mean, multi_covariance):
+            st.mean, st.covariance = mean, cov
+            st.frame_id = frame_id
+            st.state = TrackState.Tracked
+            st.is_activated = True
+            st.conf = det.conf
+            st.cls = det.cls
+            st.det_ind = det.det_ind
+
+    def activate(self, kalman_filter, frame_id, id_counter=None):
+        """Start a new tracklet, with the next id of ``id_counter`` (the shared BaseTrack counter if None)"""
         self.kalman_filter = kalman_filter
-        self.id = self.next_id()
+        self.id = self.next_id() if id_counter is None else id_counter.next_id()
         self.mean, self.covariance = self.kalman_filter.initiate(self.xyah)
 
         self.tracklet_len = 0
@@ -65,7 +94,7 @@ class STrack(BaseTrack):
         self.frame_id = frame_id
         self.start_frame = frame_id
 
-    def re_activate(self, new_track, frame_id, new_id=False):
+    def re_activate(self, new_track, frame_id, new_id=False, id_counter=None):
         self.mean, self.covariance = self.kalman_filter.update(
             self.mean, self.covariance, new_track.xyah
         )
@@ -74,7 +103,7 @@ class STrack(BaseTrack):
         self.is_activated = True
         self.frame_id = frame_id
         if new_id:
-            self.id = self.next_id()
+            self.id = self.next_id() if id_counter is None else id_counter.next_id()
         self.conf = new_track.conf
         self.cls = new_track.cls
         self.det_ind = new_track.det_ind
@@ -126,8 +155,14 @@ class ByteTrack(BaseTracker):
         track_buffer (int, optional): Number of frames to keep a track alive after it was last detected. A longer buffer allows for more robust tracking but may increase identity switches.
         frame_rate (int, optional): Frame rate of the video being processed. Used to scale the track buffer size.
         per_class (bool, optional): Whether to perform per-class tracking. If True, tracks are maintained separately for each object class.
+        per_class_workers (int, optional): With per_class, number of threads updating classes in parallel (0: one after the other).
+        sparse_iou (bool, optional): Compute IoU only for overlapping track / detection pairs (sort and sweep) and assign on the sparse cost. Same result, less work in crowded scenes.
+        lap_solver (str, optional): Linear assignment solver, one of ``matching.SOLVERS`` ('lapjv', 'scipy', 'greedy', 'sparse', 'auto'). None keeps lapjv (sparse for ``sparse_iou``).
+        id_counter (TrackIdCounter, optional): Track id allocator. None gives the tracker its own, so trackers of different streams number their tracks independently; per_class trackers share their parent's.
     """
 
+    per_class_attrs = ('active_tracks', 'lost_stracks', 'removed_ids')
+
     def __init__(
         self,
         min_conf: float = 0.1,
@@ -136,11 +171,16 @@ class ByteTrack(BaseTracker):
         track_buffer: int = 25,
         frame_rate: int = 30,
         per_class: bool = False,
+        sparse_iou: bool = False,
+        lap_solver: str = None,
+        per_class_workers: int = 0,
+        id_counter: TrackIdCounter = None,
     ):
-        super().__init__(per_class=per_class)
+        super().__init__(per_class=per_class, per_class_workers=per_class_workers)
+        self.id_counter = TrackIdCounter() if id_counter is None else id_counter
         self.active_tracks = []  # type: list[STrack]
         self.lost_stracks = []  # type: list[STrack]
-        self.removed_stracks = []  # type: list[STrack]
+        self.removed_ids = set()  # ids of removed tracks still held in active / lost
 
         self.frame_id = 0
         self.track_buffer = track_buffer
@@ -153,6 +193,8 @@ class ByteTrack(BaseTracker):
         self.buffer_size = int(frame_rate / 30.0 * track_buffer)
         self.max_time_lost = self.buffer_size
         self.kalman_filter = KalmanFilterXYAH()
+        self.sparse_iou = sparse_iou
+        self.lap_solver = lap_solver
 
     @BaseTracker.setup_decorator
     @BaseTracker.per_class_decorator
@@ -195,22 +237,21 @@ class ByteTrack(BaseTracker):
         strack_pool = joint_stracks(tracked_stracks, self.lost_stracks)
         # Predict the current location with KF
         STrack.multi_predict(strack_pool)
-        dists = iou_distance(strack_pool, detections)
+        dists = iou_distance(strack_pool, detections, sparse=self.sparse_iou)
         # if not self.args.mot20:
         dists = fuse_score(dists, detections)
         matches, u_track, u_detection = linear_assignment(
-            dists, thresh=self.match_thresh
+            dists, thresh=self.match_thresh, solver=self.lap_solver
         )
 
         for itracked, idet in matches:
             track = strack_pool[itracked]
-            det = detections[idet]
             if track.state == TrackState.Tracked:
-                track.update(detections[idet], self.frame_count)
                 activated_starcks.append(track)
             else:
-                track.re_activate(det, self.frame_count, new_id=False)
                 refind_stracks.append(track)
+        STrack.multi_update([strack_pool[i] for i, _ in matches],
+                            [detections[i] for _, i in matches], self.frame_count)
 
         """ Step 3: Second association, with low conf detection boxes"""
         # association the untrack to the low conf detections
@@ -226,17 +267,16 @@ class ByteTrack(BaseTracker):
             for i in u_track
             if strack_pool[i].state == TrackState.Tracked
         ]
-        dists = iou_distance(r_tracked_stracks, detections_second)
-        matches, u_track, u_detection_second = linear_assignment(dists, thresh=0.5)
+        dists = iou_distance(r_tracked_stracks, detections_second, sparse=self.sparse_iou)
+        matches, u_track, u_detection_second = linear_assignment(dists, thresh=0.5, solver=self.lap_solver)
         for itracked, idet in matches:
             track = r_tracked_stracks[itracked]
-            det = detections_second[idet]
             if track.state == TrackState.Tracked:
-                track.update(det, self.frame_count)
                 activated_starcks.append(track)
             else:
-                track.re_activate(det, self.frame_count, new_id=False)
                 refind_stracks.append(track)
+        STrack.multi_update([r_tracked_stracks[i] for i, _ in matches],
+                            [detections_second[i] for _, i in matches], self.frame_count)
 
         for it in u_track:
             track = r_tracked_stracks[it]
@@ -246,13 +286,14 @@ class ByteTrack(BaseTracker):
 
         """Deal with unconfirmed tracks, usually tracks with only one beginning frame"""
         detections = [detections[i] for i in u_detection]
-        dists = iou_distance(unconfirmed, detections)
+        dists = iou_distance(unconfirmed, detections, sparse=self.sparse_iou)
         # if not self.args.mot20:
         dists = fuse_score(dists, detections)
-        matches, u_unconfirmed, u_detection = linear_assignment(dists, thresh=0.7)
+        matches, u_unconfirmed, u_detection = linear_assignment(dists, thresh=0.7, solver=self.lap_solver)
         for itracked, idet in matches:
-            unconfirmed[itracked].update(detections[idet], self.frame_count)
             activated_starcks.append(unconfirmed[itracked])
+        STrack.multi_update([unconfirmed[i] for i, _ in matches],
+                            [detections[i] for _, i in matches], self.frame_count)
         for it in u_unconfirmed:
             track = unconfirmed[it]
             track.mark_removed()
@@ -263,7 +304,7 @@ class ByteTrack(BaseTracker):
             track = detections[inew]
             if track.conf < self.det_thresh:
                 continue
-            track.activate(self.kalman_filter, self.frame_count)
+            track.activate(self.kalman_filter, self.frame_count, self.id_counter)
             activated_starcks.append(track)
         """ Step 5: Update state"""
         for track in self.lost_stracks:
@@ -278,11 +319,15 @@ class ByteTrack(BaseTracker):
         self.active_tracks = joint_stracks(self.active_tracks, refind_stracks)
         self.lost_stracks = sub_stracks(self.lost_stracks, self.active_tracks)
         self.lost_stracks.extend(lost_stracks)
-        self.lost_stracks = sub_stracks(self.lost_stracks, self.removed_stracks)
-        self.removed_stracks.extend(removed_stracks)
+        if self.removed_ids:
+            self.lost_stracks = [t for t in self.lost_stracks if t.id not in self.removed_ids]
+        self.removed_ids.update(t.id for t in removed_stracks)
         self.active_tracks, self.lost_stracks = remove_duplicate_stracks(
-            self.active_tracks, self.lost_stracks
+            self.active_tracks, self.lost_stracks, sparse=self.sparse_iou
         )
+        # lost_stracks is only ever refilled from active / lost tracks, so the
+        # ids of removed tracks that left both lists can never match again
+        self.removed_ids.intersection_update(t.id for t in self._held_tracks())
         # get confs of lost tracks
         output_stracks = [track for track in self.active_tracks if track.is_activated]
         outputs = []
@@ -297,6 +342,100 @@ class ByteTrack(BaseTracker):
         outputs = np.asarray(outputs)
         return outputs
 
+    def _held_tracks(self):
+        yield from self.active_tracks
+        yield from self.lost_stracks
+
+    def memory_stats(self) -> dict:
+        """Number of tracks held per list, for soak tests (all bounded by the live track count)."""
+        trackers = self.per_class_trackers.values() if self.per_class else [self]
+        stats = {'active': 0, 'lost': 0, 'removed_ids': 0}
+        for tracker in trackers:
+            stats['active'] += len(tracker.active_tracks)
+            stats['lost'] += len(tracker.lost_stracks)
+            stats['removed_ids'] += len(tracker.removed_ids)
+        if self.per_class:
+            stats['classes'] = len(self.per_class_trackers)
+        return stats
+
+    def _snapshot_tracks(self) -> dict:
+        """Active then lost tracks as TrackStore columns (``SNAPSHOT_COLUMNS``), see ``BaseTracker.snapshot``."""
+        tracks = self.active_tracks + self.lost_stracks
+        ids = [t.id for t in tracks]
+        columns = {
+            'mean': np.asarray([t.mean for t in tracks], dtype=np.float64).reshape(-1, 8),
+            'covariance': np.asarray([t.covariance for t in tracks], dtype=np.float64).reshape(-1, 8, 8),
+            'state': np.asarray([t.state for t in tracks], dtype=np.int8),
+            'track_id': np.asarray(ids, dtype=np.int64),
+            'activated': np.asarray([t.is_activated for t in tracks], dtype=bool),
+            'conf': np.asarray([t.conf for t in tracks], dtype=np.float64),
+            'cls': np.asarray([t.cls for t in tracks], dtype=np.float64),
+            'det_ind': np.asarray([t.det_ind for t in tracks], dtype=np.float64),
+            'frame_id': np.asarray([t.frame_id for t in tracks], dtype=np.int64),
+            'start_frame': np.asarray([t.start_frame for t in tracks], dtype=np.int64),
+            'tracklet_len': np.asarray([t.tracklet_len for t in tracks], dtype=np.int64),
+        }
+        columns['history'], columns['history_len'] = pack_history(
+            [list(t.history_observations) for t in tracks], self.max_obs)
+        columns['lost'] = np.arange(len(tracks)) >= len(self.active_tracks)
+        columns['removed'] = np.asarray([i in self.removed_ids for i in ids], dtype=bool)
+        return columns
+
+    def _restore_tracks(self, columns: dict):
+        c = {name: columns[name] for name in SNAPSHOT_COLUMNS}
+        boxes = mean_to_xyxy(c['mean'])
+        history = unpack_history(columns['history'], columns['history_len'], self.max_obs)
+        tracks = []
+        for i in range(len(c['track_id'])):
+            t = STrack(np.r_[boxes[i], c['conf'][i], c['cls'][i], c['det_ind'][i]], max_obs=self.max_obs)
+            t.kalman_filter = self.kalman_filter
+            t.mean, t.covariance = c['mean'][i].copy(), c['covariance'][i].copy()
+            t.state = int(c['state'][i])
+            t.id = int(c['track_id'][i])
+            t.is_activated = bool(c['activated'][i])
+            t.frame_id = int(c['frame_id'][i])
+            t.start_frame = int(c['start_frame'][i])
+            t.tracklet_len = int(c['tracklet_len'][i])
+            t.history_observations.extend(box.copy() for box in history[i])
+            tracks.append(t)
+        lost = columns['lost'].tolist()
+        self.active_tracks = [t for t, is_lost in zip(tracks, lost) if not is_lost]
+        self.lost_stracks = [t for t, is_lost in zip(tracks, lost) if is_lost]
+        self.removed_ids = set(c['track_id'][columns['removed']].tolist())
+
+    @property
+    def _id_count(self) -> int:
+        return self.id_counter.count
+
+    @_id_count.setter
+    def _id_count(self, count: int):
+        self.id_counter.count = count
+
+    def predict_only(self) -> np.ndarray:
+        """
+        Advance the tracker by one frame without detections (non-keyframe).
+
+        Tracked and lost tracks are propagated with the Kalman filter exactly
+        as the first step of ``update`` does, but no association, state change
+        or track removal happens, so the next keyframe ``update`` continues
+        from the predicted state. Returns the confirmed tracks in the same
+        layout as ``update`` with ``det_ind`` set to -1.
+        """
+        if self.per_class:
+            outputs = []
+            for _, tracker in sorted(self.per_class_trackers.items()):
+                tracker.frame_count = self.frame_count
+                outputs.extend(tracker.predict_only().reshape(-1, 8))
+            self.frame_count += 1
+            return np.asarray(outputs)
+
+        self.frame_count += 1
+        tracked_stracks = [t for t in self.active_tracks if t.is_activated]
+        STrack.multi_predict(joint_stracks(tracked_stracks, self.lost_stracks))
+
+        outputs = [[*t.xyxy, t.id, t.conf, t.cls, -1] for t in tracked_stracks]
+        return np.asarray(outputs)
+
 
 # id, class_id, conf
 
@@ -326,17 +465,22 @@ def sub_stracks(tlista, tlistb):
     return list(stracks.values())
 
 
-def remove_duplicate_stracks(stracksa, stracksb):
-    pdist = iou_distance(stracksa, stracksb)
-    pairs = np.where(pdist < 0.15)
-    dupa, dupb = list(), list()
+def remove_duplicate_stracks(stracksa, stracksb, sparse=False):
+    pdist = iou_distance(stracksa, stracksb, sparse=sparse)
+    if sparse:
+        pdist = pdist.tocoo()
+        close = pdist.data < 0.15
+        pairs = pdist.row[close], pdist.col[close]
+    else:
+        pairs = np.where(pdist < 0.15)
+    dupa, dupb = set(), set()
     for p, q in zip(*pairs):
         timep = stracksa[p].frame_id - stracksa[p].start_frame
         timeq = stracksb[q].frame_id - stracksb[q].start_frame
         if timep > timeq:
-            dupb.append(q)
+            dupb.add(q)
         else:
-            dupa.append(p)
+            dupa.add(p)
     resa = [t for i, t in enumerate(stracksa) if i not in dupa]
     resb = [t for i, t in enumerate(stracksb) if i not in dupb]
     return resa, resb
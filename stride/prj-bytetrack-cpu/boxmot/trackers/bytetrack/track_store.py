@@ -0,0 +1,210 @@
+import numpy as np
+
+# per-track columns of a tracker snapshot, shared by ByteTrack and VectorizedByteTrack (TrackStore names)
+SNAPSHOT_COLUMNS = ('mean', 'covariance', 'state', 'track_id', 'activated', 'conf', 'cls', 'det_ind',
+                    'frame_id', 'start_frame', 'tracklet_len')
+
+
+def xyxy_to_xyah(xyxy: np.ndarray) -> np.ndarray:
+    """(N, 4) detections to Kalman measurements, same float steps as STrack (xyxy -> xywh -> tlwh -> xyah)."""
+    xc = (xyxy[:, 0] + xyxy[:, 2]) / 2
+    yc = (xyxy[:, 1] + xyxy[:, 3]) / 2
+    w = xyxy[:, 2] - xyxy[:, 0]
+    h = xyxy[:, 3] - xyxy[:, 1]
+    t = xc - w / 2.0
+    l = yc - h / 2.0
+    return np.stack([t + (w / 2), l + (h / 2), w / h, h], axis=1)
+
+
+def xyxy_roundtrip(xyxy: np.ndarray) -> np.ndarray:
+    """Box of an unactivated STrack (xyxy -> xywh -> xyxy), bit-identical to ``STrack.xyxy``."""
+    xc = (xyxy[:, 0] + xyxy[:, 2]) / 2
+    yc = (xyxy[:, 1] + xyxy[:, 3]) / 2
+    w = xyxy[:, 2] - xyxy[:, 0]
+    h = xyxy[:, 3] - xyxy[:, 1]
+    return np.stack([xc - w / 2, yc - h / 2, xc + w / 2, yc + h / 2], axis=1)
+
+
+def mean_to_xyxy(mean: np.ndarray) -> np.ndarray:
+    """(N, 8) Kalman means (xc, yc, a, h, ...) to (N, 4) xyxy boxes."""
+    xc, yc, h = mean[:, 0], mean[:, 1], mean[:, 3]
+    w = mean[:, 2] * h
+    return np.stack([xc - w / 2, yc - h / 2, xc + w / 2, yc + h / 2], axis=1)
+
+
+def pack_history(observations: list, max_obs: int):
+    """(N, max_obs, 4) oldest-first zero-padded boxes and (N,) lengths of per-track observation lists."""
+    history = np.zeros((len(observations), max_obs, 4))
+    history_len = np.zeros(len(observations), dtype=np.int64)
+    for i, boxes in enumerate(observations):
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)[-max_obs:]
+        history[i, :len(boxes)] = boxes
+        history_len[i] = len(boxes)
+    return history, history_len
+
+
+def unpack_history(history: np.ndarray, history_len: np.ndarray, max_obs: int) -> list:
+    """Inverse of ``pack_history``: per-track (n, 4) arrays, the last ``max_obs`` boxes at most."""
+    return [history[i, :n][-max_obs:] for i, n in enumerate(history_len.tolist())]
+
+
+class TrackStore:
+    """Struct-of-arrays storage for ByteTrack tracks.
+
+    One row per track: Kalman ``mean`` (N, 8) and ``covariance`` (N, 8, 8),
+    plus ``state``, ``track_id``, ``activated``, ``conf``, ``cls``,
+    ``det_ind``, ``frame_id``, ``start_frame``, ``tracklet_len`` columns and a
+    ``max_obs`` ring buffer of observed boxes per track (what
+    ``STrack.history_observations`` holds). Rows of tracks that left the
+    tracker are recycled, the arrays grow by doubling, so a frame allocates
+    nothing but the per-frame index arrays.
+    """
+
+    __slots__ = ('capacity', 'max_obs', 'mean', 'covariance', 'state', 'track_id', 'activated',
+                 'conf', 'cls', 'det_ind', 'frame_id', 'start_frame', 'tracklet_len',
+                 'history', 'history_len', 'used')
+
+    def __init__(self, capacity: int = 64, max_obs: int = 50, dtype=np.float64):
+        self.capacity = 0
+        self.max_obs = max_obs
+        self.mean = np.empty((0, 8), dtype=dtype)
+        self.covariance = np.empty((0, 8, 8), dtype=dtype)
+        self.state = np.empty(0, dtype=np.int8)
+        self.track_id = np.empty(0, dtype=np.int64)
+        self.activated = np.empty(0, dtype=bool)
+        self.conf = np.empty(0)
+        self.cls = np.empty(0)
+        self.det_ind = np.empty(0)
+        self.frame_id = np.empty(0, dtype=np.int64)
+        self.start_frame = np.empty(0, dtype=np.int64)
+        self.tracklet_len = np.empty(0, dtype=np.int64)
+        self.history = np.empty((0, max_obs, 4))
+        self.history_len = np.empty(0, dtype=np.int64)
+        self.used = np.empty(0, dtype=bool)
+        self._grow(capacity)
+
+    def __len__(self) -> int:
+        return int(self.used.sum())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__[2:])
+
+    def _grow(self, capacity: int):
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        for name in self.__slots__[2:]:
+            column = getattr(self, name)
+            pad = np.zeros((extra,) + column.shape[1:], dtype=column.dtype)
+            setattr(self, name, np.concatenate([column, pad]))
+        self.capacity = capacity
+
+    def allocate(self, n: int) -> np.ndarray:
+        """Row indices for ``n`` new tracks, growing the arrays if needed."""
+        free = np.flatnonzero(~self.used)
+        if len(free) < n:
+            start = self.capacity
+            self._grow(max(2 * self.capacity, self.capacity + n - len(free)))
+            free = np.concatenate([free, np.arange(start, self.capacity)])
+        rows = free[:n]
+        self.used[rows] = True
+        self.history_len[rows] = 0
+        return rows
+
+    def release(self, keep_rows: np.ndarray):
+        """Free every row not in ``keep_rows``."""
+        keep = np.zeros(self.capacity, dtype=bool)
+        keep[keep_rows] = True
+        self.used &= keep
+
+    def xyxy(self, rows: np.ndarray) -> np.ndarray:
+        return mean_to_xyxy(self.mean[rows])
+
+    def observe(self, rows: np.ndarray):
+        """Append the current boxes of ``rows`` to their observation ring buffers."""
+        if len(rows) == 0:
+            return
+        slot = self.history_len[rows] % self.max_obs
+        self.history[rows, slot] = self.xyxy(rows)
+        self.history_len[rows] += 1
+
+    def observations(self, row: int) -> np.ndarray:
+        """Observed boxes of one track, oldest first."""
+        n = int(self.history_len[row])
+        if n <= self.max_obs:
+            return self.history[row, :n].copy()
+        return np.roll(self.history[row], -(n % self.max_obs), axis=0)
+
+    def view(self, row: int) -> 'TrackView':
+        return TrackView(self, row)
+
+
+class TrackView:
+    """Read-only STrack-like access to one row of a TrackStore."""
+
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store: TrackStore, row: int):
+        self.store = store
+        self.row = row
+
+    @property
+    def id(self) -> int:
+        return int(self.store.track_id[self.row])
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.store.mean[self.row]
+
+    @property
+    def covariance(self) -> np.ndarray:
+        return self.store.covariance[self.row]
+
+    @property
+    def state(self) -> int:
+        return int(self.store.state[self.row])
+
+    @property
+    def is_activated(self) -> bool:
+        return bool(self.store.activated[self.row])
+
+    @property
+    def conf(self) -> float:
+        return float(self.store.conf[self.row])
+
+    @property
+    def cls(self) -> float:
+        return float(self.store.cls[self.row])
+
+    @property
+    def det_ind(self) -> float:
+        return float(self.store.det_ind[self.row])
+
+    @property
+    def frame_id(self) -> int:
+        return int(self.store.frame_id[self.row])
+
+    @property
+    def end_frame(self) -> int:
+        return self.frame_id
+
+    @property
+    def start_frame(self) -> int:
+        return int(self.store.start_frame[self.row])
+
+    @property
+    def tracklet_len(self) -> int:
+        return int(self.store.tracklet_len[self.row])
+
+    @property
+    def history_observations(self) -> np.ndarray:
+        return self.store.observations(self.row)
+
+    @property
+    def xyxy(self) -> np.ndarray:
+        return self.store.xyxy([self.row])[0]
+
+    def __repr__(self):
+        return f"TrackView(id={self.id}, state={self.state}, xyxy={self.xyxy.round(1).tolist()})"
+
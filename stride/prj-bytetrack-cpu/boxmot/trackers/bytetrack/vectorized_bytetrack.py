@@ -0,0 +1,340 @@
+import numpy as np
+import scipy.sparse
+
+from boxmot.motion.kalman_filters.aabb.xyah_kf import KalmanFilterXYAH
+from boxmot.trackers.basetracker import BaseTracker
+from boxmot.trackers.bytetrack.basetrack import TrackIdCounter, TrackState
+from boxmot.trackers.bytetrack.track_store import (SNAPSHOT_COLUMNS, TrackStore, pack_history, unpack_history,
+                                                   xyxy_roundtrip, xyxy_to_xyah)
+from boxmot.utils.matching import iou_distance, linear_assignment
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _indices(indices) -> np.ndarray:
+    return np.asarray(indices, dtype=np.int64).reshape(-1)
+
+
+def _matches(matches) -> np.ndarray:
+    return np.asarray(matches, dtype=np.int64).reshape(-1, 2)
+
+
+def _fuse_score(cost: np.ndarray, confs: np.ndarray) -> np.ndarray:
+    """``matching.fuse_score`` on a conf array."""
+    if scipy.sparse.issparse(cost):
+        cost.data = 1 - (1 - cost.data) * confs[cost.indices]
+        return cost
+    if cost.size == 0:
+        return cost
+    return 1 - (1 - cost) * confs[None, :]
+
+
+def _joint(rows_a: np.ndarray, rows_b: np.ndarray) -> np.ndarray:
+    """``joint_stracks`` on row indices: a, then the rows of b not in a."""
+    if len(rows_a) == 0:
+        return rows_b
+    return np.concatenate([rows_a, rows_b[~np.isin(rows_b, rows_a)]])
+
+
+def _sub(rows_a: np.ndarray, rows_b: np.ndarray) -> np.ndarray:
+    """``sub_stracks`` on row indices: the rows of a not in b."""
+    return rows_a[~np.isin(rows_a, rows_b)]
+
+
+class VectorizedByteTrack(BaseTracker):
+    """
+    ByteTrack on a struct-of-arrays TrackStore instead of one STrack object per track.
+
+    Same association as ``ByteTrack`` (same thresholds, same track list
+    ordering, same quirks) and the same outputs, but tracks are rows of
+    contiguous arrays: prediction is one batched Kalman call, IoU runs on
+    stacked boxes, and the joint/sub/duplicate bookkeeping works on row index
+    arrays. No objects are created per detection. ``active_tracks`` and
+    ``lost_stracks`` return ``TrackView`` objects for inspection.
+
+    Kalman predict, correction and initiation are one batched call per
+    association round; ``kalman_dtype=np.float32`` runs them (and keeps the
+    store) in single precision.
+
+    Args: see ``ByteTrack`` (including ``sparse_iou``, ``lap_solver``, ``per_class_workers`` and ``id_counter``).
+    """
+
+    def __init__(
+        self,
+        min_conf: float = 0.1,
+        track_thresh: float = 0.45,
+        match_thresh: float = 0.8,
+        track_buffer: int = 25,
+        frame_rate: int = 30,
+        per_class: bool = False,
+        kalman_dtype=np.float64,
+        sparse_iou: bool = False,
+        lap_solver: str = None,
+        per_class_workers: int = 0,
+        id_counter: TrackIdCounter = None,
+    ):
+        super().__init__(per_class=per_class, per_class_workers=per_class_workers)
+        self.id_counter = TrackIdCounter() if id_counter is None else id_counter
+        self.kalman_filter = KalmanFilterXYAH(dtype=kalman_dtype)
+        self.store = TrackStore(max_obs=self.max_obs, dtype=self.kalman_filter.dtype)
+        self._active = _EMPTY  # rows, in ByteTrack's active_tracks order
+        self._lost = _EMPTY  # rows, in ByteTrack's lost_stracks order
+        self.removed_ids = set()  # ids of removed tracks still held in active / lost
+        self.sparse_iou = sparse_iou
+        self.lap_solver = lap_solver
+
+        self.frame_id = 0
+        self.track_buffer = track_buffer
+
+        self.min_conf = min_conf
+        self.track_thresh = track_thresh
+        self.match_thresh = match_thresh
+        self.det_thresh = track_thresh
+        self.buffer_size = int(frame_rate / 30.0 * track_buffer)
+        self.max_time_lost = self.buffer_size
+
+    @property
+    def active_tracks(self):
+        return [self.store.view(row) for row in self._active]
+
+    @active_tracks.setter
+    def active_tracks(self, tracks):
+        # BaseTracker.__init__ resets the list, anything else would bypass the store
+        if len(tracks):
+            raise AttributeError("VectorizedByteTrack keeps its tracks in self.store")
+
+    @property
+    def lost_stracks(self):
+        return [self.store.view(row) for row in self._lost]
+
+    def _init_class_tracker(self, tracker: "VectorizedByteTrack"):
+        tracker.store = TrackStore(max_obs=self.max_obs, dtype=self.kalman_filter.dtype)
+        tracker._active = tracker._lost = _EMPTY
+        tracker.removed_ids = set()
+
+    def _has_tracks(self) -> bool:
+        return len(self._active) + len(self._lost) > 0
+
+    @BaseTracker.setup_decorator
+    @BaseTracker.per_class_decorator
+    def update(self, dets: np.ndarray) -> np.ndarray:
+        store = self.store
+        dets = np.hstack([dets, np.arange(len(dets)).reshape(-1, 1)])
+        self.frame_count += 1
+        confs = dets[:, 4]
+
+        dets_second = dets[np.logical_and(confs > self.min_conf, confs < self.track_thresh)]
+        dets = dets[confs > self.track_thresh]
+        det_boxes = xyxy_roundtrip(dets[:, 0:4])
+        det_xyah = xyxy_to_xyah(dets[:, 0:4])
+
+        is_activated = store.activated[self._active]
+        unconfirmed = self._active[~is_activated]
+        tracked = self._active[is_activated]
+
+        """ Step 2: First association, with high conf detection boxes"""
+        pool = _joint(tracked, self._lost)
+        self._multi_predict(pool)
+        dists = _fuse_score(iou_distance(store.xyxy(pool), det_boxes, sparse=self.sparse_iou), dets[:, 4])
+        matches, u_track, u_detection = linear_assignment(dists, thresh=self.match_thresh, solver=self.lap_solver)
+        matches, u_track = _matches(matches), _indices(u_track)
+
+        rows, idets = pool[matches[:, 0]], matches[:, 1]
+        was_tracked = store.state[rows] == TrackState.Tracked
+        self._update_rows(rows[was_tracked], dets[idets[was_tracked]], det_xyah[idets[was_tracked]])
+        self._update_rows(rows[~was_tracked], dets[idets[~was_tracked]], det_xyah[idets[~was_tracked]],
+                          reactivate=True)
+        activated = [rows[was_tracked]]
+        refind = rows[~was_tracked]
+
+        """ Step 3: Second association, with low conf detection boxes"""
+        u_pool = pool[u_track]
+        r_tracked = u_pool[store.state[u_pool] == TrackState.Tracked]
+        dists = iou_distance(store.xyxy(r_tracked), xyxy_roundtrip(dets_second[:, 0:4]), sparse=self.sparse_iou)
+        matches, u_track, _ = linear_assignment(dists, thresh=0.5, solver=self.lap_solver)
+        matches, u_track = _matches(matches), _indices(u_track)
+        rows = r_tracked[matches[:, 0]]
+        self._update_rows(rows, dets_second[matches[:, 1]], xyxy_to_xyah(dets_second[matches[:, 1], 0:4]))
+        activated.append(rows)
+
+        lost = r_tracked[u_track]
+        lost = lost[store.state[lost] != TrackState.Lost]
+        store.state[lost] = TrackState.Lost
+
+        """Deal with unconfirmed tracks, usually tracks with only one beginning frame"""
+        u_detection = _indices(u_detection)
+        dists = iou_distance(store.xyxy(unconfirmed), det_boxes[u_detection], sparse=self.sparse_iou)
+        dists = _fuse_score(dists, dets[u_detection, 4])
+        matches, u_unconfirmed, u_new = linear_assignment(dists, thresh=0.7, solver=self.lap_solver)
+        matches = _matches(matches)
+        rows, idets = unconfirmed[matches[:, 0]], u_detection[matches[:, 1]]
+        self._update_rows(rows, dets[idets], det_xyah[idets])
+        activated.append(rows)
+        removed = [unconfirmed[_indices(u_unconfirmed)]]
+        store.state[removed[0]] = TrackState.Removed
+
+        """ Step 4: Init new stracks"""
+        new = u_detection[_indices(u_new)]
+        new = new[dets[new, 4] >= self.det_thresh]
+        activated.append(self._activate(dets[new], det_xyah[new]))
+
+        """ Step 5: Update state"""
+        expired = self._lost[self.frame_count - store.frame_id[self._lost] > self.max_time_lost]
+        store.state[expired] = TrackState.Removed
+        removed.append(expired)
+
+        active = self._active[store.state[self._active] == TrackState.Tracked]
+        active = _joint(active, np.concatenate(activated))
+        active = _joint(active, refind)
+        lost_rows = np.concatenate([_sub(self._lost, active), lost])
+        if self.removed_ids:
+            lost_rows = lost_rows[~np.isin(store.track_id[lost_rows], list(self.removed_ids))]
+        self.removed_ids.update(store.track_id[np.concatenate(removed)].tolist())
+        self._active, self._lost = self._remove_duplicates(active, lost_rows)
+        held = np.concatenate([self._active, self._lost])
+        store.release(held)
+        if self.removed_ids:
+            self.removed_ids.intersection_update(store.track_id[held].tolist())
+
+        return self._outputs(self._active[store.activated[self._active]])
+
+    def memory_stats(self) -> dict:
+        """``ByteTrack.memory_stats`` plus the TrackStore capacity and size."""
+        trackers = self.per_class_trackers.values() if self.per_class else [self]
+        stats = {'active': 0, 'lost': 0, 'removed_ids': 0, 'store_rows': 0, 'store_bytes': 0}
+        for tracker in trackers:
+            stats['active'] += len(tracker._active)
+            stats['lost'] += len(tracker._lost)
+            stats['removed_ids'] += len(tracker.removed_ids)
+            stats['store_rows'] += tracker.store.capacity
+            stats['store_bytes'] += tracker.store.nbytes
+        if self.per_class:
+            stats['classes'] = len(self.per_class_trackers)
+        return stats
+
+    def _snapshot_tracks(self) -> dict:
+        """Held rows, active then lost, in the same columns as ``ByteTrack._snapshot_tracks``."""
+        store = self.store
+        rows = np.concatenate([self._active, self._lost])
+        columns = {name: getattr(store, name)[rows].copy() for name in SNAPSHOT_COLUMNS}
+        columns['mean'] = columns['mean'].astype(np.float64)
+        columns['covariance'] = columns['covariance'].astype(np.float64)
+        columns['history'], columns['history_len'] = pack_history(
+            [store.observations(row) for row in rows.tolist()], self.max_obs)
+        columns['lost'] = np.arange(len(rows)) >= len(self._active)
+        columns['removed'] = np.isin(columns['track_id'], list(self.removed_ids))
+        return columns
+
+    def _restore_tracks(self, columns: dict):
+        n = len(columns['track_id'])
+        store = TrackStore(capacity=max(64, n), max_obs=self.max_obs, dtype=self.kalman_filter.dtype)
+        rows = store.allocate(n)
+        for name in SNAPSHOT_COLUMNS:
+            getattr(store, name)[rows] = columns[name]
+        for row, boxes in zip(rows.tolist(), unpack_history(columns['history'], columns['history_len'],
+                                                             self.max_obs)):
+            store.history[row, :len(boxes)] = boxes
+            store.history_len[row] = len(boxes)
+        self.store = store
+        self._active, self._lost = rows[~columns['lost']], rows[columns['lost']]
+        self.removed_ids = set(columns['track_id'][columns['removed']].tolist())
+
+    @property
+    def _id_count(self) -> int:
+        return self.id_counter.count
+
+    @_id_count.setter
+    def _id_count(self, count: int):
+        self.id_counter.count = count
+
+    def predict_only(self) -> np.ndarray:
+        """
+        Advance the tracker by one frame without detections (non-keyframe),
+        exactly like ``ByteTrack.predict_only``.
+        """
+        if self.per_class:
+            outputs = [np.empty((0, 8))]
+            for _, tracker in sorted(self.per_class_trackers.items()):
+                tracker.frame_count = self.frame_count
+                outputs.append(tracker.predict_only())
+            self.frame_count += 1
+            return np.concatenate(outputs)
+
+        self.frame_count += 1
+        tracked = self._active[self.store.activated[self._active]]
+        self._multi_predict(_joint(tracked, self._lost))
+        outputs = self._outputs(tracked)
+        outputs[:, 7] = -1
+        return outputs
+
+    def _multi_predict(self, rows: np.ndarray):
+        if len(rows) == 0:
+            return
+        store = self.store
+        mean = store.mean[rows]
+        mean[store.state[rows] != TrackState.Tracked, 7] = 0
+        store.mean[rows], store.covariance[rows] = self.kalman_filter.multi_predict(mean, store.covariance[rows])
+
+    def _update_rows(self, rows: np.ndarray, dets: np.ndarray, xyah: np.ndarray, reactivate: bool = False):
+        """STrack.update (or re_activate) of ``rows`` with their matched detections."""
+        if len(rows) == 0:
+            return
+        store = self.store
+        if reactivate:
+            store.tracklet_len[rows] = 0
+        else:
+            store.tracklet_len[rows] += 1
+            store.observe(rows)
+        store.mean[rows], store.covariance[rows] = self.kalman_filter.multi_update(
+            store.mean[rows], store.covariance[rows], xyah
+        )
+        store.frame_id[rows] = self.frame_count
+        store.state[rows] = TrackState.Tracked
+        store.activated[rows] = True
+        store.conf[rows] = dets[:, 4]
+        store.cls[rows] = dets[:, 5]
+        store.det_ind[rows] = dets[:, 6]
+
+    def _activate(self, dets: np.ndarray, xyah: np.ndarray) -> np.ndarray:
+        """STrack.activate for every detection, returns the new rows."""
+        n = len(dets)
+        if n == 0:
+            return _EMPTY
+        store = self.store
+        rows = store.allocate(n)
+        first = self.id_counter.take(n)
+        store.track_id[rows] = np.arange(first, first + n)
+
+        store.mean[rows], store.covariance[rows] = self.kalman_filter.multi_initiate(xyah)
+
+        store.tracklet_len[rows] = 0
+        store.state[rows] = TrackState.Tracked
+        store.activated[rows] = self.frame_count == 1
+        store.frame_id[rows] = self.frame_count
+        store.start_frame[rows] = self.frame_count
+        store.conf[rows] = dets[:, 4]
+        store.cls[rows] = dets[:, 5]
+        store.det_ind[rows] = dets[:, 6]
+        return rows
+
+    def _remove_duplicates(self, rows_a: np.ndarray, rows_b: np.ndarray):
+        """``remove_duplicate_stracks`` on row indices: of two overlapping tracks the younger one goes."""
+        store = self.store
+        pdist = iou_distance(store.xyxy(rows_a), store.xyxy(rows_b), sparse=self.sparse_iou)
+        if self.sparse_iou:
+            pdist = pdist.tocoo()
+            close = pdist.data < 0.15
+            p, q = pdist.row[close], pdist.col[close]
+        else:
+            p, q = np.where(pdist < 0.15)
+        if len(p) == 0:
+            return rows_a, rows_b
+        time_p = store.frame_id[rows_a[p]] - store.start_frame[rows_a[p]]
+        time_q = store.frame_id[rows_b[q]] - store.start_frame[rows_b[q]]
+        older_p = time_p > time_q
+        return np.delete(rows_a, p[~older_p]), np.delete(rows_b, q[older_p])
+
+    def _outputs(self, rows: np.ndarray) -> np.ndarray:
+        store = self.store
+        return np.column_stack([store.xyxy(rows), store.track_id[rows], store.conf[rows],
+                                store.cls[rows], store.det_ind[rows]]).reshape(-1, 8)
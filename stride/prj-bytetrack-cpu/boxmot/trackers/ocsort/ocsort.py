@@ -53,6 +53,43 @@ def speed_direction(bbox1, bbox2):
     return speed / norm
 
 
+def constant_velocity_kf(max_obs=50, Q_xy_scaling=0.01, Q_s_scaling=0.0001):
+    """
+    KalmanFilterXYSR with OC-SORT's constant velocity model on (x, y, s, r)
+    and its initial P, Q and R; the state is left at zero.
+    """
+    kf = KalmanFilterXYSR(dim_x=7, dim_z=4, max_obs=max_obs)
+    kf.F = np.array(
+        [
+            [1, 0, 0, 0, 1, 0, 0],
+            [0, 1, 0, 0, 0, 1, 0],
+            [0, 0, 1, 0, 0, 0, 1],
+            [0, 0, 0, 1, 0, 0, 0],
+            [0, 0, 0, 0, 1, 0, 0],
+            [0, 0, 0, 0, 0, 1, 0],
+            [0, 0, 0, 0, 0, 0, 1],
+        ]
+    )
+    kf.H = np.array(
+        [
+            [1, 0, 0, 0, 0, 0, 0],
+            [0, 1, 0, 0, 0, 0, 0],
+            [0, 0, 1, 0, 0, 0, 0],
+            [0, 0, 0, 1, 0, 0, 0],
+        ]
+    )
+
+    kf.R[2:, 2:] *= 10.0
+    kf.P[
+        4:, 4:
+    ] *= 1000.0  # give high uncertainty to the unobservable initial velocities
+    kf.P *= 10.0
+
+    kf.Q[4:6, 4:6] *= Q_xy_scaling
+    kf.Q[-1, -1] *= Q_s_scaling
+    return kf
+
+
 class KalmanBoxTracker(object):
     """
     This class represents the internal state of individual tracked objects observed as bbox.
@@ -80,36 +117,7 @@ class KalmanBoxTracker(object):
         self.Q_xy_scaling = Q_xy_scaling
         self.Q_s_scaling = Q_s_scaling
 
-        self.kf = KalmanFilterXYSR(dim_x=7, dim_z=4, max_obs=max_obs)
-        self.kf.F = np.array(
-            [
-                [1, 0, 0, 0, 1, 0, 0],
-                [0, 1, 0, 0, 0, 1, 0],
-                [0, 0, 1, 0, 0, 0, 1],
-                [0, 0, 0, 1, 0, 0, 0],
-                [0, 0, 0, 0, 1, 0, 0],
-                [0, 0, 0, 0, 0, 1, 0],
-                [0, 0, 0, 0, 0, 0, 1],
-            ]
-        )
-        self.kf.H = np.array(
-            [
-                [1, 0, 0, 0, 0, 0, 0],
-                [0, 1, 0, 0, 0, 0, 0],
-                [0, 0, 1, 0, 0, 0, 0],
-                [0, 0, 0, 1, 0, 0, 0],
-            ]
-        )
-
-        self.kf.R[2:, 2:] *= 10.0
-        self.kf.P[
-            4:, 4:
-        ] *= 1000.0  # give high uncertainty to the unobservable initial velocities
-        self.kf.P *= 10.0
-
-        self.kf.Q[4:6, 4:6] *= self.Q_xy_scaling
-        self.kf.Q[-1, -1] *= self.Q_s_scaling
-
+        self.kf = constant_velocity_kf(max_obs, Q_xy_scaling, Q_s_scaling)
         self.kf.x[:4] = xyxy2xysr(bbox)
         self.time_since_update = 0
         self.id = KalmanBoxTracker.count
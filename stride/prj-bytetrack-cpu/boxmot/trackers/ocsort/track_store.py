@@ -0,0 +1,195 @@
+import numpy as np
+
+# observation age of an empty ring buffer slot, below any age a lookup asks for
+_NO_AGE = np.iinfo(np.int64).min
+
+
+def xyxy_to_xysr(xyxy: np.ndarray) -> np.ndarray:
+    """(N, 4+) boxes to (N, 4) Kalman measurements, same float steps as ``ops.xyxy2xysr``."""
+    w = xyxy[:, 2] - xyxy[:, 0]
+    h = xyxy[:, 3] - xyxy[:, 1]
+    return np.stack([xyxy[:, 0] + w / 2.0, xyxy[:, 1] + h / 2.0, w * h, w / (h + 1e-6)], axis=1)
+
+
+def xysr_to_xyxy(x: np.ndarray) -> np.ndarray:
+    """(N, 4+) Kalman states to (N, 4) boxes, same float steps as ``ocsort.convert_x_to_bbox``."""
+    w = np.sqrt(x[:, 2] * x[:, 3])
+    h = x[:, 2] / w
+    return np.stack([x[:, 0] - w / 2.0, x[:, 1] - h / 2.0, x[:, 0] + w / 2.0, x[:, 1] + h / 2.0], axis=1)
+
+
+def speed_direction_rows(bboxes1: np.ndarray, bboxes2: np.ndarray) -> np.ndarray:
+    """(N, 2) ``ocsort.speed_direction`` of every row pair, (dy, dx) unit vectors."""
+    cx1, cy1 = (bboxes1[:, 0] + bboxes1[:, 2]) / 2.0, (bboxes1[:, 1] + bboxes1[:, 3]) / 2.0
+    cx2, cy2 = (bboxes2[:, 0] + bboxes2[:, 2]) / 2.0, (bboxes2[:, 1] + bboxes2[:, 3]) / 2.0
+    speed = np.stack([cy2 - cy1, cx2 - cx1], axis=1)
+    norm = np.sqrt((cy2 - cy1) ** 2 + (cx2 - cx1) ** 2) + 1e-6
+    return speed / norm[:, None]
+
+
+class OcSortTrackStore:
+    """Struct-of-arrays storage for OcSort tracks.
+
+    One row per track with what ``KalmanBoxTracker`` and its
+    ``KalmanFilterXYSR`` hold: state ``x`` (N, 7) and ``P`` (N, 7, 7), the
+    state saved when the track lost its detection (``frozen_x`` /
+    ``frozen_P``, for the observation-centric re-update), ``observed`` /
+    ``frozen`` flags, the last measurement ``last_z``, the id, age, hit and
+    miss counters, ``velocity``, ``last_observation`` and the observations
+    of the last ``delta_t`` ages in a ring buffer (``obs_age``, ``obs_box``)
+    instead of an ever growing dict. Rows of removed tracks are recycled,
+    the arrays grow by doubling.
+    """
+
+    __slots__ = ('capacity', 'delta_t', 'x', 'P', 'frozen_x', 'frozen_P', 'frozen', 'observed', 'last_z',
+                 'track_id', 'age', 'time_since_update', 'hits', 'hit_streak', 'conf', 'cls', 'det_ind',
+                 'velocity', 'last_observation', 'obs_age', 'obs_box', 'used')
+
+    def __init__(self, capacity: int = 64, delta_t: int = 3):
+        self.capacity = 0
+        self.delta_t = delta_t
+        self.x = np.empty((0, 7))
+        self.P = np.empty((0, 7, 7))
+        self.frozen_x = np.empty((0, 7))
+        self.frozen_P = np.empty((0, 7, 7))
+        self.frozen = np.empty(0, dtype=bool)
+        self.observed = np.empty(0, dtype=bool)
+        self.last_z = np.empty((0, 4))
+        self.track_id = np.empty(0, dtype=np.int64)
+        self.age = np.empty(0, dtype=np.int64)
+        self.time_since_update = np.empty(0, dtype=np.int64)
+        self.hits = np.empty(0, dtype=np.int64)
+        self.hit_streak = np.empty(0, dtype=np.int64)
+        self.conf = np.empty(0)
+        self.cls = np.empty(0)
+        self.det_ind = np.empty(0)
+        self.velocity = np.empty((0, 2))
+        self.last_observation = np.empty((0, 5))
+        self.obs_age = np.empty((0, delta_t), dtype=np.int64)
+        self.obs_box = np.empty((0, delta_t, 5))
+        self.used = np.empty(0, dtype=bool)
+        self._grow(capacity)
+
+    def __len__(self) -> int:
+        return int(self.used.sum())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__[2:])
+
+    def _grow(self, capacity: int):
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        for name in self.__slots__[2:]:
+            column = getattr(self, name)
+            pad = np.zeros((extra,) + column.shape[1:], dtype=column.dtype)
+            setattr(self, name, np.concatenate([column, pad]))
+        self.capacity = capacity
+
+    def allocate(self, n: int) -> np.ndarray:
+        """Row indices for ``n`` new tracks, growing the arrays if needed, with the per-track state reset."""
+        free = np.flatnonzero(~self.used)
+        if len(free) < n:
+            start = self.capacity
+            self._grow(max(2 * self.capacity, self.capacity + n - len(free)))
+            free = np.concatenate([free, np.arange(start, self.capacity)])
+        rows = free[:n]
+        self.used[rows] = True
+        self.frozen[rows] = False
+        self.observed[rows] = False
+        self.age[rows] = 0
+        self.time_since_update[rows] = 0
+        self.hits[rows] = 0
+        self.hit_streak[rows] = 0
+        self.velocity[rows] = 0.0
+        self.last_observation[rows] = -1.0  # KalmanBoxTracker's "no observation" placeholder
+        self.obs_age[rows] = _NO_AGE
+        return rows
+
+    def release(self, keep_rows: np.ndarray):
+        """Free every row not in ``keep_rows``."""
+        keep = np.zeros(self.capacity, dtype=bool)
+        keep[keep_rows] = True
+        self.used &= keep
+
+    def xyxy(self, rows: np.ndarray) -> np.ndarray:
+        return xysr_to_xyxy(self.x[rows])
+
+    def previous_obs(self, rows: np.ndarray) -> np.ndarray:
+        """
+        ``k_previous_obs`` of ``rows``: the oldest observation of the last
+        ``delta_t`` ages, else the last observation (the -1 placeholder for
+        a track never observed).
+        """
+        k = self.delta_t
+        ages = self.age[rows, None] - k + np.arange(k)
+        slots = ages % k
+        found = self.obs_age[rows[:, None], slots] == ages
+        previous = self.last_observation[rows].copy()
+        hit = found.any(1)
+        first = found.argmax(1)[hit]
+        previous[hit] = self.obs_box[rows[hit], slots[hit, first]]
+        return previous
+
+    def observe(self, rows: np.ndarray, bboxes: np.ndarray):
+        """Record (N, 5) observed boxes of ``rows`` at their current age."""
+        slots = self.age[rows] % self.delta_t
+        self.obs_age[rows, slots] = self.age[rows]
+        self.obs_box[rows, slots] = bboxes
+        self.last_observation[rows] = bboxes
+
+    def view(self, row: int) -> 'OcSortTrackView':
+        return OcSortTrackView(self, row)
+
+
+class OcSortTrackView:
+    """Read-only KalmanBoxTracker-like access to one row of an OcSortTrackStore."""
+
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store: OcSortTrackStore, row: int):
+        self.store = store
+        self.row = row
+
+    @property
+    def id(self) -> int:
+        return int(self.store.track_id[self.row])
+
+    @property
+    def age(self) -> int:
+        return int(self.store.age[self.row])
+
+    @property
+    def time_since_update(self) -> int:
+        return int(self.store.time_since_update[self.row])
+
+    @property
+    def hits(self) -> int:
+        return int(self.store.hits[self.row])
+
+    @property
+    def hit_streak(self) -> int:
+        return int(self.store.hit_streak[self.row])
+
+    @property
+    def conf(self) -> float:
+        return float(self.store.conf[self.row])
+
+    @property
+    def cls(self) -> float:
+        return float(self.store.cls[self.row])
+
+    @property
+    def velocity(self) -> np.ndarray:
+        return self.store.velocity[self.row]
+
+    @property
+    def last_observation(self) -> np.ndarray:
+        return self.store.last_observation[self.row]
+
+    def get_state(self) -> np.ndarray:
+        return self.store.xyxy([self.row])
+
+    def __repr__(self):
+        return f"OcSortTrackView(id={self.id}, age={self.age}, xyxy={self.get_state()[0].round(1).tolist()})"
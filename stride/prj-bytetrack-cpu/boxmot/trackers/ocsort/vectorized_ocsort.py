@@ -0,0 +1,251 @@
+import numpy as np
+
+from boxmot.trackers.basetracker import BaseTracker
+from boxmot.trackers.ocsort.ocsort import KalmanBoxTracker, OcSort, constant_velocity_kf
+from boxmot.trackers.ocsort.track_store import OcSortTrackStore, speed_direction_rows, xysr_to_xyxy, xyxy_to_xysr
+from boxmot.utils.association import associate, linear_assignment
+from boxmot.utils.iou import AssociationFunction
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+class VectorizedOcSort(OcSort):
+    """
+    OcSort on a struct-of-arrays OcSortTrackStore instead of one KalmanBoxTracker per track.
+
+    Same association (same thresholds, same track ordering, same quirks) and
+    the same outputs as ``OcSort``, but every track is a row of stacked
+    arrays: prediction and correction are one batched ``multi_predict`` /
+    ``multi_update`` of the shared Kalman model per frame, the velocities,
+    previous observations and last boxes for the velocity direction
+    consistency are array lookups, and the observation-centric re-update of
+    tracks found again runs for all of them at once. Observations are kept
+    for the last ``delta_t`` ages only (a ring buffer per track), so a track
+    costs the same memory at any age. ``active_tracks`` returns
+    ``OcSortTrackView`` objects for inspection. Axis-aligned boxes only.
+
+    Args: see ``OcSort``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # setup_decorator only builds it from an image, which the tracking services never pass
+        self.asso_func = AssociationFunction(w=self.w, h=self.h, asso_mode=self.asso_func_name).asso_func
+        self.kf = constant_velocity_kf(self.max_obs, self.Q_xy_scaling, self.Q_s_scaling)
+        self.store = OcSortTrackStore(delta_t=self.delta_t)
+        self._rows = _EMPTY  # rows, in OcSort's active_tracks order
+
+    @property
+    def is_obb(self) -> bool:
+        return False
+
+    @is_obb.setter
+    def is_obb(self, is_obb: bool):
+        # set by BaseTracker.__init__, and by setup_decorator from the width of the first detections
+        if is_obb:
+            raise ValueError("VectorizedOcSort tracks axis-aligned boxes, use OcSort for oriented boxes")
+
+    @property
+    def active_tracks(self):
+        return [self.store.view(row) for row in self._rows]
+
+    @active_tracks.setter
+    def active_tracks(self, tracks):
+        # BaseTracker.__init__ resets the list, anything else would bypass the store
+        if len(tracks):
+            raise AttributeError("VectorizedOcSort keeps its tracks in self.store")
+
+    def _init_class_tracker(self, tracker: "VectorizedOcSort"):
+        tracker.store = OcSortTrackStore(delta_t=self.delta_t)
+        tracker._rows = _EMPTY
+
+    def _has_tracks(self) -> bool:
+        return len(self._rows) > 0
+
+    @BaseTracker.setup_decorator
+    @BaseTracker.per_class_decorator
+    def update(self, dets: np.ndarray) -> np.ndarray:
+        store = self.store
+        self.frame_count += 1
+
+        dets = np.hstack([dets, np.arange(len(dets)).reshape(-1, 1)])
+        confs = dets[:, 4]
+        dets_second = dets[np.logical_and(confs > self.min_conf, confs < self.det_thresh)]
+        dets = dets[confs > self.det_thresh]
+
+        # predict, tracks whose box became NaN are dropped
+        self._predict(self._rows)
+        boxes = store.xyxy(self._rows)
+        valid = ~np.isnan(boxes).any(1)
+        self._rows, boxes = self._rows[valid], boxes[valid]
+        rows = self._rows
+        trks = np.column_stack([boxes, np.zeros(len(rows))])
+
+        velocities = store.velocity[rows]
+        last_boxes = store.last_observation[rows]
+        k_observations = store.previous_obs(rows)
+
+        """
+            First round of association
+        """
+        matched, unmatched_dets, unmatched_trks = associate(
+            dets[:, 0:5],
+            trks,
+            self.asso_func,
+            self.asso_threshold,
+            velocities,
+            k_observations,
+            self.inertia,
+            self.w, self.h,
+        )
+        # (track index, detection row) of every round, applied at once: a track is matched at most once
+        match_trks, match_dets = [matched[:, 1]], [dets[matched[:, 0]]]
+
+        """
+            Second round of associaton by OCR
+        """
+        # BYTE association
+        if self.use_byte and len(dets_second) > 0 and unmatched_trks.shape[0] > 0:
+            u_trks = trks[unmatched_trks]
+            iou_left = np.array(self.asso_func(dets_second, u_trks))
+            if iou_left.max() > self.asso_threshold:
+                matched_indices = linear_assignment(-iou_left).reshape(-1, 2)
+                keep = iou_left[matched_indices[:, 0], matched_indices[:, 1]] >= self.asso_threshold
+                matched_indices = matched_indices[keep]
+                trk_inds = unmatched_trks[matched_indices[:, 1]]
+                match_trks.append(trk_inds)
+                match_dets.append(dets_second[matched_indices[:, 0]])
+                unmatched_trks = np.setdiff1d(unmatched_trks, trk_inds)
+
+        if unmatched_dets.shape[0] > 0 and unmatched_trks.shape[0] > 0:
+            left_dets = dets[unmatched_dets]
+            left_trks = last_boxes[unmatched_trks]
+            iou_left = np.array(self.asso_func(left_dets, left_trks))
+            if iou_left.max() > self.asso_threshold:
+                rematched_indices = linear_assignment(-iou_left).reshape(-1, 2)
+                keep = iou_left[rematched_indices[:, 0], rematched_indices[:, 1]] >= self.asso_threshold
+                rematched_indices = rematched_indices[keep]
+                det_inds = unmatched_dets[rematched_indices[:, 0]]
+                trk_inds = unmatched_trks[rematched_indices[:, 1]]
+                match_trks.append(trk_inds)
+                match_dets.append(dets[det_inds])
+                unmatched_dets = np.setdiff1d(unmatched_dets, det_inds)
+                unmatched_trks = np.setdiff1d(unmatched_trks, trk_inds)
+
+        self._update_rows(rows[np.concatenate(match_trks).astype(int)], np.concatenate(match_dets))
+        self._miss_rows(rows[np.asarray(unmatched_trks, dtype=int).reshape(-1)])
+
+        # create and initialise new trackers for unmatched detections
+        self._rows = np.concatenate([rows, self._create(dets[np.asarray(unmatched_dets, dtype=int)])])
+
+        return self._outputs()
+
+    def _predict(self, rows: np.ndarray):
+        """KalmanBoxTracker.predict of ``rows``."""
+        if len(rows) == 0:
+            return
+        store = self.store
+        x = store.x[rows]
+        x[x[:, 6] + x[:, 2] <= 0, 6] *= 0.0
+        store.x[rows], store.P[rows] = self.kf.multi_predict(x, store.P[rows])
+        store.age[rows] += 1
+        store.hit_streak[rows[store.time_since_update[rows] > 0]] = 0
+        store.time_since_update[rows] += 1
+
+    def _update_rows(self, rows: np.ndarray, dets: np.ndarray):
+        """KalmanBoxTracker.update of ``rows`` with their matched (N, 7) detection rows."""
+        if len(rows) == 0:
+            return
+        store = self.store
+        bboxes = dets[:, :5]
+        store.det_ind[rows] = dets[:, 6]
+        store.conf[rows] = bboxes[:, 4]
+        store.cls[rows] = dets[:, 5]
+
+        # speed direction from the observation delta_t steps away, if the track was observed
+        has_previous = store.last_observation[rows].sum(1) >= 0
+        previous = store.previous_obs(rows[has_previous])
+        store.velocity[rows[has_previous]] = speed_direction_rows(previous, bboxes[has_previous])
+        store.observe(rows, bboxes)
+
+        gap = store.time_since_update[rows].copy()
+        store.time_since_update[rows] = 0
+        store.hits[rows] += 1
+        store.hit_streak[rows] += 1
+
+        z = xyxy_to_xysr(bboxes)
+        reupdate = ~store.observed[rows] & store.frozen[rows]
+        if reupdate.any():
+            self._reupdate(rows[reupdate], z[reupdate], gap[reupdate])
+        store.observed[rows] = True
+        store.x[rows], store.P[rows] = self.kf.multi_update(store.x[rows], store.P[rows], z)
+        store.last_z[rows] = z
+
+    def _reupdate(self, rows: np.ndarray, z: np.ndarray, gap: np.ndarray):
+        """
+        ``KalmanFilterXYSR.unfreeze`` of ``rows``, observed again after
+        ``gap - 1`` missed frames: back to the state saved at the first miss,
+        then a Kalman update with the box interpolated between the last and
+        the new measurement (in x, y, w, h) and a predict for every missed
+        frame. Rows with shorter gaps drop out of the loop early.
+        """
+        store = self.store
+        x, P = store.frozen_x[rows], store.frozen_P[rows]
+        x1, y1, s1, r1 = store.last_z[rows].T
+        w1, h1 = np.sqrt(s1 * r1), np.sqrt(s1 / r1)
+        x2, y2, s2, r2 = z.T
+        w2, h2 = np.sqrt(s2 * r2), np.sqrt(s2 / r2)
+        dx, dy = (x2 - x1) / gap, (y2 - y1) / gap
+        dw, dh = (w2 - w1) / gap, (h2 - h1) / gap
+        for i in range(int(gap.max())):
+            step = gap > i
+            w, h = w1[step] + (i + 1) * dw[step], h1[step] + (i + 1) * dh[step]
+            new_box = np.stack([x1[step] + (i + 1) * dx[step], y1[step] + (i + 1) * dy[step], w * h, w / h], axis=1)
+            x[step], P[step] = self.kf.multi_update(x[step], P[step], new_box)
+            step &= gap - 1 > i
+            x[step], P[step] = self.kf.multi_predict(x[step], P[step])
+        store.x[rows], store.P[rows] = x, P
+
+    def _miss_rows(self, rows: np.ndarray):
+        """KalmanBoxTracker.update(None): freeze the state of tracks that just lost their detection."""
+        store = self.store
+        store.det_ind[rows] = np.nan
+        freeze = rows[store.observed[rows]]
+        store.frozen_x[freeze], store.frozen_P[freeze] = store.x[freeze], store.P[freeze]
+        store.frozen[freeze] = True
+        store.observed[rows] = False
+
+    def _create(self, dets: np.ndarray) -> np.ndarray:
+        """New KalmanBoxTracker for every detection, returns the new rows."""
+        n = len(dets)
+        if n == 0:
+            return _EMPTY
+        store = self.store
+        rows = store.allocate(n)
+        store.track_id[rows] = np.arange(KalmanBoxTracker.count, KalmanBoxTracker.count + n)
+        KalmanBoxTracker.count += n
+        store.x[rows] = 0.0
+        store.x[rows, :4] = xyxy_to_xysr(dets[:, :4])
+        store.P[rows] = self.kf.P
+        store.conf[rows] = dets[:, 4]
+        store.cls[rows] = dets[:, 5]
+        store.det_ind[rows] = dets[:, 6]
+        return rows
+
+    def _outputs(self) -> np.ndarray:
+        """Confirmed tracks updated this frame, in OcSort's (reversed) order; drops the dead ones."""
+        store = self.store
+        rows = self._rows[::-1]
+        d = store.last_observation[rows, :4].copy()
+        unobserved = store.last_observation[rows].sum(1) < 0
+        d[unobserved] = xysr_to_xyxy(store.x[rows[unobserved]])
+        out = (store.time_since_update[rows] < 1) & (
+            (store.hit_streak[rows] >= self.min_hits) | (self.frame_count <= self.min_hits)
+        )
+        rows, d = rows[out], d[out]
+        ret = np.column_stack([d, store.track_id[rows] + 1, store.conf[rows], store.cls[rows], store.det_ind[rows]])
+
+        # remove dead tracklet
+        self._rows = self._rows[store.time_since_update[self._rows] <= self.max_age]
+        store.release(self._rows)
+        return ret if len(ret) > 0 else np.array([])
@@ -27,7 +27,7 @@ def linear_assignment(cost_matrix):
         from scipy.optimize import linear_sum_assignment
 
         x, y = linear_sum_assignment(cost_matrix)
-        return np.array([list(zip(x, y))])
+        return np.array(list(zip(x, y))).reshape(-1, 2)
 
 
 def associate_detections_to_trackers(detections, trackers, iou_threshold=0.3):
@@ -132,27 +132,11 @@ def associate(
             np.empty((0, 5), dtype=int),
         )
 
-    Y, X = speed_direction_batch(detections, previous_obs)
-    inertia_Y, inertia_X = velocities[:, 0], velocities[:, 1]
-    inertia_Y = np.repeat(inertia_Y[:, np.newaxis], Y.shape[1], axis=1)
-    inertia_X = np.repeat(inertia_X[:, np.newaxis], X.shape[1], axis=1)
-    diff_angle_cos = inertia_X * X + inertia_Y * Y
-    diff_angle_cos = np.clip(diff_angle_cos, a_min=-1, a_max=1)
-    diff_angle = np.arccos(diff_angle_cos)
-    diff_angle = (np.pi / 2.0 - np.abs(diff_angle)) / np.pi
-
-    valid_mask = np.ones(previous_obs.shape[0])
-    valid_mask[np.where(previous_obs[:, 4] < 0)] = 0
+    angle_diff_cost = velocity_direction_cost(detections, velocities, previous_obs, vdc_weight)
 
     iou_matrix = asso_func(detections, trackers)
     # iou_matrix = iou_batch(detections, trackers)
-    scores = np.repeat(detections[:, -1][:, np.newaxis], trackers.shape[0], axis=1)
     # iou_matrix = iou_matrix * scores # a trick sometiems works, we don't encourage this
-    valid_mask = np.repeat(valid_mask[:, np.newaxis], X.shape[1], axis=1)
-
-    angle_diff_cost = (valid_mask * diff_angle) * vdc_weight
-    angle_diff_cost = angle_diff_cost.T
-    angle_diff_cost = angle_diff_cost * scores
 
     if min(iou_matrix.shape):
         a = (iou_matrix > iou_threshold).astype(np.int32)
@@ -179,29 +163,46 @@ def associate(
     else:
         matched_indices = np.empty(shape=(0, 2))
 
-    unmatched_detections = []
-    for d, det in enumerate(detections):
-        if d not in matched_indices[:, 0]:
-            unmatched_detections.append(d)
-    unmatched_trackers = []
-    for t, trk in enumerate(trackers):
-        if t not in matched_indices[:, 1]:
-            unmatched_trackers.append(t)
+    return split_matches(matched_indices, iou_matrix, iou_threshold)
 
-    # filter out matched with low IOU
-    matches = []
-    for m in matched_indices:
-        if iou_matrix[m[0], m[1]] < iou_threshold:
-            unmatched_detections.append(m[0])
-            unmatched_trackers.append(m[1])
-        else:
-            matches.append(m.reshape(1, 2))
-    if len(matches) == 0:
-        matches = np.empty((0, 2), dtype=int)
-    else:
-        matches = np.concatenate(matches, axis=0)
 
-    return matches, np.array(unmatched_detections), np.array(unmatched_trackers)
+def velocity_direction_cost(detections, velocities, previous_obs, vdc_weight):
+    """
+    (D, T) velocity direction consistency cost of OC-SORT: how well the
+    direction from each track's previous observation to each detection agrees
+    with the track's velocity, weighted by the detection score. Tracks without
+    a previous observation (placeholder conf < 0) get 0. Broadcast over the
+    pairs; same float steps as the repeat-based version it replaces.
+    """
+    Y, X = speed_direction_batch(detections, previous_obs)
+    diff_angle_cos = velocities[:, 1:2] * X + velocities[:, 0:1] * Y
+    diff_angle_cos = np.clip(diff_angle_cos, a_min=-1, a_max=1)
+    diff_angle = np.arccos(diff_angle_cos)
+    diff_angle = (np.pi / 2.0 - np.abs(diff_angle)) / np.pi
+
+    valid_mask = np.where(previous_obs[:, 4] < 0, 0.0, 1.0)
+    angle_diff_cost = (valid_mask[:, np.newaxis] * diff_angle) * vdc_weight
+    return angle_diff_cost.T * detections[:, -1][:, np.newaxis]
+
+
+def split_matches(matched_indices, iou_matrix, iou_threshold):
+    """
+    (matches, unmatched detections, unmatched trackers) from assignment
+    pairs: pairs below ``iou_threshold`` are dropped and their detection /
+    tracker appended to the unmatched ones, after the never matched ones in
+    index order.
+    """
+    matched_indices = np.asarray(matched_indices, dtype=int).reshape(-1, 2)
+    low = iou_matrix[matched_indices[:, 0], matched_indices[:, 1]] < iou_threshold
+
+    det_matched = np.zeros(iou_matrix.shape[0], dtype=bool)
+    det_matched[matched_indices[:, 0]] = True
+    trk_matched = np.zeros(iou_matrix.shape[1], dtype=bool)
+    trk_matched[matched_indices[:, 1]] = True
+
+    unmatched_detections = np.concatenate([np.flatnonzero(~det_matched), matched_indices[low, 0]])
+    unmatched_trackers = np.concatenate([np.flatnonzero(~trk_matched), matched_indices[low, 1]])
+    return matched_indices[~low], unmatched_detections, unmatched_trackers
 
 
 def associate_kitti(
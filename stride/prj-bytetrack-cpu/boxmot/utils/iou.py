@@ -1,6 +1,8 @@
 import cv2 as cv
 import numpy as np
 
+from boxmot.utils.spatial_index import overlap_pairs
+
 
 def iou_obb_pair(i, j, bboxes1, bboxes2):
     """
@@ -32,6 +34,75 @@ def iou_obb_pair(i, j, bboxes1, bboxes2):
     return intersection_area / union_area if union_area > 0 else 0.0
 
 
+def obb_corners(bboxes: np.ndarray) -> np.ndarray:
+    """
+    (N, 4, 2) corners of (N, 5+) cx, cy, w, h, angle boxes, in the order of
+    ``cv.boxPoints`` (angle in degrees, as ``iou_obb_pair`` passes it to OpenCV).
+    """
+    bboxes = np.asarray(bboxes, dtype=float).reshape(len(bboxes), -1)
+    cx, cy, w, h = bboxes[:, 0], bboxes[:, 1], bboxes[:, 2], bboxes[:, 3]
+    angle = np.deg2rad(bboxes[:, 4])
+    b = np.cos(angle) * 0.5
+    a = np.sin(angle) * 0.5
+    p0 = np.stack([cx - a * h - b * w, cy + b * h - a * w], axis=-1)
+    p1 = np.stack([cx + a * h - b * w, cy - b * h - a * w], axis=-1)
+    center = np.stack([cx, cy], axis=-1)
+    return np.stack([p0, p1, 2 * center - p0, 2 * center - p1], axis=1)
+
+
+def _compact(points: np.ndarray, keep: np.ndarray):
+    """
+    Move the kept points of every polygon to the front and pad the rest with
+    copies of the last kept point (zero length edges, no area), trimmed to
+    the longest polygon. Returns (points, number of kept points).
+    """
+    slot = np.cumsum(keep, axis=1) - 1
+    counts = slot[:, -1] + 1
+    width = max(int(counts.max()), 1)
+    rows = np.arange(len(points))
+    compact = np.zeros((len(points), width, 2))
+    compact[np.broadcast_to(rows[:, None], keep.shape)[keep], slot[keep]] = points[keep]
+    pad = np.arange(width)[None, :] >= counts[:, None]
+    last = compact[rows, np.maximum(counts - 1, 0)]
+    return np.where(pad[..., None], last[:, None, :], compact), counts
+
+
+def convex_intersection_area(subject: np.ndarray, clip: np.ndarray) -> np.ndarray:
+    """
+    (P,) intersection areas of P pairs of convex quadrilaterals (P, 4, 2),
+    all pairs at once with Sutherland-Hodgman: the subject polygon is clipped
+    by the four edge half planes of the clip polygon. A polygon is a fixed
+    width array padded with repeats of its last vertex, so each step is a
+    handful of array operations over all pairs; it grows by at most two
+    vertices per clip edge.
+    """
+    # inside is the left of each clip edge for a counter clockwise polygon, flip for clockwise ones
+    edges = np.roll(clip, -1, axis=1) - clip
+    orientation = np.sign(np.sum(clip[:, :, 0] * np.roll(clip[:, :, 1], -1, axis=1)
+                                 - np.roll(clip[:, :, 0], -1, axis=1) * clip[:, :, 1], axis=1))
+    polygon, counts = subject, np.full(len(subject), 4)
+    for k in range(4):
+        origin, edge = clip[:, k, None, :], edges[:, k, None, :]
+        rel = polygon - origin
+        side = orientation[:, None] * (edge[..., 0] * rel[..., 1] - edge[..., 1] * rel[..., 0])
+        prev, side_prev = np.roll(polygon, 1, axis=1), np.roll(side, 1, axis=1)
+        inside, inside_prev = side >= 0, side_prev >= 0
+
+        crossing = (inside != inside_prev) & (counts[:, None] > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(crossing, side_prev / (side_prev - side), 0.0)
+        cut = prev + t[..., None] * (polygon - prev)
+
+        # for every subject edge prev -> cur: the crossing point (if any), then cur (if inside)
+        points = np.stack([cut, polygon], axis=2).reshape(len(polygon), -1, 2)
+        keep = np.stack([crossing, inside & (counts[:, None] > 0)], axis=2).reshape(len(polygon), -1)
+        polygon, counts = _compact(points, keep)
+
+    x, y = polygon[..., 0], polygon[..., 1]
+    area = 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1))
+    return np.where(counts >= 3, area, 0.0)
+
+
 class AssociationFunction:
     def __init__(self, w, h, asso_mode="iou"):
         """
@@ -68,12 +139,30 @@ class AssociationFunction:
 
     @staticmethod
     def iou_batch_obb(bboxes1, bboxes2) -> np.ndarray:
+        """
+        IoU of rotated boxes (cx, cy, w, h, angle), same values as
+        ``iou_obb_pair`` (OpenCV) up to float rounding. Only the pairs whose
+        axis-aligned hulls overlap (``overlap_pairs``) are clipped, with
+        ``convex_intersection_area``; every other pair is 0.
+        """
         N, M = len(bboxes1), len(bboxes2)
-
-        def wrapper(i, j):
-            return iou_obb_pair(i, j, bboxes1, bboxes2)
-
-        iou_matrix = np.fromfunction(np.vectorize(wrapper), shape=(N, M), dtype=int)
+        iou_matrix = np.zeros((N, M))
+        if N == 0 or M == 0:
+            return iou_matrix
+
+        bboxes1 = np.asarray(bboxes1, dtype=float)
+        bboxes2 = np.asarray(bboxes2, dtype=float)
+        corners1, corners2 = obb_corners(bboxes1), obb_corners(bboxes2)
+        hull1 = np.concatenate([corners1.min(1), corners1.max(1)], axis=1)
+        hull2 = np.concatenate([corners2.min(1), corners2.max(1)], axis=1)
+        i, j = overlap_pairs(hull1, hull2)
+        if len(i) == 0:
+            return iou_matrix
+
+        intersection = convex_intersection_area(corners1[i], corners2[j])
+        union = bboxes1[i, 2] * bboxes1[i, 3] + bboxes2[j, 2] * bboxes2[j, 3] - intersection
+        with np.errstate(divide="ignore", invalid="ignore"):
+            iou_matrix[i, j] = np.where(union > 0, intersection / union, 0.0)
         return iou_matrix
 
     @staticmethod
@@ -3,10 +3,12 @@
 import lap
 import numpy as np
 import scipy
+import scipy.sparse
 # # import torch
 from scipy.spatial.distance import cdist
 
 from boxmot.utils.iou import AssociationFunction
+from boxmot.utils.spatial_index import sparse_similarity
 
 """
 Table for the 0.95 quantile of the chi-square distribution with N degrees of
@@ -54,22 +56,169 @@ def _indices_to_matches(cost_matrix, indices, thresh):
     return matches, unmatched_a, unmatched_b
 
 
-def linear_assignment(cost_matrix, thresh):
-    if cost_matrix.size == 0:
-        return (
-            np.empty((0, 2), dtype=int),
-            tuple(range(cost_matrix.shape[0])),
-            tuple(range(cost_matrix.shape[1])),
-        )
-    matches, unmatched_a, unmatched_b = [], [], []
-    cost, x, y = lap.lapjv(cost_matrix, extend_cost=True, cost_limit=thresh)
-    for ix, mx in enumerate(x):
-        if mx >= 0:
-            matches.append([ix, mx])
-    unmatched_a = np.where(x < 0)[0]
-    unmatched_b = np.where(y < 0)[0]
-    matches = np.asarray(matches)
-    return matches, unmatched_a, unmatched_b
+def _eligible(cost_matrix, thresh):
+    """(rows, cols, costs) of the entries <= thresh, dense or scipy.sparse (missing = not eligible)."""
+    if scipy.sparse.issparse(cost_matrix):
+        cost_matrix = scipy.sparse.csr_matrix(cost_matrix)
+        rows = np.repeat(np.arange(cost_matrix.shape[0]), np.diff(cost_matrix.indptr))
+        eligible = cost_matrix.data <= thresh
+        return rows[eligible], cost_matrix.indices[eligible], cost_matrix.data[eligible]
+    rows, cols = np.nonzero(cost_matrix <= thresh)
+    return rows, cols, cost_matrix[rows, cols]
+
+
+def _lapjv_pairs(cost_matrix, thresh):
+    _, x, _ = lap.lapjv(cost_matrix, extend_cost=True, cost_limit=thresh)
+    rows = np.flatnonzero(x >= 0)
+    return np.stack([rows, x[rows]], axis=1)
+
+
+def solve_lapjv(cost_matrix, thresh):
+    """Jonker-Volgenant on the dense matrix (``lap.lapjv``), the original ByteTrack solver."""
+    if scipy.sparse.issparse(cost_matrix):
+        cost_matrix = _densify(cost_matrix, thresh)
+    return _lapjv_pairs(cost_matrix, thresh)
+
+
+def solve_scipy(cost_matrix, thresh):
+    """
+    ``scipy.optimize.linear_sum_assignment`` on the matrix extended the way
+    ``lap.lapjv(extend_cost=True, cost_limit=thresh)`` does it: every row and
+    column can stay unmatched for thresh / 2, so it finds the same optimum.
+    """
+    from scipy.optimize import linear_sum_assignment
+
+    if scipy.sparse.issparse(cost_matrix):
+        cost_matrix = _densify(cost_matrix, thresh)
+    n_a, n_b = cost_matrix.shape
+    extended = np.zeros((n_a + n_b, n_b + n_a))
+    extended[:n_a, :n_b] = cost_matrix
+    extended[:n_a, n_b:] = thresh / 2
+    extended[n_a:, :n_b] = thresh / 2
+    rows, cols = linear_sum_assignment(extended)
+    keep = (rows < n_a) & (cols < n_b)
+    return np.stack([rows[keep], cols[keep]], axis=1)
+
+
+def solve_greedy(cost_matrix, thresh):
+    """
+    Cheapest eligible pair first. Optimal when no track or detection has more
+    than one pair <= thresh (the usual, well separated frame), approximate
+    otherwise.
+    """
+    rows, cols, costs = _eligible(cost_matrix, thresh)
+    if _is_partial_permutation(rows, cols, cost_matrix.shape):
+        return np.stack([rows, cols], axis=1)
+    used_a = np.zeros(cost_matrix.shape[0], dtype=bool)
+    used_b = np.zeros(cost_matrix.shape[1], dtype=bool)
+    matches = []
+    for k in np.argsort(costs, kind="stable"):
+        a, b = rows[k], cols[k]
+        if not used_a[a] and not used_b[b]:
+            used_a[a] = used_b[b] = True
+            matches.append((a, b))
+    return np.asarray(matches, dtype=int).reshape(-1, 2)
+
+
+def solve_sparse(cost_matrix, thresh):
+    """
+    Only pairs with cost <= thresh can be matched. A row and a column that
+    have no other such pair are matched directly; ``lap.lapjv`` only runs on
+    the small dense block of the remaining rows and columns (the tracks and
+    detections around a crowd). Same optimum as ``solve_lapjv``.
+    """
+    return _solve_eligible(*_eligible(cost_matrix, thresh), cost_matrix.shape, thresh)
+
+
+def _solve_eligible(rows, cols, costs, shape, thresh):
+    row_count = np.bincount(rows, minlength=shape[0])
+    col_count = np.bincount(cols, minlength=shape[1])
+    single = (row_count[rows] == 1) & (col_count[cols] == 1)
+    if single.all():
+        return np.stack([rows, cols], axis=1)
+
+    rest = ~single
+    sub_rows = np.flatnonzero(np.bincount(rows[rest], minlength=shape[0]))
+    sub_cols = np.flatnonzero(np.bincount(cols[rest], minlength=shape[1]))
+    block = np.full((len(sub_rows), len(sub_cols)), thresh + 1.0)
+    block[np.searchsorted(sub_rows, rows[rest]), np.searchsorted(sub_cols, cols[rest])] = costs[rest]
+    pairs = _lapjv_pairs(block, thresh)
+    return np.concatenate([np.stack([rows[single], cols[single]], axis=1),
+                           np.stack([sub_rows[pairs[:, 0]], sub_cols[pairs[:, 1]]], axis=1)])
+
+
+def _densify(cost_matrix, thresh):
+    dense = np.full(cost_matrix.shape, thresh + 1.0)
+    rows, cols, costs = _eligible(cost_matrix, thresh)
+    dense[rows, cols] = costs
+    return dense
+
+
+def _is_partial_permutation(rows, cols, shape):
+    return (np.bincount(rows, minlength=shape[0]).max(initial=0) <= 1
+            and np.bincount(cols, minlength=shape[1]).max(initial=0) <= 1)
+
+
+def solve_auto(cost_matrix, thresh):
+    """
+    Picks the solver from the matrix (``test_scripts/test_assignment_solvers.py``
+    has the measurements behind it):
+
+    - no row or column with two eligible pairs (most frames, the IoU matrix is
+      almost a permutation): the eligible pairs are the optimal matching
+    - small dense matrices (< AUTO_DENSE_SIZE entries): ``solve_lapjv``, a
+      single lapjv call is cheaper than splitting
+    - otherwise ``solve_sparse``: lapjv on the conflicting block only
+    """
+    rows, cols, costs = _eligible(cost_matrix, thresh)
+    if _is_partial_permutation(rows, cols, cost_matrix.shape):
+        return np.stack([rows, cols], axis=1)
+    if not scipy.sparse.issparse(cost_matrix) and cost_matrix.size < AUTO_DENSE_SIZE:
+        return _lapjv_pairs(cost_matrix, thresh)
+    return _solve_eligible(rows, cols, costs, cost_matrix.shape, thresh)
+
+
+SOLVERS = {
+    "lapjv": solve_lapjv,
+    "scipy": solve_scipy,
+    "greedy": solve_greedy,
+    "sparse": solve_sparse,
+    "auto": solve_auto,
+}
+AUTO_DENSE_SIZE = 64 * 64
+
+
+def linear_assignment(cost_matrix, thresh, solver=None):
+    """
+    Minimum cost matching of rows (tracks) and columns (detections), pairs
+    costing more than ``thresh`` stay unmatched.
+
+    :param cost_matrix: (N, M) np.ndarray, or scipy.sparse matrix whose missing entries cost more than thresh
+    :param solver: one of ``SOLVERS`` ('lapjv', 'scipy', 'greedy', 'sparse', 'auto');
+        None is 'lapjv' for dense and 'sparse' for sparse matrices
+    :return: (K, 2) matches sorted by row, unmatched rows, unmatched columns
+    """
+    if solver is None:
+        solver = "sparse" if scipy.sparse.issparse(cost_matrix) else "lapjv"
+    if solver not in SOLVERS:
+        raise ValueError(f"solver must be one of {sorted(SOLVERS)}, got '{solver}'")
+    n_a, n_b = cost_matrix.shape
+    if n_a == 0 or n_b == 0:
+        return np.empty((0, 2), dtype=int), np.arange(n_a), np.arange(n_b)
+
+    matches = SOLVERS[solver](cost_matrix, thresh)
+    matches = matches[np.argsort(matches[:, 0], kind="stable")]
+    unmatched_a = np.ones(n_a, dtype=bool)
+    unmatched_a[matches[:, 0]] = False
+    unmatched_b = np.ones(n_b, dtype=bool)
+    unmatched_b[matches[:, 1]] = False
+    return matches, np.flatnonzero(unmatched_a), np.flatnonzero(unmatched_b)
+
+
+def sparse_linear_assignment(cost_matrix, thresh):
+    """``linear_assignment`` on a sparse cost matrix whose missing entries cost more than ``thresh``."""
+    return linear_assignment(cost_matrix, thresh, solver="sparse")
+
 
 def d_iou_distance(atracks, btracks):
     """
@@ -99,11 +248,13 @@ def d_iou_distance(atracks, btracks):
     return cost_matrix
 
 
-def iou_distance(atracks, btracks):
+def iou_distance(atracks, btracks, sparse=False):
     """
     Compute cost based on IoU
     :type atracks: list[STrack]
     :type btracks: list[STrack]
+    :param sparse: only compute overlapping pairs (sort and sweep) and return a
+        scipy.sparse.csr_matrix, a missing entry costs 1
 
     :rtype cost_matrix np.ndarray
     """
@@ -117,6 +268,11 @@ def iou_distance(atracks, btracks):
         atlbrs = [track.xyxy for track in atracks]
         btlbrs = [track.xyxy for track in btracks]
 
+    if sparse:
+        cost_matrix = sparse_similarity(atlbrs, btlbrs, metric="iou")
+        cost_matrix.data = 1 - cost_matrix.data
+        return cost_matrix
+
     ious = np.zeros((len(atlbrs), len(btlbrs)), dtype=np.float32)
     if ious.size == 0:
         return ious
@@ -194,6 +350,11 @@ def fuse_iou(cost_matrix, tracks, detections):
     return fuse_cost
 
 def fuse_score(cost_matrix, detections):
+    if scipy.sparse.issparse(cost_matrix):
+        # missing entries stay at cost 1 (IoU 0)
+        det_confs = np.array([det.conf for det in detections])
+        cost_matrix.data = 1 - (1 - cost_matrix.data) * det_confs[cost_matrix.indices]
+        return cost_matrix
     if cost_matrix.size == 0:
         return cost_matrix
     iou_sim = 1 - cost_matrix
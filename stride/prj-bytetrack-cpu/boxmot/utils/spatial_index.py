@@ -0,0 +1,101 @@
+import numpy as np
+import scipy.sparse
+
+
+def box_areas(bboxes: np.ndarray) -> np.ndarray:
+    """(N,) areas of (N, 4) x1, y1, x2, y2 boxes, same float steps as ``AssociationFunction.iou_batch``."""
+    return (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
+
+
+def overlap_pairs(bboxes1, bboxes2, margin: float = 0.0):
+    """
+    Sort and sweep: index arrays (i, j) of every pair bboxes1[i], bboxes2[j]
+    that overlap, or are less than ``margin`` pixels apart.
+
+    bboxes2 is sorted by x1 once. A box of bboxes1 can only overlap the
+    bboxes2 whose x1 lies in [x1 - widest bboxes2 box, x2), a contiguous
+    run found with two ``searchsorted``; the runs are expanded and checked
+    in x and y without a python loop. Cost is O((N + M) log M) plus the
+    number of boxes sharing an x strip, instead of N * M.
+    """
+    bboxes1 = np.asarray(bboxes1, dtype=float).reshape(-1, 4)
+    bboxes2 = np.asarray(bboxes2, dtype=float).reshape(-1, 4)
+    if len(bboxes1) == 0 or len(bboxes2) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    order = np.argsort(bboxes2[:, 0], kind="stable")
+    x1_sorted = bboxes2[order, 0]
+    max_w = (bboxes2[:, 2] - bboxes2[:, 0]).max()
+    lo = np.searchsorted(x1_sorted, bboxes1[:, 0] - max_w - margin, side="left")
+    hi = np.searchsorted(x1_sorted, bboxes1[:, 2] + margin, side="left")
+    counts = np.maximum(hi - lo, 0)
+
+    i = np.repeat(np.arange(len(bboxes1)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    j = order[np.repeat(lo, counts) + offsets]
+
+    a, b = bboxes1[i], bboxes2[j]
+    keep = (
+        (b[:, 2] + margin > a[:, 0])
+        & (b[:, 0] - margin < a[:, 2])
+        & (b[:, 3] + margin > a[:, 1])
+        & (b[:, 1] - margin < a[:, 3])
+    )
+    return i[keep], j[keep]
+
+
+def pair_similarity(bboxes1, bboxes2, i, j, metric: str = "iou", areas1=None, areas2=None) -> np.ndarray:
+    """
+    IoU / GIoU / DIoU of the pairs (bboxes1[i], bboxes2[j]) only.
+
+    Per pair this is the exact float sequence of the dense
+    ``AssociationFunction.iou_batch`` / ``giou_batch`` / ``diou_batch``
+    (GIoU and DIoU rescaled to [0, 1] like there), with the box areas
+    computed once per box instead of once per pair.
+    """
+    if metric not in ("iou", "giou", "diou"):
+        raise ValueError(f"metric must be 'iou', 'giou' or 'diou', got '{metric}'")
+    if areas1 is None:
+        areas1 = box_areas(bboxes1)
+    if areas2 is None:
+        areas2 = box_areas(bboxes2)
+    a, b = bboxes1[i], bboxes2[j]
+
+    xx1 = np.maximum(a[:, 0], b[:, 0])
+    yy1 = np.maximum(a[:, 1], b[:, 1])
+    xx2 = np.minimum(a[:, 2], b[:, 2])
+    yy2 = np.minimum(a[:, 3], b[:, 3])
+    wh = np.maximum(0.0, xx2 - xx1) * np.maximum(0.0, yy2 - yy1)
+    union = areas1[i] + areas2[j] - wh
+    iou = wh / union
+    if metric == "iou":
+        return iou
+
+    xxc1 = np.minimum(a[:, 0], b[:, 0])
+    yyc1 = np.minimum(a[:, 1], b[:, 1])
+    xxc2 = np.maximum(a[:, 2], b[:, 2])
+    yyc2 = np.maximum(a[:, 3], b[:, 3])
+    if metric == "giou":
+        area_enclose = (xxc2 - xxc1) * (yyc2 - yyc1)
+        return (iou - (area_enclose - union) / area_enclose + 1.0) / 2.0
+
+    inner_diag = ((a[:, 0] + a[:, 2]) / 2.0 - (b[:, 0] + b[:, 2]) / 2.0) ** 2 + \
+                 ((a[:, 1] + a[:, 3]) / 2.0 - (b[:, 1] + b[:, 3]) / 2.0) ** 2
+    outer_diag = (xxc2 - xxc1) ** 2 + (yyc2 - yyc1) ** 2
+    return (iou - inner_diag / outer_diag + 1) / 2.0
+
+
+def sparse_similarity(bboxes1, bboxes2, metric: str = "iou", margin: float = 0.0) -> scipy.sparse.csr_matrix:
+    """
+    (N, M) CSR matrix of ``metric`` for the overlapping pairs found by
+    ``overlap_pairs``; every other pair has no entry. For IoU a missing
+    entry is exactly 0. GIoU / DIoU are also defined for disjoint boxes,
+    ``margin`` widens the candidate search for them.
+    """
+    bboxes1 = np.asarray(bboxes1, dtype=float).reshape(-1, 4)
+    bboxes2 = np.asarray(bboxes2, dtype=float).reshape(-1, 4)
+    i, j = overlap_pairs(bboxes1, bboxes2, margin)
+    sim = pair_similarity(bboxes1, bboxes2, i, j, metric)
+    # overlap_pairs returns the pairs grouped by i, so the row pointers are a cumulative count
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(i, minlength=len(bboxes1)))])
+    return scipy.sparse.csr_matrix((sim, j, indptr), shape=(len(bboxes1), len(bboxes2)))
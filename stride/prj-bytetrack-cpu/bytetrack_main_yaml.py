@@ -22,6 +22,7 @@ from contanos.helpers.start_a_service import start_a_service
 from contanos.utils.create_args import add_argument, add_service_args, add_compute_args
 from contanos.utils.setup_logging import setup_logging
 from contanos.utils.parse_config_string import parse_config_string
+from pelpers.stream_ordered_input import StreamOrderedInput
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -34,6 +35,20 @@ def parse_args():
     # add_argument(parser, 'out_mqtt', 'OUT_MQTT_URL', None)
     add_argument(parser, 'out_mqtt', 'OUT_MQTT_URL', 'mqtt://localhost:1883,topic=bytetrack,qos=2,queue_max_len=100')
     add_argument(parser, 'devices', 'DEVICES', None)
+    add_argument(parser, 'max_age_ms', 'MAX_AGE_MS', None)
+    add_argument(parser, 'track_store', 'TRACK_STORE', 'objects')  # 'objects' (STrack) or 'arrays' (TrackStore)
+    add_argument(parser, 'kalman_dtype', 'KALMAN_DTYPE', 'float64')  # 'float32' with TRACK_STORE=arrays
+    add_argument(parser, 'stats_every', 'STATS_EVERY', 1800)  # frames between RSS / latency log lines, 0 = off
+    add_argument(parser, 'sparse_iou', 'SPARSE_IOU', False)  # IoU only for overlapping pairs, for 150+ people
+    add_argument(parser, 'lap_solver', 'LAP_SOLVER', None)  # lapjv | scipy | greedy | sparse | auto, None = lapjv
+    add_argument(parser, 'per_class', 'PER_CLASS', False)  # one tracker per detector class (players, referees, ball)
+    add_argument(parser, 'per_class_workers', 'PER_CLASS_WORKERS', 0)  # threads for the class trackers, 0 = inline
+    add_argument(parser, 'snapshot_dir', 'SNAPSHOT_DIR', None)  # local dir for tracker snapshots, None = off
+    add_argument(parser, 'snapshot_every', 'SNAPSHOT_EVERY', 300)  # frames between snapshots
+    add_argument(parser, 'shard_index', 'SHARD_INDEX', 0)  # this replica's shard of the stream ids
+    add_argument(parser, 'shard_count', 'SHARD_COUNT', 1)  # replicas sharing the input topic (consistent hashing)
+    add_argument(parser, 'stream_idle_s', 'STREAM_IDLE_S', 300)  # drop a stream's tracker after this many idle seconds
+    add_argument(parser, 'order_by', 'ORDER_BY', 'topic')  # 'topic' (one stream) or 'stream' (frame order per stream id)
 
     add_service_args(parser)
     add_compute_args(parser)
@@ -61,14 +76,39 @@ async def main():
     logger.info(f"  in_mqtt: {in_mqtt}")
     logger.info(f"  out_mqtt: {out_mqtt}")
     logger.info(f"  devices: {devices}")
+    logger.info(f"  max_age_ms: {args.max_age_ms}")
+    logger.info(f"  track_store: {args.track_store}, kalman_dtype: {args.kalman_dtype}")
+    logger.info(f"  stats_every: {args.stats_every}")
+    logger.info(f"  sparse_iou: {args.sparse_iou}, lap_solver: {args.lap_solver}")
+    logger.info(f"  per_class: {args.per_class}, per_class_workers: {args.per_class_workers}")
+    logger.info(f"  snapshot_dir: {args.snapshot_dir}, snapshot_every: {args.snapshot_every}")
+    logger.info(f"  shard: {args.shard_index}/{args.shard_count}, stream_idle_s: {args.stream_idle_s}")
+    logger.info(f"  order_by: {args.order_by}")
     logger.info(f"  log_level: {log_level}")
+
+    # Workers of one process share the input queue: a stream's frames would be split between
+    # their trackers, and all of them would write the same per-stream snapshot files
+    snapshots = args.snapshot_dir not in (None, '', 'None', 'none') and int(args.snapshot_every or 0) > 0
+    if int(args.num_workers_per_device) > 1 and (snapshots or int(args.shard_count) > 1):
+        raise ValueError("SNAPSHOT_DIR and SHARD_COUNT > 1 need NUM_WORKERS_PER_DEVICE=1, "
+                         "run more SHARD_COUNT replicas to use more CPUs")
+    # cameras on one topic reuse the same FRAME:n ids, ordering the whole topic by them mixes the streams
+    order_by = str(args.order_by).lower()
+    if order_by not in ('topic', 'stream'):
+        raise ValueError(f"Unknown ORDER_BY '{args.order_by}', expected 'topic' or 'stream'")
+    if int(args.shard_count) > 1 and order_by != 'stream':
+        raise ValueError("SHARD_COUNT > 1 tracks several streams from one topic and needs ORDER_BY=stream")
     
     try:
         in_mqtt_config = parse_config_string(in_mqtt)
         out_mqtt_config = parse_config_string(out_mqtt)
 
         # Create input/output interfaces
-        input_interface = OrderedInputInterface(MQTTInput(config=in_mqtt_config))
+        if order_by == 'stream':
+            input_interface = StreamOrderedInput(MQTTInput(config=in_mqtt_config),
+                                                 queue_max_len=int(in_mqtt_config.get('queue_max_len', 100)))
+        else:
+            input_interface = OrderedInputInterface(MQTTInput(config=in_mqtt_config))
         output_interface = MQTTOutput(config=out_mqtt_config)
         
         await input_interface.initialize()
@@ -81,7 +121,19 @@ async def main():
             match_thresh=0.8,
             track_buffer=25,
             frame_rate=30,
-            per_class=False,
+            per_class=str(args.per_class).lower() in ('true', '1', 'yes'),
+            per_class_workers=int(args.per_class_workers),
+            sparse_iou=str(args.sparse_iou).lower() in ('true', '1', 'yes'),
+            lap_solver=None if args.lap_solver in (None, '', 'None', 'none') else args.lap_solver,
+            max_age_ms=args.max_age_ms,
+            track_store=args.track_store,
+            kalman_dtype=args.kalman_dtype,
+            stats_every=int(args.stats_every),
+            snapshot_dir=args.snapshot_dir,
+            snapshot_every=int(args.snapshot_every),
+            shard_index=int(args.shard_index),
+            shard_count=int(args.shard_count),
+            stream_idle_s=float(args.stream_idle_s),
         )
 
         monitor_task = asyncio.create_task(quick_debug())
@@ -4,13 +4,18 @@ YOLOX Detection Service using the simplified base framework with multi-GPU suppo
 Reads RTSP frames, runs YOLOX detection, publishes bounding boxes to MQTT.
 """
 
+import time
+import logging
 from typing import Any, Dict
 import numpy as np
 
 from contanos.base_worker import BaseWorker
 
 from boxmot.trackers.bytetrack.bytetrack import ByteTrack
-from boxmot.trackers.bytetrack.bytetrack import STrack
+from boxmot.trackers.bytetrack.vectorized_bytetrack import VectorizedByteTrack
+from pelpers.staleness import StalenessGuard
+from pelpers.memory_stats import SoakMonitor
+from pelpers.stream_trackers import ConsistentHashRing, StreamTrackers, stream_id_of
 
 
 class ByteTrackWorker(BaseWorker):
@@ -24,7 +29,44 @@ class ByteTrackWorker(BaseWorker):
                          input_interface, output_interface)
 
     def _model_init(self):
-        self.model = ByteTrack(**self.model_config)  # Use the specific device for this model
+        self.tracker_config = dict(self.model_config)
+        self.staleness = StalenessGuard(self.tracker_config.pop('max_age_ms', None), name='ByteTrack')
+        # 'arrays': struct-of-arrays track store, same tracks as the STrack object version
+        track_store = str(self.tracker_config.pop('track_store', 'objects')).lower()
+        if track_store not in ('arrays', 'objects'):
+            raise ValueError(f"TRACK_STORE must be 'arrays' or 'objects', got '{track_store}'")
+        self.tracker_class = VectorizedByteTrack if track_store == 'arrays' else ByteTrack
+        # 'float32' halves the Kalman state and runs the batched predict / update in single precision
+        kalman_dtype = str(self.tracker_config.pop('kalman_dtype', 'float64')).lower()
+        if kalman_dtype not in ('float64', 'float32'):
+            raise ValueError(f"KALMAN_DTYPE must be 'float64' or 'float32', got '{kalman_dtype}'")
+        if track_store == 'arrays':
+            self.tracker_config['kalman_dtype'] = np.dtype(kalman_dtype)
+        elif kalman_dtype != 'float64':
+            raise ValueError("KALMAN_DTYPE=float32 needs TRACK_STORE=arrays")
+        stats_every = int(self.tracker_config.pop('stats_every', 1800) or 0)
+        snapshot_dir = self.tracker_config.pop('snapshot_dir', None)
+        snapshot_every = int(self.tracker_config.pop('snapshot_every', 300) or 0)
+        stream_idle_s = float(self.tracker_config.pop('stream_idle_s', 300) or 0)
+        # this replica tracks the streams the ring maps to shard_index, the other replicas take the rest
+        self.shard_index = int(self.tracker_config.pop('shard_index', 0) or 0)
+        self.ring = ConsistentHashRing(int(self.tracker_config.pop('shard_count', 1) or 1))
+        if not 0 <= self.shard_index < self.ring.shards:
+            raise ValueError(f"SHARD_INDEX must be in [0, {self.ring.shards}), got {self.shard_index}")
+        # one tracker per stream id, each with its own track id counter and its own snapshot file
+        # (warm restart: tracker state every snapshot_every frames + a journal of the frames since, same ids after a crash)
+        self.streams = StreamTrackers(lambda: self.tracker_class(**self.tracker_config), snapshot_dir, snapshot_every,
+                                      idle_s=stream_idle_s)
+        # restore this shard's streams now rather than on each stream's first frame
+        self.streams.restore_all(lambda stream_id: self.ring.shard(stream_id) == self.shard_index)
+        self.skipped_count = 0
+        # RSS / latency / track list sizes every stats_every frames, flat over a soak test
+        self.soak = SoakMonitor(stats_every, gauges=self.streams.memory_stats)
+        # keyframe mode metrics: boxes published from detections vs. Kalman predictions
+        self.detected_count = 0
+        self.predicted_count = 0
+        self.predicted_frames = 0
+        self.frames = 0
 
     def _predict(self, input: Any, metadata: Any) -> Any:
         
@@ -32,21 +74,59 @@ class ByteTrackWorker(BaseWorker):
             input = input[0]
             metadata = metadata[0]
 
-        if int(metadata.get('frame_id_str').split('FRAME:')[-1]) <= self.model_config.get('starting_frame_id', 1):
-            print(f"[RESET] First Frame received - clearing buffers & restarting tracker")
+        stream_id = stream_id_of(input, metadata)
+        if self.ring.shard(stream_id) != self.shard_index:
+            self.skipped_count += 1  # another replica's stream
+            return None
+        ts = self.staleness.origin_ts(input, metadata)
+        if self.staleness.expired(ts):
+            return None
+        start = time.perf_counter()
 
-            self.model = ByteTrack(**self.model_config)
-            STrack.clear_count()  # reset track ID counter
+        if int(metadata.get('frame_id_str').split('FRAME:')[-1]) <= self.model_config.get('starting_frame_id', 1):
+            print(f"[RESET] First Frame received on stream '{stream_id}' - clearing buffers & restarting its tracker")
+            stream = self.streams.reset(stream_id)  # new tracker, track ids from 1 again
+        else:
+            stream = self.streams.get(stream_id)
+        model, snapshots = stream.tracker, stream.snapshots
 
-        dets = []
-        for i in range(len(input['results']['det_scores'])):
-            dets.append(
-                [*input['results']['bboxes'][i], input['results']['det_scores'][i], input['results']['classes'][i]])
+        # YOLOX in keyframe mode skips detection on in-between frames,
+        # those are filled with the Kalman prediction of every confirmed track
+        keyframe = input['results'].get('keyframe', True)
+        if keyframe:
+            dets = []
+            for i in range(len(input['results']['det_scores'])):
+                dets.append(
+                    [*input['results']['bboxes'][i], input['results']['det_scores'][i], input['results']['classes'][i]])
 
-        dets = np.array(dets)
-        tracklets = self.model.update(dets)
+            dets = np.array(dets)
+            snapshots.record(model, keyframe, dets)
+            tracklets = model.update(dets)
+        else:
+            snapshots.record(model, keyframe)
+            tracklets = model.predict_only()
+        snapshots.maybe_save(model)
 
         track_ids = [tracklet[4] for tracklet in tracklets]
         bboxes = [[tracklet[0], tracklet[1], tracklet[2], tracklet[3]] for tracklet in tracklets]
         track_scores = [tracklet[5] for tracklet in tracklets]
-        return {'scale': 1, 'bboxes': bboxes, 'track_scores': track_scores, 'track_ids': track_ids}
\ No newline at end of file
+        self._count_boxes(len(track_ids), predicted=not keyframe)
+        self.soak.record(start)
+        # tracks live in the detector's coordinate space, forward its scale
+        return {'scale': input['results'].get('scale', 1), 'bboxes': bboxes, 'track_scores': track_scores, 'track_ids': track_ids,
+                'predicted': [not keyframe] * len(track_ids), 'ts': ts, 'stream_id': stream_id}
+
+    def _count_boxes(self, n: int, predicted: bool, log_every: int = 500):
+        self.frames += 1
+        if predicted:
+            self.predicted_frames += 1
+            self.predicted_count += n
+        else:
+            self.detected_count += n
+        if self.frames % log_every == 0 and self.predicted_frames:
+            total = max(self.detected_count + self.predicted_count, 1)
+            logging.info(
+                f"ByteTrack: {self.predicted_frames}/{self.frames} predicted frames, "
+                f"{self.detected_count} detected / {self.predicted_count} predicted boxes "
+                f"({self.predicted_count / total:.1%} predicted)"
+            )
\ No newline at end of file
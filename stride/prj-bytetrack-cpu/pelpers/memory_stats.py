@@ -0,0 +1,55 @@
+import os
+import time
+import logging
+import resource
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+class SoakMonitor:
+    """Logs RSS, per-frame latency and tracker sizes once every ``log_every`` frames.
+
+    Over a long run (a full match) every line should stay flat: RSS, p50 /
+    p99 latency of the window and the sizes returned by ``gauges`` (e.g.
+    ``tracker.memory_stats``). A slope in any of them is a leak or a cost
+    that grows with the number of tracks ever seen.
+    """
+
+    def __init__(self, log_every: int = 1800, gauges: Optional[Callable[[], Dict]] = None,
+                 name: str = 'ByteTrack'):
+        self.log_every = int(log_every)
+        self.gauges = gauges
+        self.name = name
+        self.frames = 0
+        self.latencies = np.zeros(max(self.log_every, 1))
+        self.start_rss = rss_mb()
+
+    @property
+    def enabled(self) -> bool:
+        return self.log_every > 0
+
+    def record(self, start: float):
+        """Count a frame whose processing started at ``start`` (``time.perf_counter()``)."""
+        if not self.enabled:
+            return
+        self.latencies[self.frames % self.log_every] = (time.perf_counter() - start) * 1000.0
+        self.frames += 1
+        if self.frames % self.log_every == 0:
+            p50, p99 = np.percentile(self.latencies, [50, 99])
+            gauges = self.gauges() if self.gauges is not None else {}
+            rss = rss_mb()
+            logging.info(
+                f"{self.name}: frame {self.frames}, rss {rss:.1f} MB ({rss - self.start_rss:+.1f}), "
+                f"latency p50 {p50:.2f} ms p99 {p99:.2f} ms, "
+                + ", ".join(f"{key} {value}" for key, value in gauges.items())
+            )
@@ -0,0 +1,100 @@
+# Vendored, byte-identical, into every service's pelpers/: each image is built from its own
+# directory (docker-compose ``context: ./prj-...``), so services cannot import a shared sibling
+# package. test_scripts/test_vendored_pelpers.py checks that the copies stay identical.
+import time
+import logging
+from typing import Any, Optional
+
+
+class StalenessGuard:
+    """Drops inputs older than ``max_age_ms`` right before ``_predict``.
+
+    The age of an input is measured from the origin timestamp ``ts`` (wall
+    clock seconds) that every STRIDE service publishes in its ``results``.
+    Services reading RTSP get it in the frame metadata, stamped by the input
+    wrapper (``StampedInput`` for ``mode=fifo``, ``LatestFrameInput`` for
+    ``mode=latest``) the moment the frame is read from the stream, so frames
+    that waited in a queue are already old when they reach ``_predict``.
+    Every later service forwards the oldest ``ts`` it received. After a
+    broker reconnect or a long pause the backlog is therefore skipped in
+    O(1) per message instead of being inferred on, and the pipeline is back
+    to real time once the queues are drained.
+
+    Inputs without any ``ts`` are never dropped; with a deadline set they are
+    counted as unstamped and reported, since it cannot apply to them. Without
+    ``max_age_ms`` nothing is checked, counted or logged.
+    ``stats()`` returns the per-service counts, a summary line is logged
+    every ``summary_every`` inputs while anything was dropped or unstamped.
+
+    Hosts must share a reasonably synchronized clock (NTP) for cross-host
+    ages to be meaningful.
+    """
+
+    def __init__(self, max_age_ms: Optional[float] = None, name: str = 'service', log_every: int = 100,
+                 summary_every: int = 1000):
+        if max_age_ms in (None, '', 'None', 'none'):
+            self.max_age_ms = None
+        else:
+            self.max_age_ms = float(max_age_ms)
+            if self.max_age_ms <= 0:
+                self.max_age_ms = None
+        self.name = name
+        self.log_every = log_every
+        self.summary_every = summary_every
+        self.dropped_count = 0
+        self.passed_count = 0
+        self.unstamped_count = 0
+
+    @staticmethod
+    def origin_ts(input: Any, metadata: Any = None) -> Optional[float]:
+        """Return the oldest origin timestamp found in the inputs and their metadata, None if there is none."""
+        found = []
+        items = input if isinstance(input, (list, tuple)) else [input]
+        for item in items:
+            if isinstance(item, dict):
+                results = item.get('results')
+                if isinstance(results, dict) and results.get('ts') is not None:
+                    found.append(float(results['ts']))
+        metas = metadata if isinstance(metadata, (list, tuple)) else [metadata]
+        for meta in metas:
+            if isinstance(meta, dict) and meta.get('ts') is not None:
+                found.append(float(meta['ts']))
+        return min(found) if found else None
+
+    def expired(self, ts: Optional[float]) -> bool:
+        """Count and report whether an input stamped at ``ts`` is too old."""
+        if self.max_age_ms is None:
+            return False
+        if ts is None:
+            self.unstamped_count += 1
+            if self.unstamped_count % self.log_every == 1:
+                logging.warning(f"StalenessGuard[{self.name}]: input without origin ts, not checked "
+                                f"(total unstamped {self.unstamped_count})")
+            self._count(passed=True)
+            return False
+
+        age_ms = (time.time() - ts) * 1000.0
+        if age_ms > self.max_age_ms:
+            self._count(passed=False)
+            if self.dropped_count % self.log_every == 1:
+                logging.warning(
+                    f"StalenessGuard[{self.name}]: dropped input {age_ms:.0f} ms old "
+                    f"(max_age_ms={self.max_age_ms:.0f}), total dropped {self.dropped_count}"
+                )
+            return True
+
+        self._count(passed=True)
+        return False
+
+    def _count(self, passed: bool):
+        if passed:
+            self.passed_count += 1
+        else:
+            self.dropped_count += 1
+        total = self.passed_count + self.dropped_count
+        if total % self.summary_every == 0 and (self.dropped_count or self.unstamped_count):
+            logging.info(f"StalenessGuard[{self.name}]: {self.dropped_count}/{total} inputs dropped "
+                         f"as older than {self.max_age_ms} ms, {self.unstamped_count} unstamped")
+
+    def stats(self) -> dict:
+        return {'passed': self.passed_count, 'dropped': self.dropped_count, 'unstamped': self.unstamped_count}
@@ -0,0 +1,167 @@
+import heapq
+import asyncio
+import logging
+import itertools
+from typing import Any, Optional
+
+from pelpers.stream_trackers import stream_id_of
+
+
+def frame_number(metadata: Any) -> Optional[int]:
+    """Frame number of ``frame_id_str`` ('cam3-FRAME:120' -> 120), None if there is none."""
+    if not isinstance(metadata, dict) or not metadata.get('frame_id_str'):
+        return None
+    try:
+        return int(str(metadata['frame_id_str']).split('FRAME:')[-1])
+    except ValueError:
+        return None
+
+
+class _StreamOrder:
+    """Reorder buffer of one stream: pending items by frame number and the next number to release."""
+
+    __slots__ = ('next_id', 'pending', 'blocked_since')
+
+    def __init__(self):
+        self.next_id = None
+        self.pending = []
+        self.blocked_since = None
+
+
+class StreamOrderedInput:
+    """Input wrapper that restores frame order per stream instead of per topic.
+
+    Several cameras publishing to one topic reuse the same ``FRAME:n``
+    numbers, so ordering the whole topic by frame number interleaves them
+    wrongly. A background task reads the wrapped interface, keys every
+    item by ``stream_id_of`` and releases each stream's frames in frame
+    order into ``ordered_queue``; streams never wait for each other.
+
+    A missing frame holds its stream back until ``max_pending`` frames of
+    that stream are buffered or the oldest has waited ``max_wait_ms``,
+    then the gap is skipped. Frames older than the last released one are
+    dropped and counted, except frame numbers up to ``first_frame_id``,
+    which restart the stream (its pending frames are released first).
+    Items without a frame number pass straight through.
+    """
+
+    def __init__(self, interface, max_pending: int = 30, max_wait_ms: float = 200.0, first_frame_id: int = 1,
+                 queue_max_len: int = 100):
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be >= 1, got {max_pending}")
+        self.interface = interface
+        self.max_pending = int(max_pending)
+        self.max_wait = float(max_wait_ms) / 1000.0
+        self.first_frame_id = int(first_frame_id)
+        self.ordered_queue = asyncio.Queue(maxsize=queue_max_len)
+        self.streams = {}
+        self.late_count = 0
+        self.skipped_count = 0
+        self._seq = itertools.count()  # tie breaker, items themselves are not comparable
+        self._error = None
+        self._pump_task = None
+
+    async def initialize(self):
+        result = await self.interface.initialize()
+        self._pump_task = asyncio.create_task(self._pump())
+        return result
+
+    async def _pump(self):
+        loop = asyncio.get_running_loop()
+        read = None
+        while True:
+            if read is None:
+                read = asyncio.ensure_future(self.interface.read_data())
+            try:
+                # wake up at least every max_wait to release streams stuck on a gap
+                done, _ = await asyncio.wait({read}, timeout=self.max_wait)
+                if done:
+                    item, read = read.result(), None
+                    await self._push(item, loop.time())
+                await self._release_expired(loop.time())
+            except asyncio.CancelledError:
+                if read is not None:
+                    read.cancel()
+                raise
+            except Exception as e:
+                # Surface the error (e.g. end-of-stream timeout) once the buffered frames are read
+                for stream in self.streams.values():
+                    await self._release_all(stream)
+                self._error = e
+                await self.ordered_queue.put(None)
+                return
+
+    async def _push(self, item, now: float):
+        data, metadata = item if isinstance(item, tuple) and len(item) == 2 else (item, None)
+        frame_id = frame_number(metadata)
+        if frame_id is None:
+            await self.ordered_queue.put(item)
+            return
+
+        stream_id = stream_id_of(data, metadata)
+        stream = self.streams.get(stream_id)
+        if stream is None:
+            stream = self.streams[stream_id] = _StreamOrder()
+        if stream.next_id is not None and frame_id < stream.next_id:
+            if frame_id > self.first_frame_id:
+                self.late_count += 1
+                logging.debug(f"StreamOrderedInput: dropped late frame {frame_id} of stream '{stream_id}' "
+                              f"(next {stream.next_id}), total late {self.late_count}")
+                return
+            await self._release_all(stream)  # stream restarted
+            stream.next_id = None
+        if stream.next_id is None:
+            stream.next_id = frame_id
+
+        heapq.heappush(stream.pending, (frame_id, next(self._seq), item))
+        if stream.blocked_since is None:
+            stream.blocked_since = now
+        await self._release(stream, flush=len(stream.pending) > self.max_pending)
+
+    async def _release_expired(self, now: float):
+        for stream in self.streams.values():
+            if stream.pending and now - stream.blocked_since >= self.max_wait:
+                await self._release(stream, flush=True)
+
+    async def _release(self, stream: _StreamOrder, flush: bool = False):
+        """Release the stream's consecutive frames; with ``flush`` skip the gap in front of them first."""
+        pending = stream.pending
+        if flush and pending and pending[0][0] > stream.next_id:
+            self.skipped_count += pending[0][0] - stream.next_id
+            stream.next_id = pending[0][0]
+        released = False
+        while pending and pending[0][0] <= stream.next_id:
+            frame_id, _, item = heapq.heappop(pending)
+            stream.next_id = frame_id + 1
+            released = True
+            await self.ordered_queue.put(item)
+        if not pending:
+            stream.blocked_since = None
+        elif released:
+            stream.blocked_since = asyncio.get_running_loop().time()  # waiting on a new gap
+
+    async def _release_all(self, stream: _StreamOrder):
+        while stream.pending:
+            await self._release(stream, flush=True)
+
+    async def read_data(self, *args, **kwargs):
+        if self._error is not None and self.ordered_queue.empty():
+            raise self._error
+        item = await self.ordered_queue.get()
+        if item is None and self._error is not None:
+            raise self._error
+        return item
+
+    async def cleanup(self):
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            try:
+                await self._pump_task
+            except asyncio.CancelledError:
+                pass
+        if hasattr(self.interface, 'cleanup'):
+            await self.interface.cleanup()
+
+    def __getattr__(self, name):
+        """Forward other calls to the wrapped interface."""
+        return getattr(self.interface, name)
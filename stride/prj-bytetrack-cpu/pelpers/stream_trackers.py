@@ -0,0 +1,172 @@
+import os
+import re
+import glob
+import time
+import bisect
+import hashlib
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from pelpers.tracker_snapshot import TrackerSnapshots, snapshot_stream_id
+
+DEFAULT_STREAM = 'default'
+
+
+def stream_id_of(input: Any, metadata: Any = None) -> str:
+    """
+    Camera / stream an input belongs to: ``stream_id`` of the metadata or
+    of the ``results``, else the prefix of ``frame_id_str`` before
+    'FRAME:' ('cam3-FRAME:120' -> 'cam3'), else ``DEFAULT_STREAM``.
+    """
+    if isinstance(metadata, dict):
+        if metadata.get('stream_id') is not None:
+            return str(metadata['stream_id'])
+    if isinstance(input, dict) and isinstance(input.get('results'), dict):
+        if input['results'].get('stream_id') is not None:
+            return str(input['results']['stream_id'])
+    if isinstance(metadata, dict) and metadata.get('frame_id_str'):
+        prefix = str(metadata['frame_id_str']).split('FRAME:')[0].strip(' -_:/')
+        if prefix:
+            return prefix
+    return DEFAULT_STREAM
+
+
+def _hash(key: str) -> int:
+    # stable across processes, unlike hash()
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+
+class ConsistentHashRing:
+    """Maps stream ids to ``shards`` service replicas with consistent hashing.
+
+    Every shard owns ``replicas`` points on a 64-bit hash ring; a stream
+    belongs to the shard of the first point at or after its hash. All
+    replicas compute the same owner for a stream without talking to each
+    other, and changing the shard count only moves about 1/shards of the
+    streams. With few streams the split is not exactly even (16 cameras on
+    4 shards can land 5/4/4/3).
+    """
+
+    def __init__(self, shards: int = 1, replicas: int = 100):
+        if shards < 1:
+            raise ValueError(f"shards must be >= 1, got {shards}")
+        self.shards = int(shards)
+        points = sorted((_hash(f"shard-{shard}-{i}"), shard) for shard in range(self.shards) for i in range(replicas))
+        self._keys = [key for key, _ in points]
+        self._owners = [shard for _, shard in points]
+        self._cache = {}
+
+    def shard(self, stream_id: str) -> int:
+        owner = self._cache.get(stream_id)
+        if owner is None:
+            i = bisect.bisect_left(self._keys, _hash(stream_id)) % len(self._keys)
+            owner = self._cache[stream_id] = self._owners[i]
+        return owner
+
+
+class StreamTracker:
+    """One stream's tracker, its snapshots and when it was last fed."""
+
+    __slots__ = ('tracker', 'snapshots', 'last_seen')
+
+    def __init__(self, tracker, snapshots: TrackerSnapshots):
+        self.tracker = tracker
+        self.snapshots = snapshots
+        self.last_seen = time.monotonic()
+
+
+class StreamTrackers:
+    """A tracker per stream id, created on the first frame of the stream.
+
+    Every tracker comes from ``factory`` and so has its own track id
+    counter: the ids of one camera never depend on the others, and a reset
+    of one stream leaves the others alone. With ``snapshot_dir`` every
+    stream snapshots to its own file; after a restart ``restore_all`` brings
+    back all of them up front, and a stream without a snapshot yet (only a
+    journal) is restored when it is first seen. Streams not fed for
+    ``idle_s`` seconds are dropped (their snapshot stays on disk).
+    """
+
+    def __init__(self, factory: Callable[[], Any], snapshot_dir: Optional[str] = None, snapshot_every: int = 300,
+                 idle_s: float = 300.0, name: str = 'ByteTrack'):
+        self.factory = factory
+        self.snapshot_dir = None if snapshot_dir in (None, '', 'None', 'none') else str(snapshot_dir)
+        self.snapshot_every = int(snapshot_every)
+        self.idle_s = float(idle_s)
+        self.name = name
+        self.streams = {}  # type: Dict[str, StreamTracker]
+        self._last_sweep = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.streams)
+
+    def _snapshot_path(self, stream_id: str) -> Optional[str]:
+        if self.snapshot_dir is None:
+            return None
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', stream_id)[:64]
+        return os.path.join(self.snapshot_dir, f"{self.name.lower()}_{safe}_{_hash(stream_id) & 0xffffffff:08x}.npz")
+
+    def _add(self, stream_id: str, restore: bool) -> StreamTracker:
+        stream = StreamTracker(self.factory(), TrackerSnapshots(
+            self._snapshot_path(stream_id), self.snapshot_every, name=f"{self.name}[{stream_id}]", stream_id=stream_id))
+        if restore:
+            stream.snapshots.restore(stream.tracker)
+        self.streams[stream_id] = stream
+        logging.info(f"{self.name}: new stream '{stream_id}', {len(self.streams)} streams")
+        return stream
+
+    def restore_all(self, owns: Callable[[str], bool] = lambda stream_id: True) -> int:
+        """Create and restore every stream with a snapshot in ``snapshot_dir`` that ``owns``; returns how many."""
+        if self.snapshot_dir is None:
+            return 0
+        start = time.perf_counter()
+        restored = 0
+        for path in sorted(glob.glob(os.path.join(self.snapshot_dir, f"{self.name.lower()}_*.npz"))):
+            stream_id = snapshot_stream_id(path)
+            # other shards' streams, and files not named for this stream (another service name or layout)
+            if stream_id is None or stream_id in self.streams or not owns(stream_id) \
+                    or self._snapshot_path(stream_id) != path:
+                continue
+            self._add(stream_id, restore=True)
+            restored += 1
+        if restored:
+            logging.info(f"{self.name}: restored {restored} streams from {self.snapshot_dir} "
+                         f"({(time.perf_counter() - start) * 1000.0:.0f} ms)")
+        return restored
+
+    def get(self, stream_id: str) -> StreamTracker:
+        """The tracker of ``stream_id``, created (and restored from its snapshot) on first use."""
+        stream = self.streams.get(stream_id)
+        if stream is None:
+            stream = self._add(stream_id, restore=True)
+        stream.last_seen = time.monotonic()
+        self._drop_idle(stream.last_seen)
+        return stream
+
+    def reset(self, stream_id: str) -> StreamTracker:
+        """Fresh tracker (ids from 1) for ``stream_id``, its snapshot and journal are cleared, not restored."""
+        stream = self.streams.get(stream_id)
+        if stream is None:
+            stream = self._add(stream_id, restore=False)
+        else:
+            stream.tracker = self.factory()
+        stream.snapshots.clear()
+        stream.last_seen = time.monotonic()
+        self._drop_idle(stream.last_seen)
+        return stream
+
+    def _drop_idle(self, now: float):
+        if self.idle_s <= 0 or now - self._last_sweep < 1.0:
+            return
+        self._last_sweep = now
+        for stream_id in [s for s, stream in self.streams.items() if now - stream.last_seen > self.idle_s]:
+            self.streams.pop(stream_id).snapshots.close()
+            logging.info(f"{self.name}: stream '{stream_id}' idle for {self.idle_s:.0f} s, dropped its tracker")
+
+    def memory_stats(self) -> dict:
+        """``memory_stats`` of all stream trackers summed, plus the number of streams."""
+        stats = {'streams': len(self.streams)}
+        for stream in self.streams.values():
+            for key, value in stream.tracker.memory_stats().items():
+                stats[key] = stats.get(key, 0) + value
+        return stats
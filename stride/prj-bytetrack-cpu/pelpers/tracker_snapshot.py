@@ -0,0 +1,180 @@
+import os
+import time
+import struct
+import logging
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+# journal record header: tracker frame_count before the frame, keyframe flag, number of detection rows
+_RECORD = struct.Struct('<qBI')
+_DET_COLS = 6  # x1, y1, x2, y2, conf, cls
+
+
+def save_snapshot(path: str, state: dict):
+    """Write ``tracker.snapshot()`` to ``path`` atomically: a crash leaves the old or the new file, never half of one."""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        np.savez(f, **state)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_snapshot(path: str) -> Optional[dict]:
+    """The state saved by ``save_snapshot``, or None if there is none or it is unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+    except (OSError, ValueError, EOFError) as e:
+        logging.warning(f"TrackerSnapshots: ignoring unreadable snapshot {path}: {e}")
+        return None
+
+
+def snapshot_stream_id(path: str) -> Optional[str]:
+    """The ``stream_id`` saved with the snapshot at ``path`` (reads only that entry), or None."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return str(data['stream_id']) if 'stream_id' in data.files else None
+    except (OSError, ValueError, EOFError) as e:
+        logging.warning(f"TrackerSnapshots: ignoring unreadable snapshot {path}: {e}")
+        return None
+
+
+class DetectionJournal:
+    """Append-only binary log of the detections fed to the tracker since the last snapshot.
+
+    One record per frame: the tracker's ``frame_count`` before the frame,
+    whether it was a keyframe (``update``) or not (``predict_only``), and
+    the (M, 6) detections as float64. Records are flushed to the OS on every
+    frame (they survive a process crash) but not fsynced. A torn record at
+    the end, from a crash mid-write, ends the replay.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'ab')
+
+    def append(self, frame_count: int, keyframe: bool, dets: Optional[np.ndarray] = None):
+        dets = np.empty((0, _DET_COLS)) if dets is None else np.asarray(dets, dtype=np.float64).reshape(-1, _DET_COLS)
+        self.file.write(_RECORD.pack(frame_count, keyframe, len(dets)))
+        self.file.write(dets.tobytes())
+        self.file.flush()
+
+    def truncate(self):
+        self.file.seek(0)
+        self.file.truncate()
+
+    def records(self) -> Iterator[Tuple[int, bool, np.ndarray]]:
+        """(frame_count, keyframe, dets) of every complete record, oldest first."""
+        self.file.flush()
+        with open(self.path, 'rb') as f:
+            while True:
+                header = f.read(_RECORD.size)
+                if len(header) < _RECORD.size:
+                    return
+                frame_count, keyframe, n = _RECORD.unpack(header)
+                payload = f.read(n * _DET_COLS * 8)
+                if len(payload) < n * _DET_COLS * 8:
+                    return
+                yield frame_count, bool(keyframe), np.frombuffer(payload).reshape(n, _DET_COLS)
+
+    def close(self):
+        self.file.close()
+
+
+class TrackerSnapshots:
+    """Periodic tracker snapshots plus a detection journal, for a warm restart with the same track ids.
+
+    Every ``every`` frames the tracker state (``tracker.snapshot()``: tracks,
+    Kalman state, id counter, frame count) is written to ``path`` as an
+    uncompressed ``.npz`` (no pickle) and the journal is emptied; every frame
+    in between is appended to ``path + '.journal'`` before the tracker sees
+    it. ``restore`` loads the snapshot and replays the journal through
+    ``update`` / ``predict_only``, which puts the tracker back exactly where
+    it was at the last frame it processed. A restart costs the load plus at
+    most ``every`` tracker frames without publishing. A ``stream_id`` is
+    saved with every snapshot, so the snapshots in a directory can be
+    restored before their streams send a frame (``snapshot_stream_id``).
+    """
+
+    def __init__(self, path: Optional[str] = None, every: int = 300, name: str = 'ByteTrack',
+                 stream_id: Optional[str] = None):
+        self.path = None if path in (None, '', 'None', 'none') else str(path)
+        self.every = int(every)
+        self.name = name
+        self.stream_id = stream_id
+        self.journal = None
+        self.last_frame = 0
+        if self.enabled:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.journal = DetectionJournal(f"{self.path}.journal")
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None and self.every > 0
+
+    def restore(self, tracker) -> bool:
+        """Load the last snapshot into ``tracker`` and replay the journal, False if there was nothing to restore."""
+        if not self.enabled:
+            return False
+        start = time.perf_counter()
+        state = load_snapshot(self.path)
+        if state is not None:
+            state.pop('stream_id', None)
+            tracker.restore(state)
+        snapshot_frame = tracker.frame_count
+        replayed = 0
+        for frame_count, keyframe, dets in self.journal.records():
+            if frame_count < tracker.frame_count:
+                continue  # journaled before the snapshot (crash between snapshot and truncate)
+            if frame_count > tracker.frame_count:
+                logging.warning(f"{self.name}: journal skips from frame {tracker.frame_count} to {frame_count}, "
+                                f"replay stopped")
+                break
+            if keyframe:
+                tracker.update(dets)
+            else:
+                tracker.predict_only()
+            replayed += 1
+        self.last_frame = snapshot_frame
+        if state is None and replayed == 0:
+            return False
+        logging.info(f"{self.name}: restored {len(state['track_id']) if state is not None else 0} tracks "
+                     f"at frame {snapshot_frame}, replayed {replayed} frames, now at frame {tracker.frame_count} "
+                     f"({(time.perf_counter() - start) * 1000.0:.0f} ms)")
+        return True
+
+    def record(self, tracker, keyframe: bool, dets: Optional[np.ndarray] = None):
+        """Journal the frame ``tracker`` is about to process."""
+        if self.enabled:
+            self.journal.append(tracker.frame_count, keyframe, dets)
+
+    def maybe_save(self, tracker):
+        """Snapshot ``tracker`` (after its frame) if ``every`` frames passed since the last one."""
+        if not self.enabled or tracker.frame_count - self.last_frame < self.every:
+            return
+        start = time.perf_counter()
+        state = tracker.snapshot()
+        if self.stream_id is not None:
+            state['stream_id'] = np.array(self.stream_id)
+        save_snapshot(self.path, state)
+        self.journal.truncate()
+        self.last_frame = tracker.frame_count
+        logging.debug(f"{self.name}: snapshot at frame {tracker.frame_count} "
+                      f"({(time.perf_counter() - start) * 1000.0:.1f} ms)")
+
+    def clear(self):
+        """Forget the snapshot and the journal (the tracker was reset)."""
+        if not self.enabled:
+            return
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.journal.truncate()
+        self.last_frame = 0
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 # Import your modules here
 from cmc_worker import CMCWorker
 from contanos.io.rtsp_input_interface import RTSPInput
+from pelpers.latest_frame_input import create_input
 from contanos.io.mqtt_output_interface import MQTTOutput
 from contanos.helpers.create_a_processor import create_a_processor
 from contanos.helpers.start_a_service import start_a_service
@@ -25,6 +26,8 @@ def parse_args():
 
     add_argument(parser, 'in_rtsp', 'IN_RTSP_URL', None) # 'rtsp://localhost:8554,topic=mystream'
     add_argument(parser, 'out_mqtt', 'OUT_MQTT_URL', None) # 'mqtt://localhost:1883,topic=cmc,qos=2,queue_max_len=50'
+    add_argument(parser, 'max_age_ms', 'MAX_AGE_MS', None)
+    add_argument(parser, 'static_frame_thr', 'STATIC_FRAME_THR', 0)  # e.g. 1.0: identity warp on frozen frames
 
     add_service_args(parser)
     add_compute_args(parser)
@@ -52,6 +55,8 @@ async def main():
     logger.info(f"  in_rtsp: {in_rtsp}")
     logger.info(f"  out_mqtt: {out_mqtt}")
     logger.info(f"  devices: {devices}")
+    logger.info(f"  max_age_ms: {args.max_age_ms}")
+    logger.info(f"  static_frame_thr: {args.static_frame_thr}")
     logger.info(f"  log_level: {log_level}")
     
     try:
@@ -59,7 +64,8 @@ async def main():
         out_mqtt_config = parse_config_string(out_mqtt)
         
         # Create input/output interfaces
-        input_interface = RTSPInput(config=in_rtsp_config)
+        # mode=latest in IN_RTSP_URL keeps only the newest frame(s) instead of queuing
+        input_interface = create_input(RTSPInput, in_rtsp_config)
         output_interface = MQTTOutput(config=out_mqtt_config)
         
         await input_interface.initialize()
@@ -73,6 +79,8 @@ async def main():
             scale = 0.15,
             align = False,
             grayscale = True,
+            max_age_ms = args.max_age_ms,
+            static_frame_thr = float(args.static_frame_thr),
         )
 
         monitor_task = asyncio.create_task(quick_debug())
@@ -109,7 +117,10 @@ async def quick_debug():
     while True:
         main_q = input_interface.queue.qsize()
         
-        logging.info(f"Main Q: {main_q}")
+        if hasattr(input_interface, 'replaced_count'):
+            logging.info(f"Main Q: {main_q}, Latest buffer: {len(input_interface.buffer)}, Replaced: {input_interface.replaced_count}")
+        else:
+            logging.info(f"Main Q: {main_q}")
         await asyncio.sleep(1)
 
 if __name__ == "__main__":
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 from typing import Any, Dict
 
+import cv2
+import numpy as np
+
 from contanos.base_worker import BaseWorker
 from pelpers.ecc import ECC
+from pelpers.staleness import StalenessGuard
+from pelpers.frame_change import StaticFrameDetector
 
 class CMCWorker(BaseWorker):
     
@@ -14,9 +19,22 @@ class CMCWorker(BaseWorker):
                          input_interface, output_interface)
     
     def _model_init(self):
-        self.model = ECC(**self.model_config)  # Use the specific device for this model
+        model_config = dict(self.model_config)
+        self.staleness = StalenessGuard(model_config.pop('max_age_ms', None), name='CMC')
+        # frozen / repeated frames have no camera motion, skip ECC and publish the identity warp
+        self.static_frames = StaticFrameDetector(model_config.pop('static_frame_thr', 0.0))
+        self.model = ECC(**model_config)  # Use the specific device for this model
         
     def _predict(self, inputs: Any, metadata: Any=None) -> Any:
+        ts = self.staleness.origin_ts(inputs, metadata)
+        if self.staleness.expired(ts):
+            return None
+
+        if self.static_frames.is_static(inputs):
+            warp = np.eye(3, 3, dtype=np.float32) if self.model.warp_mode == cv2.MOTION_HOMOGRAPHY \
+                else np.eye(2, 3, dtype=np.float32)
+            return {'proj_matrix': warp, 'ts': ts, 'repeated': True}
+
         proj_matrix = self.model.apply(inputs)
 
-        return {'proj_matrix': proj_matrix}
+        return {'proj_matrix': proj_matrix, 'ts': ts}
@@ -0,0 +1,169 @@
+import time
+import asyncio
+import logging
+from collections import deque
+
+
+def stamp_ts(item, ts: float):
+    """Set the origin timestamp ``ts`` in the metadata of an ``(input, metadata)`` item, unless it has one."""
+    if isinstance(item, tuple) and len(item) == 2:
+        data, metadata = item
+        if metadata is None:
+            return data, {'ts': ts}
+        if isinstance(metadata, dict):
+            metadata.setdefault('ts', ts)
+    return item
+
+
+class LatestFrameInput:
+    """Latest-frame-wins wrapper around an input interface (e.g. RTSPInput).
+
+    A background task drains the wrapped interface as fast as it produces
+    items and keeps only the newest ``keep`` of them. Older items are
+    replaced (and counted) instead of queuing up, so a slow consumer always
+    works on the freshest frame. Metadata is passed through, so the original
+    ``frame_id_str`` still reaches downstream joins, with the wall clock time
+    the frame was read added as ``ts`` (the origin timestamp StalenessGuard
+    measures age from, so time spent waiting here counts).
+    """
+
+    def __init__(self, interface, keep: int = 1):
+        if keep < 1:
+            raise ValueError(f"keep must be >= 1, got {keep}")
+        self.interface = interface
+        self.keep = keep
+        self.buffer = deque(maxlen=keep)
+        self.replaced_count = 0
+        self._available = asyncio.Event()
+        self._error = None
+        self._pump_task = None
+
+    async def initialize(self):
+        result = await self.interface.initialize()
+        self._pump_task = asyncio.create_task(self._pump())
+        return result
+
+    async def _pump(self):
+        while True:
+            try:
+                item = stamp_ts(await self.interface.read_data(), time.time())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Surface the error (e.g. end-of-stream timeout) to the reader
+                self._error = e
+                self._available.set()
+                return
+
+            if len(self.buffer) == self.keep:
+                self.replaced_count += 1
+                logging.debug(f"LatestFrameInput: replaced stale frame, total replaced {self.replaced_count}")
+            self.buffer.append(item)
+            self._available.set()
+
+    async def read_data(self, *args, **kwargs):
+        while not self.buffer:
+            if self._error is not None:
+                raise self._error
+            self._available.clear()
+            await self._available.wait()
+        return self.buffer.popleft()
+
+    async def cleanup(self):
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            try:
+                await self._pump_task
+            except asyncio.CancelledError:
+                pass
+        if hasattr(self.interface, 'cleanup'):
+            await self.interface.cleanup()
+
+    def __getattr__(self, name):
+        """Forward other calls to the wrapped interface."""
+        return getattr(self.interface, name)
+
+
+class StampedInput:
+    """FIFO input wrapper that stamps ``ts`` into the metadata of every item as it arrives.
+
+    A background task drains the wrapped interface as fast as it produces
+    items, stamps each with the wall clock time it was read and queues it
+    in order. Nothing is evicted: the queue holds at most ``max_len`` items
+    and the task waits while it is full. ``create_input`` builds the wrapped
+    interface with a queue of one frame, so this queue is where frames wait:
+    memory stays at ``max_len`` frames, every frame is stamped about one
+    frame after decode and the time it waits here counts towards the age
+    StalenessGuard checks.
+    """
+
+    def __init__(self, interface, max_len: int = 100):
+        if max_len < 1:
+            raise ValueError(f"max_len must be >= 1, got {max_len}")
+        self.interface = interface
+        self.queue = asyncio.Queue(maxsize=max_len)
+        self._error = None
+        self._pump_task = None
+
+    async def initialize(self):
+        result = await self.interface.initialize()
+        self._pump_task = asyncio.create_task(self._pump())
+        return result
+
+    async def _pump(self):
+        while True:
+            try:
+                item = stamp_ts(await self.interface.read_data(), time.time())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Surface the error (e.g. end-of-stream timeout) once the queued frames are read
+                self._error = e
+                await self.queue.put(None)
+                return
+            await self.queue.put(item)
+
+    async def read_data(self, *args, **kwargs):
+        if self._error is not None and self.queue.empty():
+            raise self._error
+        item = await self.queue.get()
+        if item is None and self._error is not None:
+            raise self._error
+        return item
+
+    async def cleanup(self):
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+            try:
+                await self._pump_task
+            except asyncio.CancelledError:
+                pass
+        if hasattr(self.interface, 'cleanup'):
+            await self.interface.cleanup()
+
+    def __getattr__(self, name):
+        """Forward other calls to the wrapped interface."""
+        return getattr(self.interface, name)
+
+
+def create_input(interface_cls, config: dict):
+    """Build ``interface_cls(config=config)`` honoring the ``mode`` option.
+
+    ``mode=fifo`` (default) wraps it in StampedInput, which keeps every
+    frame in order, up to ``queue_max_len`` (default 100) without evicting,
+    and builds the interface with ``queue_max_len=1``; ``mode=latest`` wraps
+    it in LatestFrameInput keeping the newest ``latest_k`` (default 1)
+    frames. Both stamp ``ts`` as frames arrive. ``mode`` and ``latest_k``
+    are consumed here and not passed to the interface.
+    """
+    config = dict(config)
+    mode = str(config.pop('mode', 'fifo')).lower()
+    keep = int(config.pop('latest_k', 1))
+
+    if mode == 'fifo':
+        # frames queue in the wrapper, stamped, instead of unstamped in the interface
+        interface = interface_cls(config=dict(config, queue_max_len=1))
+        return StampedInput(interface, max_len=int(config.get('queue_max_len', 100)))
+    if mode == 'latest':
+        return LatestFrameInput(interface_cls(config=config), keep=keep)
+    raise ValueError(f"Unknown input mode '{mode}', expected 'fifo' or 'latest'")
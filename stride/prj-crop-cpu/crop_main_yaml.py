@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Person crop service with YAML configuration support.
+"""
+import os
+import sys
+import signal
+import asyncio
+import logging
+import argparse
+
+# Add parent directories to path for contanos imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+# Import your modules here
+from crop_worker import CropWorker
+from contanos.io.rtsp_input_interface import RTSPInput
+from contanos.io.mqtt_output_interface import MQTTOutput
+from contanos.io.mqtt_input_interface import MQTTInput
+from contanos.io.multi_input_interface import MultiInputInterface
+from contanos.helpers.create_a_processor import create_a_processor
+from contanos.helpers.start_a_service import start_a_service
+from contanos.utils.create_args import add_argument, add_service_args, add_compute_args
+from contanos.utils.setup_logging import setup_logging
+from contanos.utils.parse_config_string import parse_config_string
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Person crop extraction shared by RTMPose and JerseyOCR"
+    )
+
+    add_argument(parser, 'in_rtsp', 'IN_RTSP_URL', 'rtsp://localhost:8554,topic=mystream')
+    add_argument(parser, 'in_mqtt', 'IN_MQTT_URL', 'mqtt://localhost:1883,topic=bytetrack,qos=2,queue_max_len=100')
+    add_argument(parser, 'out_mqtt', 'OUT_MQTT_URL', 'mqtt://localhost:1883,topic=crops,qos=2,queue_max_len=100')
+    add_argument(parser, 'crop_size', 'CROP_SIZE', '192,256')         # w,h, RTMPose input size
+    add_argument(parser, 'crop_transport', 'CROP_TRANSPORT', 'shm')   # shm (same host) | jpeg (across nodes)
+    add_argument(parser, 'crop_max_persons', 'CROP_MAX_PERSONS', 64)
+    add_argument(parser, 'crop_ring_size', 'CROP_RING_SIZE', 32)
+    add_argument(parser, 'crop_jpeg_quality', 'CROP_JPEG_QUALITY', 90)
+    add_argument(parser, 'max_age_ms', 'MAX_AGE_MS', None)
+
+    add_service_args(parser)
+    add_compute_args(parser)
+
+    return parser.parse_args()
+
+async def main():
+    global input_interface
+    """Main function to create and start the service."""
+    args = parse_args()
+
+    in_rtsp = args.in_rtsp
+    in_mqtt = args.in_mqtt
+    out_mqtt = args.out_mqtt
+    log_level = args.log_level if hasattr(args, 'log_level') else 'INFO'
+    crop_size = [int(v) for v in args.crop_size.split(',')] if isinstance(args.crop_size, str) else args.crop_size
+
+    # Setup logging
+    setup_logging(log_level)
+    logger = logging.getLogger(__name__)
+
+    logger.info("Starting crop service with configuration:")
+    logger.info(f"  in_rtsp: {in_rtsp}")
+    logger.info(f"  in_mqtt: {in_mqtt}")
+    logger.info(f"  out_mqtt: {out_mqtt}")
+    logger.info(f"  crop_size: {crop_size}, transport: {args.crop_transport}")
+    logger.info(f"  max_age_ms: {args.max_age_ms}")
+    logger.info(f"  log_level: {log_level}")
+
+    # docker stop sends SIGTERM: leave through the finally / atexit hooks below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    workers = []
+    try:
+        in_rtsp_config = parse_config_string(in_rtsp)
+        in_mqtt_config = parse_config_string(in_mqtt)
+        out_mqtt_config = parse_config_string(out_mqtt)
+
+        # Create input/output interfaces
+        input_video_interface = RTSPInput(config=in_rtsp_config)
+        input_message_interface = MQTTInput(config=in_mqtt_config)
+        input_interface = MultiInputInterface([input_video_interface, input_message_interface])
+        output_interface = MQTTOutput(config=out_mqtt_config)
+
+        await input_interface.initialize()
+        await output_interface.initialize()
+
+        model_config = dict(
+            crop_size=crop_size,
+            transport=args.crop_transport,
+            max_persons=int(args.crop_max_persons),
+            ring_size=int(args.crop_ring_size),
+            jpeg_quality=int(args.crop_jpeg_quality),
+            max_age_ms=args.max_age_ms,
+        )
+
+        monitor_task = asyncio.create_task(quick_debug())
+
+        devices = ['cpu']
+
+        # Create processor with workers
+        workers, processor = create_a_processor(
+            worker_class=CropWorker,
+            model_config=model_config,
+            devices=devices,
+            input_interface=input_interface,
+            output_interface=output_interface,
+            num_workers_per_device=args.num_workers_per_device,
+        )
+
+        # Start the service
+        service = await start_a_service(
+            processor=processor,
+            run_until_complete=args.run_until_complete,
+            daemon_mode=False,
+        )
+
+        logger.info("Crop service started successfully")
+
+    except KeyboardInterrupt:
+        logger.info("Received interrupt signal, shutting down...")
+    except Exception as e:
+        logger.error(f"Error starting crop service: {e}")
+        raise
+    finally:
+        # unlink the shared memory rings, /dev/shm is not cleaned up with the process
+        for worker in workers:
+            worker.writer.close()
+        logger.info("Crop service shutdown complete")
+
+# Debug monitoring function
+async def quick_debug():
+    while True:
+        main_q = input_interface._queue.qsize()
+        sync_dict = len(input_interface._data_dict)
+
+        rtsp_q = input_interface.interfaces[0].queue.qsize()  # RTSP queue
+        mqtt_q = input_interface.interfaces[1].message_queue.qsize()  # MQTT queue
+
+        logging.info(f"Main Q: {main_q}, Sync Dict: {sync_dict}, RTSP Q: {rtsp_q}, MQTT Q: {mqtt_q}")
+        await asyncio.sleep(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Person crop service: reads RTSP frames + ByteTrack boxes, cuts every person out
+once per frame at a canonical size and publishes the crops with the boxes, so
+RTMPose and JerseyOCR don't need the full video stream.
+"""
+import atexit
+from typing import Any, Dict
+import numpy as np
+
+from contanos.base_worker import BaseWorker
+from pelpers.crop_transport import CropWriter, crop_layout, extract_crops
+from pelpers.staleness import StalenessGuard
+
+
+class CropWorker(BaseWorker):
+    """Person crop extraction with single CPU serial processing."""
+
+    def __init__(self, worker_id: int, device: str,
+                 model_config: Dict,
+                 input_interface,
+                 output_interface):
+        self.crop_worker_id = worker_id
+        super().__init__(worker_id, device, model_config,
+                         input_interface, output_interface)
+
+    def _model_init(self):
+        model_config = dict(self.model_config)
+        self.staleness = StalenessGuard(model_config.pop('max_age_ms', None), name='Crop')
+        self.crop_size = tuple(model_config.pop('crop_size', (192, 256)))
+        self.padding = float(model_config.pop('padding', 1.25))
+        # one shared memory ring per worker process
+        shm_name = f"{model_config.pop('shm_name', 'stride_crops')}_{self.crop_worker_id}"
+        self.writer = CropWriter(crop_size=self.crop_size, shm_name=shm_name, **model_config)
+        # the segment outlives the process unless unlinked (idempotent, crop_main_yaml also closes it)
+        atexit.register(self.writer.close)
+        self._crops = None
+
+    def _predict(self, input: Any, metadata: Any) -> Any:
+        ts = self.staleness.origin_ts(input, metadata)
+        if self.staleness.expired(ts):
+            return None
+
+        frame = input[0]
+        results = input[1]['results']
+        # crops are always cut from the full-resolution frame (see DETECT_SCALE)
+        bboxes = np.asarray(results['bboxes'], dtype=np.float32).reshape(-1, 4) / results.get('scale', 1)
+
+        if self._crops is None or len(self._crops) < len(bboxes):
+            w, h = self.crop_size
+            self._crops = np.zeros((max(len(bboxes), 32), h, w, 3), dtype=np.uint8)
+
+        centers, scales = crop_layout(bboxes, self.crop_size, self.padding)
+        crops = extract_crops(frame, centers, scales, self.crop_size, out=self._crops)
+
+        return {
+            'scale': 1,
+            'bboxes': bboxes.tolist(),
+            'track_ids': [int(it) for it in results.get('track_ids', [])],
+            'track_scores': [float(s) for s in results.get('track_scores', [])],
+            'crop_size': list(self.crop_size),
+            'centers': centers.tolist(),
+            'scales': scales.tolist(),
+            **self.writer.write(crops),
+            'ts': ts,
+        }
@@ -0,0 +1,175 @@
+import base64
+import logging
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+_HEADER = 8  # int64 frame sequence number in front of every slot
+
+
+def crop_layout(bboxes: np.ndarray, crop_size, padding: float = 1.25):
+    """Center and (w, h) scale of the canonical crop around every xyxy box.
+
+    Same geometry as RTMPose's top-down affine: the box is padded by
+    ``padding`` and widened or heightened to the crop's aspect ratio.
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+    centers = (bboxes[:, 0:2] + bboxes[:, 2:4]) * 0.5
+    scales = (bboxes[:, 2:4] - bboxes[:, 0:2]) * padding
+
+    w, h = crop_size
+    aspect_ratio = w / h
+    b_w, b_h = scales[:, 0], scales[:, 1]
+    wider = b_w > b_h * aspect_ratio
+    scales = np.stack([
+        np.where(wider, b_w, b_h * aspect_ratio),
+        np.where(wider, b_w / aspect_ratio, b_h),
+    ], axis=1).astype(np.float32)
+    return centers.astype(np.float32), scales
+
+
+def extract_crops(image: np.ndarray, centers: np.ndarray, scales: np.ndarray, crop_size,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Warp every (center, scale) region of ``image`` into an (N, h, w, 3) uint8 array."""
+    w, h = crop_size
+    n = len(centers)
+    if out is None or out.shape[0] < n:
+        out = np.zeros((n, h, w, 3), dtype=np.uint8)
+    crops = out[:n]
+
+    s = w / scales[:, 0]
+    warp_mats = np.zeros((n, 2, 3), dtype=np.float64)
+    warp_mats[:, 0, 0] = s
+    warp_mats[:, 1, 1] = s
+    warp_mats[:, 0, 2] = w * 0.5 - s * centers[:, 0]
+    warp_mats[:, 1, 2] = h * 0.5 - s * centers[:, 1]
+    for i in range(n):
+        cv2.warpAffine(image, warp_mats[i], (w, h), dst=crops[i],
+                       flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+    return crops
+
+
+def boxes_in_crops(bboxes: np.ndarray, centers: np.ndarray, scales: np.ndarray, crop_size) -> np.ndarray:
+    """Map frame xyxy boxes into the pixel coordinates of their own crop."""
+    w, _ = crop_size
+    s = (w / scales[:, 0])[:, None]
+    origin = centers - scales * 0.5
+    bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+    return np.concatenate([(bboxes[:, 0:2] - origin) * s, (bboxes[:, 2:4] - origin) * s], axis=1)
+
+
+class CropWriter:
+    """Publishes a frame's person crops as shared memory (same host) or JPEG.
+
+    ``transport='shm'`` writes the raw uint8 crops into a ring of
+    ``ring_size`` slots in one named shared memory segment and only the slot
+    reference goes over MQTT. Every slot starts with the frame sequence
+    number, written last, so a reader that fell behind a full ring detects
+    the overwrite instead of reading mixed crops. Frames with more than
+    ``max_persons`` crops are sent as JPEG. ``transport='jpeg'`` stacks the
+    crops vertically and sends a single base64 JPEG, for consumers on
+    other nodes.
+    """
+
+    def __init__(self, transport: str = 'shm', crop_size=(192, 256), max_persons: int = 64,
+                 ring_size: int = 32, jpeg_quality: int = 90, shm_name: str = 'stride_crops'):
+        if transport not in ('shm', 'jpeg'):
+            raise ValueError(f"CROP_TRANSPORT must be 'shm' or 'jpeg', got {transport!r}")
+        self.transport = transport
+        self.crop_size = tuple(int(v) for v in crop_size)
+        self.max_persons = max_persons
+        self.ring_size = ring_size
+        self.jpeg_quality = jpeg_quality
+        self._seq = 0
+
+        self.shm = None
+        if transport == 'shm':
+            w, h = self.crop_size
+            self.slot_bytes = _HEADER + max_persons * h * w * 3
+            try:
+                stale = shared_memory.SharedMemory(name=shm_name)
+                stale.close()
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = shared_memory.SharedMemory(name=shm_name, create=True, size=ring_size * self.slot_bytes)
+            logging.info(f"CropWriter: shared memory '{shm_name}', {ring_size} slots x {self.slot_bytes / 1e6:.1f} MB")
+
+    def write(self, crops: np.ndarray) -> Dict:
+        self._seq += 1
+        if self.transport == 'shm' and len(crops) <= self.max_persons:
+            slot = self._seq % self.ring_size
+            offset = slot * self.slot_bytes
+            header = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf, offset=offset)
+            header[0] = -1
+            data = np.ndarray(crops.shape, dtype=np.uint8, buffer=self.shm.buf, offset=offset + _HEADER)
+            np.copyto(data, crops)
+            header[0] = self._seq
+            return {'transport': 'shm', 'shm_name': self.shm.name, 'shm_slot': slot, 'shm_seq': self._seq,
+                    'shm_slot_bytes': self.slot_bytes, 'count': len(crops)}
+
+        if len(crops) == 0:
+            return {'transport': 'jpeg', 'jpeg': '', 'count': 0}
+        mosaic = crops.reshape(-1, crops.shape[2], 3)
+        ok, buf = cv2.imencode('.jpg', mosaic, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise RuntimeError("CropWriter: JPEG encoding failed")
+        return {'transport': 'jpeg', 'jpeg': base64.b64encode(buf.tobytes()).decode('ascii'), 'count': len(crops)}
+
+    def close(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class CropReader:
+    """Turns a crop message from ``CropWriter`` back into (N, h, w, 3) uint8 crops.
+
+    Returns ``None`` when a shared memory slot was already overwritten.
+    """
+
+    def __init__(self):
+        self._segments = {}
+        self.overwritten_count = 0
+
+    def _segment(self, name: str):
+        shm = self._segments.get(name)
+        if shm is None:
+            shm = shared_memory.SharedMemory(name=name)
+            # the writer owns the segment, don't let this process' tracker unlink it
+            try:
+                resource_tracker.unregister(shm._name, 'shared_memory')
+            except Exception:
+                pass
+            self._segments[name] = shm
+        return shm
+
+    def read(self, results: Dict) -> Optional[np.ndarray]:
+        w, h = results['crop_size']
+        count = int(results['count'])
+        if results['transport'] == 'jpeg':
+            if count == 0:
+                return np.zeros((0, h, w, 3), dtype=np.uint8)
+            buf = np.frombuffer(base64.b64decode(results['jpeg']), dtype=np.uint8)
+            return cv2.imdecode(buf, cv2.IMREAD_COLOR).reshape(count, h, w, 3)
+
+        shm = self._segment(results['shm_name'])
+        offset = int(results['shm_slot']) * int(results['shm_slot_bytes'])
+        header = np.ndarray((1,), dtype=np.int64, buffer=shm.buf, offset=offset)
+        seq = int(results['shm_seq'])
+        if header[0] != seq:
+            self.overwritten_count += 1
+            return None
+        crops = np.ndarray((count, h, w, 3), dtype=np.uint8, buffer=shm.buf, offset=offset + _HEADER).copy()
+        if header[0] != seq:
+            self.overwritten_count += 1
+            return None
+        return crops
+
+    def close(self):
+        for shm in self._segments.values():
+            shm.close()
+        self._segments = {}
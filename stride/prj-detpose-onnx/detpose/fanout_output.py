@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from typing import Dict
+
+
+class TopicFanOutput:
+    """One output interface per topic behind a single worker output.
+
+    The worker's formatted message (``{'results': ..., 'frame_id_str': ...}``)
+    carries a dict keyed by topic name in ``results``; every topic's
+    interface (e.g. MQTTOutput) gets the message with only its own results,
+    so consumers see exactly what the standalone service would publish.
+    Missing or None entries are skipped. A topic's results may carry their
+    own ``frame_id_str`` (a stage that publishes an earlier frame), which
+    then replaces the message's. Used by the fused detection + pose service
+    to feed the ``yolox`` and ``rtmpose`` topics from one process.
+
+    ``before_cleanup`` holds coroutine functions (e.g. a worker's ``flush``)
+    that still publish; they run once, from ``flush``, which ``cleanup``
+    calls before any output shuts down.
+    """
+
+    def __init__(self, outputs: Dict[str, object]):
+        if not outputs:
+            raise ValueError("TopicFanOutput needs at least one output interface")
+        self.outputs = dict(outputs)
+        self.before_cleanup = []
+
+    async def initialize(self):
+        results = await asyncio.gather(*(output.initialize() for output in self.outputs.values()))
+        return all(result is not False for result in results)
+
+    async def write_data(self, message, *args, **kwargs):
+        results = message.get('results') if isinstance(message, dict) else None
+        if not isinstance(results, dict):
+            raise TypeError(f"TopicFanOutput expects results keyed by topic, got {type(results).__name__}")
+        for topic, result in results.items():
+            if result is None:
+                continue
+            output = self.outputs.get(topic)
+            if output is None:
+                logging.warning(f"TopicFanOutput: no output for topic '{topic}', dropped")
+                continue
+            topic_message = dict(message, results=result)
+            if isinstance(result, dict) and 'frame_id_str' in result:
+                topic_message['results'] = {k: v for k, v in result.items() if k != 'frame_id_str'}
+                topic_message['frame_id_str'] = result['frame_id_str']
+            await output.write_data(topic_message, *args, **kwargs)
+
+    async def flush(self):
+        """Run the ``before_cleanup`` hooks, once; a no-op after ``cleanup``."""
+        hooks, self.before_cleanup = self.before_cleanup, []
+        for hook in hooks:
+            await hook()
+
+    async def cleanup(self):
+        await self.flush()
+        for output in self.outputs.values():
+            if hasattr(output, 'cleanup'):
+                await output.cleanup()
+
+    def __getattr__(self, name):
+        """Forward other calls to the first output."""
+        return getattr(next(iter(self.outputs.values())), name)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Fused YOLOX + RTMPose service with YAML configuration support.
+"""
+import os
+import sys
+import asyncio
+import logging
+import argparse
+
+# Add parent directories to path for contanos imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+# The YOLOX / RTMPose workers and their pelpers (one package, see Dockerfile) come
+# from the sibling services, so the service runs from the image layout in /app
+
+# Import your modules here
+from detpose_worker import DetPoseWorker
+from contanos.io.rtsp_input_interface import RTSPInput
+from pelpers.latest_frame_input import create_input
+from contanos.io.mqtt_output_interface import MQTTOutput
+from contanos.helpers.create_a_processor import create_a_processor
+from contanos.helpers.start_a_service import start_a_service
+from contanos.utils.create_args import add_argument, add_service_args, add_compute_args
+from contanos.utils.setup_logging import setup_logging
+from contanos.utils.parse_config_string import parse_config_string
+from pelpers.ort_tuning import add_ort_args, ort_config_from_args
+from pelpers.backend_select import resolve_backend
+from detpose.fanout_output import TopicFanOutput
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="OpenMMPose YOLOX + RTMPose in one process"
+    )
+
+    add_argument(parser, 'in_rtsp', 'IN_RTSP_URL', 'rtsp://localhost:8554,topic=mystream')
+    add_argument(parser, 'out_mqtt_yolox', 'OUT_MQTT_URL_YOLOX', 'mqtt://localhost:1883,topic=yolox,qos=2,queue_max_len=50')
+    add_argument(parser, 'out_mqtt_rtmpose', 'OUT_MQTT_URL_RTMPOSE', 'mqtt://localhost:1883,topic=rtmpose,qos=2,queue_max_len=100')
+    add_argument(parser, 'devices', 'DEVICES', 'cuda:3')
+    add_argument(parser, 'model_input_size', 'MODEL_INPUT_SIZE', '640,640')
+    add_argument(parser, 'model_url', 'MODEL_URL', 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/yolox_m_8xb8-300e_humanart-c2c7a14a.zip')
+    add_argument(parser, 'pose_input_size', 'POSE_INPUT_SIZE', '192,256')
+    add_argument(parser, 'pose_model_url', 'POSE_MODEL_URL', 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/rtmpose-m_simcc-body7_pt-body7_420e-256x192-e48f03d0_20230504.zip')
+    add_argument(parser, 'max_age_ms', 'MAX_AGE_MS', None)
+    add_argument(parser, 'batched', 'BATCHED', True)
+    add_argument(parser, 'pipeline', 'PIPELINE', False)         # detection of frame t overlaps pose of frame t-1
+    add_argument(parser, 'detect_scale', 'DETECT_SCALE', 1.0)
+    add_argument(parser, 'pitch_roi', 'PITCH_ROI', None)        # e.g. '80,300,1840,300,1920,1080,0,1080' polygon x,y,...
+    add_argument(parser, 'min_box_size', 'MIN_BOX_SIZE', None)  # e.g. '8,20' w,h in full-frame pixels
+    add_argument(parser, 'max_box_size', 'MAX_BOX_SIZE', None)  # e.g. '300,600'
+    add_argument(parser, 'static_frame_thr', 'STATIC_FRAME_THR', 0)
+
+    add_service_args(parser)
+    add_compute_args(parser)
+    add_ort_args(parser)
+    add_argument(parser, 'backend_cache', 'BACKEND_CACHE', None)  # BACKEND=auto decisions, default ~/.cache/stride
+    add_argument(parser, 'auto_batch', 'AUTO_BATCH', 16)           # persons per frame assumed by BACKEND=auto
+
+    return parser.parse_args()
+
+
+def parse_bool(value, name):
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes')
+    elif isinstance(value, bool):
+        return value
+    raise ValueError(f"{name} must be a boolean or string representing a boolean.")
+
+
+async def main():
+    """Main function to create and start the service."""
+    args = parse_args()
+
+    # Get configuration values (CLI args override YAML)
+    in_rtsp = args.in_rtsp
+    devices = args.devices
+    log_level = args.log_level if hasattr(args, 'log_level') else 'INFO'
+    backend = args.backend
+
+    model_input_size = [int(size) for size in str(args.model_input_size).split(',')]
+    pose_input_size = [int(size) for size in str(args.pose_input_size).split(',')]
+    batched = parse_bool(args.batched, 'BATCHED')
+    pipeline = parse_bool(args.pipeline, 'PIPELINE')
+
+    # Optional pitch polygon and box size limits
+    pitch_roi = [float(v) for v in args.pitch_roi.split(',')] if args.pitch_roi else None
+    if pitch_roi is not None and (len(pitch_roi) % 2 or len(pitch_roi) < 6):
+        raise ValueError("PITCH_ROI must be at least 3 x,y points: x1,y1,x2,y2,x3,y3,...")
+    pitch_roi = [pitch_roi[i:i + 2] for i in range(0, len(pitch_roi), 2)] if pitch_roi else None
+    min_box_size = [float(v) for v in args.min_box_size.split(',')] if args.min_box_size else None
+    max_box_size = [float(v) for v in args.max_box_size.split(',')] if args.max_box_size else None
+
+    # Setup logging
+    setup_logging(log_level)
+    logger = logging.getLogger(__name__)
+
+    logger.info("Starting fused YOLOX + RTMPose service with configuration:")
+    logger.info(f"  in_rtsp: {in_rtsp}")
+    logger.info(f"  out_mqtt_yolox: {args.out_mqtt_yolox}")
+    logger.info(f"  out_mqtt_rtmpose: {args.out_mqtt_rtmpose}")
+    logger.info(f"  devices: {devices}")
+    logger.info(f"  model_input_size: {model_input_size}, pose_input_size: {pose_input_size}")
+    logger.info(f"  backend: {backend}")
+    logger.info(f"  ort_config: {ort_config_from_args(args)}")
+    logger.info(f"  max_age_ms: {args.max_age_ms}")
+    logger.info(f"  batched: {batched}, pipeline: {pipeline}")
+    logger.info(f"  detect_scale: {args.detect_scale}")
+    logger.info(f"  pitch_roi: {pitch_roi}, min_box_size: {min_box_size}, max_box_size: {max_box_size}")
+    logger.info(f"  static_frame_thr: {args.static_frame_thr}")
+    logger.info(f"  log_level: {log_level}")
+
+    output_interface = None
+    try:
+        # Create input/output interfaces
+        # mode=latest in IN_RTSP_URL keeps only the newest frame(s) instead of queuing
+        input_interface = create_input(RTSPInput, parse_config_string(in_rtsp))
+        output_interface = TopicFanOutput({
+            'yolox': MQTTOutput(config=parse_config_string(args.out_mqtt_yolox)),
+            'rtmpose': MQTTOutput(config=parse_config_string(args.out_mqtt_rtmpose)),
+        })
+
+        await input_interface.initialize()
+        await output_interface.initialize()
+
+        # Each stage gets exactly the config of its standalone service
+        yolox_config = dict(
+            onnx_model=args.model_url,
+            model_input_size=model_input_size,
+            backend=backend,
+            max_age_ms=args.max_age_ms,
+            detect_scale=float(args.detect_scale),
+            pitch_roi=pitch_roi,
+            min_box_size=min_box_size,
+            max_box_size=max_box_size,
+            static_frame_thr=float(args.static_frame_thr),
+            ort_config=ort_config_from_args(args),
+        )
+        rtmpose_config = dict(
+            onnx_model=args.pose_model_url,
+            model_input_size=pose_input_size,
+            backend=backend,
+            max_age_ms=args.max_age_ms,
+            batched=batched,
+            static_frame_thr=float(args.static_frame_thr),
+            ort_config=ort_config_from_args(args),
+        )
+
+        # Convert devices string to list if needed
+        devices = devices.split(',') if isinstance(devices, str) else [devices]
+
+        # BACKEND=auto: benchmark the CPU backends once per host and model, then use the cached choice
+        yolox_config['backend'] = resolve_backend(backend, 'yolox', yolox_config['onnx_model'],
+                                                  model_input_size, devices=devices,
+                                                  cache_path=args.backend_cache)
+        rtmpose_config['backend'] = resolve_backend(backend, 'rtmpose', rtmpose_config['onnx_model'],
+                                                    pose_input_size[::-1], devices=devices,
+                                                    batch=int(args.auto_batch), batched=batched,
+                                                    cache_path=args.backend_cache)
+        logger.info(f"  resolved backend: yolox {yolox_config['backend']}, rtmpose {rtmpose_config['backend']}")
+
+        # Create processor with workers
+        workers, processor = create_a_processor(
+            worker_class=DetPoseWorker,
+            model_config=dict(yolox=yolox_config, rtmpose=rtmpose_config, pipeline=pipeline),
+            devices=devices,
+            input_interface=input_interface,
+            output_interface=output_interface,
+            num_workers_per_device=args.num_workers_per_device,
+        )
+        # PIPELINE=True: the pose of the last frame is still waiting for a next frame,
+        # published before the MQTT outputs shut down
+        output_interface.before_cleanup.extend(worker.flush for worker in workers)
+
+        # Start the service
+        service = await start_a_service(
+            processor=processor,
+            run_until_complete=args.run_until_complete,
+            daemon_mode=False,
+        )
+
+        logger.info("Fused YOLOX + RTMPose service started successfully")
+
+    except KeyboardInterrupt:
+        logger.info("Received interrupt signal, shutting down...")
+    except Exception as e:
+        logger.error(f"Error starting fused YOLOX + RTMPose service: {e}")
+        raise
+    finally:
+        # no-op if the service already cleaned up the outputs (and flushed with them)
+        if output_interface is not None:
+            await output_interface.flush()
+        logger.info("Fused YOLOX + RTMPose service shutdown complete")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Fused YOLOX + RTMPose service: detection and pose on the same decoded frame.
+Reads RTSP frames once, publishes boxes to the yolox topic and keypoints to the rtmpose topic.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from contanos.base_worker import BaseWorker
+from yolox_worker import YOLOXWorker
+from rtmpose_worker import RTMPoseWorker
+
+
+def init_stage(worker_class, worker_id: int, device: str, model_config: Dict):
+    """A standalone worker used as a stage of the fused worker.
+
+    Built through its own constructor (``BaseWorker.__init__`` runs its
+    ``_model_init``) but without input / output interfaces: the fused worker
+    reads and publishes, the stage only serves ``_predict``.
+    """
+    return worker_class(worker_id, device, model_config, input_interface=None, output_interface=None)
+
+
+class DetPoseWorker(BaseWorker):
+    """YOLOXWorker and RTMPoseWorker in one process, no broker hop or frame join in between.
+
+    ``model_config`` holds a ``yolox`` and an ``rtmpose`` dict, each exactly
+    what the standalone worker takes, so DETECT_SCALE, PITCH_ROI,
+    STATIC_FRAME_THR, folded models etc. behave the same. The pose stage gets
+    the detector's result in the form it would have received over MQTT.
+    Results are keyed by topic; TopicFanOutput publishes each to its own topic.
+
+    By default both stages run on frame t in the same call. With
+    ``pipeline=True`` detection of frame t runs in a helper thread while pose
+    runs on frame t-1 (ONNX Runtime releases the GIL), so a frame costs about
+    max(detection, pose) instead of their sum, but each pose is published one
+    frame later, with its own frame id; ``flush`` publishes the last one at
+    end of stream or shutdown. The frame held for the next call is a copy.
+    """
+
+    def __init__(self, worker_id: int, device: str,
+                 model_config: Dict,
+                 input_interface,
+                 output_interface):
+        super().__init__(worker_id, device, model_config,
+                         input_interface, output_interface)
+
+    def _model_init(self):
+        model_config = dict(self.model_config)
+        self.detector = init_stage(YOLOXWorker, self.worker_id, self.device, model_config.pop('yolox'))
+        self.pose = init_stage(RTMPoseWorker, self.worker_id, self.device, model_config.pop('rtmpose'))
+        self.pipeline = model_config.pop('pipeline', False)
+        self._executor = ThreadPoolExecutor(max_workers=1) if self.pipeline else None
+        self._pending = None  # (frame, detections, metadata) waiting for pose
+
+    def _predict(self, input: Any, metadata: Any = None) -> Any:
+        if not self.pipeline:
+            detections = self.detector._predict(input, metadata)
+            if detections is None:
+                return None
+            return {'yolox': detections, 'rtmpose': self._pose(input, detections, metadata)}
+
+        future = self._executor.submit(self.detector._predict, input, metadata)
+        pose = self._pending_pose()
+        detections = future.result()
+
+        # kept past this call: a copy, the input may reuse the frame buffer for the next read
+        self._pending = (input.copy(), detections, metadata) if detections is not None else None
+        results = {'yolox': detections, 'rtmpose': pose}
+        return results if any(value is not None for value in results.values()) else None
+
+    async def flush(self):
+        """Publish the pose still waiting for the next frame (``pipeline=True``), if any."""
+        metadata = self._pending[2] if self._pending is not None else None
+        pose = self._pending_pose()
+        if pose is not None:
+            await self.output_interface.write_data(self._format_results({'rtmpose': pose}, metadata))
+
+    def _pending_pose(self) -> Optional[Dict]:
+        # pose of the previous frame, tagged with that frame's id for TopicFanOutput
+        if self._pending is None:
+            return None
+        frame, detections, metadata = self._pending
+        self._pending = None
+        pose = self._pose(frame, detections, metadata)
+        if isinstance(pose, dict) and isinstance(metadata, dict):
+            pose['frame_id_str'] = metadata.get('frame_id_str')
+        return pose
+
+    def _pose(self, frame, detections: Dict, metadata: Any):
+        # same shape as the MultiInputInterface join of RTSP frame + yolox message
+        return self.pose._predict([frame, {'results': detections}], metadata)
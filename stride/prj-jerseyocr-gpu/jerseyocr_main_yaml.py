@@ -17,6 +17,7 @@ from contanos.io.rtsp_input_interface import RTSPInput
 from contanos.io.mqtt_output_interface import MQTTOutput
 from contanos.io.mqtt_input_interface import MQTTInput
 from contanos.io.multi_input_interface import MultiInputInterface
+from contanos.io.ordered_input_interface import OrderedInputInterface
 from contanos.helpers.create_a_processor import create_a_processor
 from contanos.helpers.start_a_service import start_a_service
 from contanos.utils.create_args import add_argument, add_service_args, add_compute_args
@@ -34,6 +35,8 @@ def parse_args():
     add_argument(parser, 'devices', 'DEVICES', 'cuda:1')
     add_argument(parser, 'model_input_size', 'MODEL_INPUT_SIZE', '192,256')
     add_argument(parser, 'use_small', 'USE_SMALL', True)
+    add_argument(parser, 'max_age_ms', 'MAX_AGE_MS', None)
+    add_argument(parser, 'crop_input', 'CROP_INPUT', False) # IN_MQTT_URL topic=crops, no RTSP input
 
     add_service_args(parser)
     add_compute_args(parser)
@@ -45,8 +48,15 @@ async def main():
     """Main function to create and start the service."""
     args = parse_args()
     
+    if isinstance(args.crop_input, str):
+        crop_input = args.crop_input.lower() in ('true', '1', 'yes')
+    elif isinstance(args.crop_input, bool):
+        crop_input = args.crop_input
+    else:
+        raise ValueError("CROP_INPUT must be a boolean or string representing a boolean.")
+
     # Get configuration values (CLI args override YAML)
-    if args.in_rtsp:
+    if args.in_rtsp or crop_input:
         in_rtsp = args.in_rtsp
     else:
         # throw error if not provided
@@ -80,17 +90,22 @@ async def main():
     logger.info(f"  out_mqtt: {out_mqtt}")
     logger.info(f"  devices: {devices}")
     logger.info(f"  model_input_size: {model_input_size}")
+    logger.info(f"  max_age_ms: {args.max_age_ms}")
+    logger.info(f"  crop_input: {crop_input}")
     logger.info(f"  log_level: {log_level}")
     
     try:
-        in_rtsp_config = parse_config_string(in_rtsp)
         in_mqtt_config = parse_config_string(in_mqtt)
         out_mqtt_config = parse_config_string(out_mqtt)
 
         # Create input/output interfaces
-        input_video_interface = RTSPInput(config=in_rtsp_config)
         input_message_interface = MQTTInput(config=in_mqtt_config)
-        input_interface = MultiInputInterface([input_video_interface, input_message_interface])
+        if crop_input:
+            # crops and boxes come from the crop service, no video decoding here
+            input_interface = OrderedInputInterface(input_message_interface)
+        else:
+            input_video_interface = RTSPInput(config=parse_config_string(in_rtsp))
+            input_interface = MultiInputInterface([input_video_interface, input_message_interface])
         output_interface = MQTTOutput(config=out_mqtt_config)
         
         await input_interface.initialize()
@@ -108,6 +123,8 @@ async def main():
             weights_path='jersey_ocr_best.pth',
             model_input_size=model_input_size,
             use_small=use_small,
+            max_age_ms=args.max_age_ms,
+            crop_input=crop_input,
         )
 
         monitor_task = asyncio.create_task(quick_debug())
@@ -146,6 +163,11 @@ async def main():
 # Debug monitoring function
 async def quick_debug():
     while True:
+        if not isinstance(input_interface, MultiInputInterface):
+            logging.info(f"ORDERED Q: {input_interface.ordered_queue.qsize()}")
+            await asyncio.sleep(1)
+            continue
+
         main_q = input_interface._queue.qsize()
         sync_dict = len(input_interface._data_dict)
         
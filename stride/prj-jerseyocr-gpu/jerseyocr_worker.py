@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 
 from typing import Any, Dict
+import numpy as np
 from contanos.base_worker import BaseWorker
 from pelpers.jomn_helper import JOMNHelper
+from pelpers.staleness import StalenessGuard
+from pelpers.crop_transport import CropReader, boxes_in_crops
 
 class JerseyOCRWorker(BaseWorker):
     
@@ -14,16 +17,58 @@ class JerseyOCRWorker(BaseWorker):
                          input_interface, output_interface)
     
     def _model_init(self):
-        self.model = JOMNHelper(**self.model_config,
+        model_config = dict(self.model_config)
+        self.staleness = StalenessGuard(model_config.pop('max_age_ms', None), name='JerseyOCR')
+        # crop_input=True: crops come from the crop service instead of the RTSP frame
+        self.crop_reader = CropReader() if model_config.pop('crop_input', False) else None
+        self.model = JOMNHelper(**model_config,
                            device=self.device)  
         
     def _predict(self, input: Any, metadata: Any) -> Any:
+        ts = self.staleness.origin_ts(input, metadata)
+        if self.staleness.expired(ts):
+            return None
 
-        numbers, potential_numbers, confidences = self.model(input[0], input[1]['results']['bboxes'])
+        if self.crop_reader is not None:
+            return self._predict_crops(input, ts)
+
+        results = input[1]['results']
+        bboxes = results['bboxes']
+        if results.get('scale', 1) != 1 and len(bboxes):
+            # boxes are in the detector's downscaled space (DETECT_SCALE), crop from the full frame
+            bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4) / results['scale']
+
+        numbers, potential_numbers, confidences = self.model(input[0], bboxes)
+
+        return {
+            'track_ids': [int(it) for it in results['track_ids']],
+            'numbers': numbers,
+            'potential_numbers': potential_numbers,
+            'confidences': confidences,
+            'ts': ts,
+        }
+
+    def _predict_crops(self, input: Any, ts: float) -> Any:
+        if isinstance(input, list):
+            input = input[0]
+        results = input['results']
+        track_ids = [int(it) for it in results['track_ids']]
+        if results['count'] == 0:
+            return {'track_ids': track_ids, 'numbers': [], 'potential_numbers': [], 'confidences': [], 'ts': ts}
+
+        crops = self.crop_reader.read(results)
+        if crops is None:
+            # the crop service already reused the shared memory slot, this frame is too old anyway
+            return None
+        # the crops are padded pose crops, cut the tight person box back out of each
+        bboxes = boxes_in_crops(results['bboxes'], np.asarray(results['centers'], dtype=np.float32),
+                                np.asarray(results['scales'], dtype=np.float32), results['crop_size'])
+        numbers, potential_numbers, confidences = self.model.from_crops(crops, bboxes)
 
         return {
-            'track_ids': [int(it) for it in input[1]['results']['track_ids']],
+            'track_ids': track_ids,
             'numbers': numbers,
             'potential_numbers': potential_numbers,
-            'confidences': confidences
+            'confidences': confidences,
+            'ts': ts,
         }
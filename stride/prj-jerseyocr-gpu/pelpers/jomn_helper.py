@@ -77,6 +77,28 @@ class JOMNHelper:
         batch_idx = torch.zeros((boxes_xyxy.size(0), 1), dtype=torch.float32, device=self.device)
         boxes = torch.cat([batch_idx, boxes_xyxy], dim=1)
 
+        return self._classify(img, boxes)
+
+    @torch.no_grad()
+    def from_crops(self, crops: np.ndarray, bboxes: np.ndarray):
+        """Jersey numbers from the crop service's person crops.
+
+        ``crops`` is (N, h, w, 3) uint8 and ``bboxes`` the (N, 4) xyxy box of
+        every person inside its own crop; box ``i`` is cut from crop ``i``.
+        """
+        img = torch.from_numpy(crops).to(self.device, non_blocking=True)
+        img = img.permute(0, 3, 1, 2).float() / 255.0  # [N,3,h,w]
+
+        H, W = img.shape[2:]
+        boxes_xyxy = torch.as_tensor(np.asarray(bboxes, dtype=np.float32).reshape(-1, 4), device=self.device)
+        boxes_xyxy[:, [0, 2]] = boxes_xyxy[:, [0, 2]].clamp(0, W)
+        boxes_xyxy[:, [1, 3]] = boxes_xyxy[:, [1, 3]].clamp(0, H)
+
+        batch_idx = torch.arange(boxes_xyxy.size(0), dtype=torch.float32, device=self.device).unsqueeze(1)
+        boxes = torch.cat([batch_idx, boxes_xyxy], dim=1)
+        return self._classify(img, boxes)
+
+    def _classify(self, img: torch.Tensor, boxes: torch.Tensor):
         # GPU crop + resize to fixed (H,W)
         pooled_h, pooled_w = self.model_input_size
         crops = roi_align(
@@ -0,0 +1,162 @@
+import logging
+
+import cv2
+import numpy as np
+
+from rtmlib.tools.pose_estimation import RTMPose
+from rtmlib.tools.pose_estimation.post_processings import convert_coco_to_openpose, get_simcc_maximum
+from pelpers.folded_preprocess import uint8_input
+from pelpers.crop_transport import crop_layout
+
+
+class BatchedRTMPose(RTMPose):
+    """RTMPose that estimates all persons of a frame in one session run.
+
+    rtmlib's RTMPose crops, normalizes and infers every bbox separately, so a
+    frame with 25 players costs 25 session runs. Here the affine parameters of
+    all boxes are computed at once, every crop is warped straight into a
+    preallocated (N, H, W, 3) buffer, normalized into a reusable float32 NCHW
+    tensor and sent through ONNX Runtime as a single batch. SimCC decoding is
+    done on the whole batch as well.
+
+    If the ONNX model has a static batch axis the crops are run in chunks of
+    that size. The stock rtmpose-m export has a batch of 1, which means one
+    run per box again; ``cmds/fold_preprocess.py --dynamic-batch`` rewrites it
+    so the whole frame is one run. Non-onnxruntime backends fall back to
+    rtmlib's per-box path.
+    Models with folded preprocessing (cmds/fold_preprocess.py) get the uint8
+    crops directly. Outputs match ``RTMPose.__call__`` up to float32 rounding.
+    """
+
+    def __init__(self, *args, padding: float = 1.25, simcc_split_ratio: float = 2.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.padding = padding
+        self.simcc_split_ratio = simcc_split_ratio
+
+        self._crops = None    # (N, H, W, 3) uint8, warp target
+        self._batch = None    # (N, 3, H, W) float32, session input
+        self._mean = None if self.mean is None else np.asarray(self.mean, dtype=np.float32)
+        self._inv_std = None if self.std is None else 1.0 / np.asarray(self.std, dtype=np.float32)
+
+        self._input_name = None
+        self._max_batch = None
+        if self.backend == 'onnxruntime':
+            model_input = self.session.get_inputs()[0]
+            self._input_name = model_input.name
+            batch_dim = model_input.shape[0]
+            # a symbolic / None batch dimension means the model is dynamic
+            self._max_batch = batch_dim if isinstance(batch_dim, int) and batch_dim > 0 else None
+            if self._max_batch == 1:
+                logging.warning("RTMPose model has a static batch of 1, every box is a separate session run; "
+                                "export it with cmds/fold_preprocess.py --dynamic-batch for one run per frame")
+        self._folded = uint8_input(self)
+
+    def __call__(self, image: np.ndarray, bboxes: list = []):
+        if self._input_name is None:
+            return super().__call__(image, bboxes)
+
+        if len(bboxes) == 0:
+            h, w = image.shape[:2]
+            bboxes = [[0, 0, w, h]]
+        bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+
+        centers, scales = crop_layout(bboxes, self.model_input_size, self.padding)
+        batch = self._preprocess(image, centers, scales)
+        simcc_x, simcc_y = self._inference(batch)
+        return self._postprocess(simcc_x, simcc_y, centers, scales)
+
+    def from_crops(self, crops: np.ndarray, centers: np.ndarray, scales: np.ndarray):
+        """Pose for crops that were already warped elsewhere (crop service).
+
+        ``crops`` is (N, H, W, 3) uint8 at ``model_input_size`` with the
+        same center / scale geometry as ``crop_layout``. Only the
+        onnxruntime backend is supported.
+        """
+        if self._input_name is None:
+            raise ValueError("BatchedRTMPose.from_crops needs the onnxruntime backend")
+        w, h = self.model_input_size
+        if crops.shape[1:3] != (h, w):
+            raise ValueError(f"crops are {crops.shape[2]}x{crops.shape[1]}, model expects {w}x{h}")
+        centers = np.asarray(centers, dtype=np.float32).reshape(-1, 2)
+        scales = np.asarray(scales, dtype=np.float32).reshape(-1, 2)
+
+        self._ensure_buffers(len(crops))
+        batch = self._normalize(crops)
+        simcc_x, simcc_y = self._inference(batch)
+        return self._postprocess(simcc_x, simcc_y, centers, scales)
+
+    def _ensure_buffers(self, n: int):
+        w, h = self.model_input_size
+        if self._crops is None or self._crops.shape[0] < n:
+            capacity = max(n, 2 * (0 if self._crops is None else self._crops.shape[0]))
+            self._crops = np.zeros((capacity, h, w, 3), dtype=np.uint8)
+            self._batch = None if self._folded else np.empty((capacity, 3, h, w), dtype=np.float32)
+
+    def _preprocess(self, image: np.ndarray, centers: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        n = len(centers)
+        w, h = self.model_input_size
+        self._ensure_buffers(n)
+
+        # Without rotation the warp is a uniform scale plus translation:
+        # dst = s * (src - center) + (w / 2, h / 2) with s = w / scale_w.
+        s = w / scales[:, 0]
+        warp_mats = np.zeros((n, 2, 3), dtype=np.float64)
+        warp_mats[:, 0, 0] = s
+        warp_mats[:, 1, 1] = s
+        warp_mats[:, 0, 2] = w * 0.5 - s * centers[:, 0]
+        warp_mats[:, 1, 2] = h * 0.5 - s * centers[:, 1]
+
+        crops = self._crops[:n]
+        for i in range(n):
+            cv2.warpAffine(image, warp_mats[i], (w, h), dst=crops[i],
+                           flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+
+        return self._normalize(crops)
+
+    def _normalize(self, crops: np.ndarray) -> np.ndarray:
+        if self._folded:
+            # cast, normalization and transpose run inside the graph
+            return crops
+        # HWC uint8 -> NCHW float32 in the preallocated buffer, then normalize
+        batch = self._batch[:len(crops)]
+        np.copyto(batch, crops.transpose(0, 3, 1, 2), casting='unsafe')
+        if self._mean is not None:
+            batch -= self._mean[None, :, None, None]
+        if self._inv_std is not None:
+            batch *= self._inv_std[None, :, None, None]
+        return batch
+
+    def _inference(self, batch: np.ndarray):
+        chunk = self._max_batch or len(batch)
+        if chunk >= len(batch):
+            simcc_x, simcc_y = self.session.run(None, {self._input_name: batch})[:2]
+            return simcc_x, simcc_y
+
+        outputs_x, outputs_y = [], []
+        for start in range(0, len(batch), chunk):
+            part = np.ascontiguousarray(batch[start:start + chunk])
+            if len(part) < chunk:
+                # static batch models need exactly `chunk` inputs
+                padded = np.zeros((chunk,) + part.shape[1:], dtype=part.dtype)
+                padded[:len(part)] = part
+                out_x, out_y = self.session.run(None, {self._input_name: padded})[:2]
+                out_x, out_y = out_x[:len(part)], out_y[:len(part)]
+            else:
+                out_x, out_y = self.session.run(None, {self._input_name: part})[:2]
+            # kept across runs: with IO_BINDING the session reuses its output buffers
+            outputs_x.append(out_x.copy())
+            outputs_y.append(out_y.copy())
+        return np.concatenate(outputs_x), np.concatenate(outputs_y)
+
+    def _postprocess(self, simcc_x, simcc_y, centers, scales):
+        """Batched SimCC decoding plus the inverse affine transform."""
+        locs, scores = get_simcc_maximum(simcc_x, simcc_y)  # (N, K, 2), (N, K)
+
+        keypoints = locs / self.simcc_split_ratio
+        keypoints = keypoints / np.asarray(self.model_input_size, dtype=np.float32) * scales[:, None, :]
+        keypoints = keypoints + centers[:, None, :] - scales[:, None, :] / 2
+
+        if self.to_openpose:
+            keypoints, scores = convert_coco_to_openpose(keypoints, scores)
+
+        return keypoints, scores
@@ -0,0 +1,9 @@
+def uint8_input(tool) -> bool:
+    """True if the tool's ONNX model takes uint8 NHWC input (cmds/fold_preprocess.py).
+
+    Such models cast, normalize and transpose inside the graph, so the
+    caller feeds the letterboxed / warped uint8 image as is.
+    """
+    if getattr(tool, 'backend', None) != 'onnxruntime':
+        return False
+    return tool.session.get_inputs()[0].type == 'tensor(uint8)'
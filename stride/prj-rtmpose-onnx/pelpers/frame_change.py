@@ -0,0 +1,68 @@
+import logging
+
+import cv2
+import numpy as np
+
+
+class StaticFrameDetector:
+    """Flags frames that are effectively identical to the last processed one.
+
+    Frozen broadcasts, replay stills and frames repeated by the SEI
+    transcoder cost a full model run for an identical result. Every frame is
+    reduced to a ``size`` (w, h) luma thumbnail (strided sample, then area
+    resize: about 1.5 ms for 1080p) and compared with the thumbnail of the
+    last frame that was *not* static. The frame is static when the mean
+    absolute difference is at most ``threshold`` luma levels and no single
+    cell changed by more than ``cell_threshold``, so a player moving in an
+    otherwise still picture is not missed. Comparing against the last
+    processed frame instead of the previous one keeps slow drifts from
+    accumulating unnoticed.
+
+    ``threshold <= 0`` disables the check (``is_static`` is always False).
+    """
+
+    def __init__(self, threshold: float = 0.0, cell_threshold: float = 16.0,
+                 size=(64, 36), stride: int = 4, log_every: int = 500):
+        self.threshold = float(threshold or 0.0)
+        self.cell_threshold = float(cell_threshold)
+        self.size = tuple(size)
+        self.stride = max(1, int(stride))
+        self.log_every = log_every
+
+        self._reference = None
+        self.static_count = 0
+        self.changed_count = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        sample = frame[::self.stride, ::self.stride]
+        if sample.ndim == 3:
+            sample = cv2.cvtColor(sample, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(sample, self.size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def is_static(self, frame: np.ndarray) -> bool:
+        if not self.enabled:
+            return False
+
+        thumb = self.thumbnail(frame)
+        static = False
+        if self._reference is not None and self._reference.shape == thumb.shape:
+            diff = np.abs(thumb - self._reference)
+            static = diff.mean() <= self.threshold and diff.max() <= self.cell_threshold
+
+        if static:
+            self.static_count += 1
+        else:
+            self._reference = thumb
+            self.changed_count += 1
+        self._log()
+        return static
+
+    def _log(self):
+        total = self.static_count + self.changed_count
+        if total % self.log_every == 0:
+            logging.info(f"StaticFrameDetector: {self.static_count} of {total} frames static "
+                         f"({self.static_count / total:.1%} inference skipped)")
@@ -0,0 +1,203 @@
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+GRAPH_OPT_LEVELS = ('disable', 'basic', 'extended', 'all')
+EXECUTION_MODES = ('sequential', 'parallel')
+
+
+def _as_bool(value) -> Optional[bool]:
+    if value is None or isinstance(value, bool):
+        return value
+    return str(value).lower() in ('true', '1', 'yes')
+
+
+def _as_int(value) -> Optional[int]:
+    if value in (None, '', 'None', 'none'):
+        return None
+    return int(value)
+
+
+def add_ort_args(parser):
+    """ONNX Runtime session options, next to ``add_compute_args``' ``backend``."""
+    from contanos.utils.create_args import add_argument
+
+    add_argument(parser, 'ort_graph_opt', 'ORT_GRAPH_OPT', None)            # disable | basic | extended | all
+    add_argument(parser, 'ort_execution_mode', 'ORT_EXECUTION_MODE', None)  # sequential | parallel
+    add_argument(parser, 'ort_intra_threads', 'ORT_INTRA_THREADS', None)
+    add_argument(parser, 'ort_inter_threads', 'ORT_INTER_THREADS', None)
+    add_argument(parser, 'ort_mem_arena', 'ORT_MEM_ARENA', None)
+    add_argument(parser, 'io_binding', 'IO_BINDING', False)
+
+
+def ort_config_from_args(args) -> Dict:
+    """Collect the parsed ``add_ort_args`` values, unset ones keep ORT's defaults."""
+    return dict(
+        graph_opt=args.ort_graph_opt,
+        execution_mode=args.ort_execution_mode,
+        intra_threads=_as_int(args.ort_intra_threads),
+        inter_threads=_as_int(args.ort_inter_threads),
+        mem_arena=_as_bool(args.ort_mem_arena),
+        io_binding=bool(_as_bool(args.io_binding)),
+    )
+
+
+def session_options(graph_opt: Optional[str] = None,
+                    execution_mode: Optional[str] = None,
+                    intra_threads: Optional[int] = None,
+                    inter_threads: Optional[int] = None,
+                    mem_arena: Optional[bool] = None):
+    """Build ``ort.SessionOptions``; ``None`` leaves an option at ORT's default."""
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    if graph_opt is not None:
+        if graph_opt not in GRAPH_OPT_LEVELS:
+            raise ValueError(f"ORT_GRAPH_OPT must be one of {GRAPH_OPT_LEVELS}, got {graph_opt!r}")
+        options.graph_optimization_level = {
+            'disable': ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+            'basic': ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+            'extended': ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+            'all': ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+        }[graph_opt]
+    if execution_mode is not None:
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"ORT_EXECUTION_MODE must be one of {EXECUTION_MODES}, got {execution_mode!r}")
+        options.execution_mode = (ort.ExecutionMode.ORT_PARALLEL if execution_mode == 'parallel'
+                                  else ort.ExecutionMode.ORT_SEQUENTIAL)
+    if intra_threads is not None:
+        options.intra_op_num_threads = int(intra_threads)
+    if inter_threads is not None:
+        options.inter_op_num_threads = int(inter_threads)
+    if mem_arena is not None:
+        options.enable_cpu_mem_arena = bool(mem_arena)
+    return options
+
+
+class BoundSession:
+    """Drop-in for ``ort.InferenceSession.run`` that runs through CPU I/O binding.
+
+    Outputs are written into numpy buffers that are allocated once per input
+    shape and reused for every later frame of that shape, inputs are bound in
+    place when they already are C-contiguous (otherwise copied into a reused
+    buffer). With ``reuse_outputs=True`` (what ``tune_session`` uses) ``run``
+    returns the buffers themselves, valid until the next ``run`` of the same
+    input shape: callers keeping outputs across runs (the batched RTMPose
+    chunk and tiled YOLOX loops) copy them. By default ``run`` returns
+    copies, for callers that don't know about the reuse.
+
+    Outputs whose shape depends on the data (e.g. YOLOX models with NMS
+    inside: a symbolic output dim that no input has, or a shape mismatch at
+    run time) use ORT-allocated outputs instead.
+    """
+
+    def __init__(self, session, reuse_outputs: bool = False):
+        self.session = session
+        self.reuse_outputs = reuse_outputs
+        self._input_names = [i.name for i in session.get_inputs()]
+        self._output_names = [o.name for o in session.get_outputs()]
+        input_dims = {d for i in session.get_inputs() for d in i.shape if not isinstance(d, int)}
+        self._dynamic_outputs = any(
+            not isinstance(d, int) and d not in input_dims for o in session.get_outputs() for d in o.shape)
+        self._bindings = {}   # input shapes -> (binding, input buffers, output buffers or None)
+        self.reused_runs = 0
+        self.allocated_runs = 0
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+    def run(self, output_names, input_feed, run_options=None):
+        key = tuple((name, input_feed[name].shape) for name in self._input_names)
+        entry = self._bindings.get(key)
+        if entry is None:
+            self._bindings[key], outputs = self._first_run(input_feed)
+        else:
+            outputs = self._run_bound(key, entry, input_feed, run_options)
+        if output_names is None:
+            return outputs
+        return [outputs[self._output_names.index(name)] for name in output_names]
+
+    def _bind_inputs(self, binding, buffers, input_feed):
+        for name in self._input_names:
+            value = input_feed[name]
+            if value.flags.c_contiguous:
+                binding.bind_cpu_input(name, value)
+            else:
+                np.copyto(buffers[name], value)
+                binding.bind_cpu_input(name, buffers[name])
+
+    def _first_run(self, input_feed):
+        """Run once with ORT-allocated outputs to learn their shapes, then bind buffers."""
+        buffers = {name: np.empty(input_feed[name].shape, dtype=input_feed[name].dtype)
+                   for name in self._input_names}
+        binding = self.session.io_binding()
+        self._bind_inputs(binding, buffers, input_feed)
+        for name in self._output_names:
+            binding.bind_output(name, 'cpu')
+        self.session.run_with_iobinding(binding)
+        first_outputs = binding.copy_outputs_to_cpu()
+        self.allocated_runs += 1
+        if self._dynamic_outputs:
+            return (binding, buffers, None), first_outputs
+
+        output_buffers = [np.empty_like(out) for out in first_outputs]
+        binding = self.session.io_binding()
+        for name, buf in zip(self._output_names, output_buffers):
+            binding.bind_output(name, 'cpu', element_type=buf.dtype, shape=buf.shape,
+                                buffer_ptr=buf.ctypes.data)
+        return (binding, buffers, output_buffers), first_outputs
+
+    def _run_bound(self, key, entry, input_feed, run_options):
+        binding, buffers, output_buffers = entry
+        self._bind_inputs(binding, buffers, input_feed)
+        if output_buffers is not None:
+            try:
+                self.session.run_with_iobinding(binding, run_options)
+                self.reused_runs += 1
+                if self.reuse_outputs:
+                    return output_buffers
+                return [buf.copy() for buf in output_buffers]
+            except Exception as e:
+                # data-dependent output shape, fall back to ORT-allocated outputs
+                logging.info(f"BoundSession: dynamic output shape for input {key}, not reusing buffers ({e})")
+                binding = self.session.io_binding()
+                self._bind_inputs(binding, buffers, input_feed)
+                self._bindings[key] = (binding, buffers, None)
+
+        # ORT would otherwise reuse the previous run's outputs as preallocated
+        binding.clear_binding_outputs()
+        for name in self._output_names:
+            binding.bind_output(name, 'cpu')
+        self.session.run_with_iobinding(binding, run_options)
+        self.allocated_runs += 1
+        return binding.copy_outputs_to_cpu()
+
+
+def tune_session(tool, ort_config: Optional[Dict] = None):
+    """Apply ``ort_config`` to an rtmlib tool's ONNX Runtime session in place.
+
+    The session is rebuilt with the requested options (same model and
+    providers) and, with ``io_binding=True`` on CPU, wrapped in a
+    ``BoundSession``. Other backends are left untouched.
+    """
+    if not ort_config or getattr(tool, 'backend', None) != 'onnxruntime':
+        return tool
+
+    import onnxruntime as ort
+
+    ort_config = dict(ort_config)
+    io_binding = ort_config.pop('io_binding', False)
+    if any(value is not None for value in ort_config.values()):
+        providers = tool.session.get_providers()
+        tool.session = ort.InferenceSession(tool.onnx_model, sess_options=session_options(**ort_config),
+                                            providers=providers)
+        logging.info(f"ONNX Runtime session options for {tool.onnx_model}: {ort_config}")
+
+    if io_binding:
+        if tool.session.get_providers()[0] == 'CPUExecutionProvider':
+            # rtmlib tools decode the outputs before the next run, the chunk loops copy what they keep
+            tool.session = BoundSession(tool.session, reuse_outputs=True)
+        else:
+            logging.warning("IO_BINDING is only implemented for the CPU execution provider, ignored")
+    return tool
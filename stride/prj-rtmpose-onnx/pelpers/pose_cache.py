@@ -0,0 +1,115 @@
+import logging
+
+import numpy as np
+
+
+class PoseCache:
+    """Reuses keypoints of tracks whose box barely moved since their last pose.
+
+    Needs track ids, i.e. RTMPose subscribed to the ByteTrack topic. For every
+    track the box the pose was last estimated on is kept. A track is a hit if
+    its current box still overlaps that box by at least ``iou_thr``, width and
+    height changed by at most ``scale_thr`` (relative) and the cached pose is
+    at most ``max_age`` frames old. Hits get the cached keypoints shifted by
+    the box center displacement; only the misses go through the model, in one
+    call. Poses are never propagated from a propagated pose, so the error is
+    bounded by the thresholds instead of accumulating.
+
+    Age is measured in frame ids, not calls, so it holds when several workers
+    share the stream and each sees only some of the frames.
+    """
+
+    def __init__(self, iou_thr: float = 0.9, scale_thr: float = 0.05, max_age: int = 5,
+                 log_every: int = 500):
+        self.iou_thr = iou_thr
+        self.scale_thr = scale_thr
+        self.max_age = max_age
+        self.log_every = log_every
+
+        self._entries = {}  # track id -> (box, keypoints, scores, frame id of the estimate)
+        self.hit_count = 0
+        self.miss_count = 0
+        self._frames = 0
+        self._frame_counter = 0
+
+    def frame_id(self, metadata) -> int:
+        """Frame number from ``frame_id_str`` ('...FRAME:123'), else a local counter."""
+        self._frame_counter += 1
+        if isinstance(metadata, dict) and metadata.get('frame_id_str'):
+            try:
+                return int(str(metadata['frame_id_str']).split('FRAME:')[-1])
+            except ValueError:
+                pass
+        return self._frame_counter
+
+    def __call__(self, model, image: np.ndarray, bboxes, track_ids, frame_id: int):
+        bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+        n = len(bboxes)
+        if n == 0:
+            # no tracks: no pose, rather than rtmlib's whole-frame fallback
+            self._entries = {}
+            return np.zeros((0, 0, 2), dtype=np.float32), np.zeros((0, 0), dtype=np.float32)
+
+        hit = self._match(bboxes, track_ids, frame_id)
+        miss = np.flatnonzero(~hit)
+        keypoints, scores = None, None
+
+        if len(miss):
+            new_kpts, new_scores = model(image, bboxes[miss])
+            keypoints = np.empty((n,) + new_kpts.shape[1:], dtype=new_kpts.dtype)
+            scores = np.empty((n,) + new_scores.shape[1:], dtype=new_scores.dtype)
+            keypoints[miss] = new_kpts
+            scores[miss] = new_scores
+
+        entries = {}
+        for i, tid in enumerate(track_ids):
+            if hit[i]:
+                box, kpts, kpt_scores, estimated = self._entries[tid]
+                shift = (bboxes[i, 0:2] + bboxes[i, 2:4] - box[0:2] - box[2:4]) * 0.5
+                if keypoints is None:
+                    keypoints = np.empty((n,) + kpts.shape, dtype=kpts.dtype)
+                    scores = np.empty((n,) + kpt_scores.shape, dtype=kpt_scores.dtype)
+                keypoints[i] = kpts + shift
+                scores[i] = kpt_scores
+                entries[tid] = (box, kpts, kpt_scores, estimated)
+            else:
+                entries[tid] = (bboxes[i].copy(), keypoints[i].copy(), scores[i].copy(), frame_id)
+        # tracks that are gone are forgotten right away
+        self._entries = entries
+
+        self._count(int(hit.sum()), len(miss))
+        return keypoints, scores
+
+    def _match(self, bboxes: np.ndarray, track_ids, frame_id: int) -> np.ndarray:
+        """Bool mask over ``bboxes`` of tracks whose cached pose can be reused."""
+        hit = np.zeros(len(bboxes), dtype=bool)
+        # a negative age means the frame ids restarted (stream loop): estimate again
+        cached = [i for i, tid in enumerate(track_ids)
+                  if tid in self._entries and 0 <= frame_id - self._entries[tid][3] <= self.max_age]
+        if not cached:
+            return hit
+
+        cur = bboxes[cached]
+        old = np.stack([self._entries[track_ids[i]][0] for i in cached])
+
+        iw = np.clip(np.minimum(cur[:, 2], old[:, 2]) - np.maximum(cur[:, 0], old[:, 0]), 0, None)
+        ih = np.clip(np.minimum(cur[:, 3], old[:, 3]) - np.maximum(cur[:, 1], old[:, 1]), 0, None)
+        inter = iw * ih
+        cur_wh = cur[:, 2:4] - cur[:, 0:2]
+        old_wh = np.maximum(old[:, 2:4] - old[:, 0:2], 1e-6)
+        iou = inter / np.maximum(cur_wh.prod(axis=1) + old_wh.prod(axis=1) - inter, 1e-6)
+        scale_delta = np.abs(cur_wh / old_wh - 1.0).max(axis=1)
+
+        hit[cached] = (iou >= self.iou_thr) & (scale_delta <= self.scale_thr)
+        return hit
+
+    def _count(self, hits: int, misses: int):
+        self.hit_count += hits
+        self.miss_count += misses
+        self._frames += 1
+        if self._frames % self.log_every == 0:
+            total = max(self.hit_count + self.miss_count, 1)
+            logging.info(
+                f"PoseCache: {self.hit_count} reused / {self.miss_count} estimated poses "
+                f"({self.hit_count / total:.1%} pose compute saved)"
+            )
@@ -17,11 +17,14 @@ from contanos.io.rtsp_input_interface import RTSPInput
 from contanos.io.mqtt_output_interface import MQTTOutput
 from contanos.io.mqtt_input_interface import MQTTInput
 from contanos.io.multi_input_interface import MultiInputInterface
+from contanos.io.ordered_input_interface import OrderedInputInterface
 from contanos.helpers.create_a_processor import create_a_processor
 from contanos.helpers.start_a_service import start_a_service
 from contanos.utils.create_args import add_argument, add_service_args, add_compute_args
 from contanos.utils.setup_logging import setup_logging
 from contanos.utils.parse_config_string import parse_config_string
+from pelpers.ort_tuning import add_ort_args, ort_config_from_args
+from pelpers.backend_select import resolve_backend
 
 
 def parse_args():
@@ -35,9 +38,20 @@ def parse_args():
     add_argument(parser, 'devices', 'DEVICES', None)
     add_argument(parser, 'model_input_size', 'MODEL_INPUT_SIZE', '256,192')
     add_argument(parser, 'model_url', 'MODEL_URL', 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/rtmpose-m_simcc-body7_pt-body7_420e-256x192-e48f03d0_20230504.zip')
+    add_argument(parser, 'max_age_ms', 'MAX_AGE_MS', None)
+    add_argument(parser, 'batched', 'BATCHED', True)
+    add_argument(parser, 'pose_reuse', 'POSE_REUSE', False)           # needs IN_MQTT_URL topic=bytetrack (track ids)
+    add_argument(parser, 'pose_reuse_iou', 'POSE_REUSE_IOU', 0.9)
+    add_argument(parser, 'pose_reuse_scale', 'POSE_REUSE_SCALE', 0.05)
+    add_argument(parser, 'pose_reuse_max_age', 'POSE_REUSE_MAX_AGE', 5)
+    add_argument(parser, 'crop_input', 'CROP_INPUT', False)           # IN_MQTT_URL topic=crops, no RTSP input
+    add_argument(parser, 'static_frame_thr', 'STATIC_FRAME_THR', 0)   # e.g. 1.0: re-emit poses on frozen frames
 
     add_service_args(parser)
     add_compute_args(parser)
+    add_ort_args(parser)
+    add_argument(parser, 'backend_cache', 'BACKEND_CACHE', None)  # BACKEND=auto decisions, default ~/.cache/stride
+    add_argument(parser, 'auto_batch', 'AUTO_BATCH', 16)           # persons per frame assumed by BACKEND=auto
 
     return parser.parse_args()
 
@@ -68,28 +82,68 @@ async def main():
     logger.info(f"  devices: {devices}")
     logger.info(f"  model_input_size: {model_input_size}")
     logger.info(f"  backend: {backend}")
+    logger.info(f"  ort_config: {ort_config_from_args(args)}")
+    logger.info(f"  max_age_ms: {args.max_age_ms}")
+    logger.info(f"  batched: {args.batched}")
+    logger.info(f"  pose_reuse: {args.pose_reuse} (iou {args.pose_reuse_iou}, scale {args.pose_reuse_scale}, "
+                f"max_age {args.pose_reuse_max_age})")
+    logger.info(f"  crop_input: {args.crop_input}")
+    logger.info(f"  static_frame_thr: {args.static_frame_thr}")
     logger.info(f"  log_level: {log_level}")
     
     try:
-        in_rtsp_config = parse_config_string(in_rtsp)
+        if isinstance(args.crop_input, str):
+            crop_input = args.crop_input.lower() in ('true', '1', 'yes')
+        elif isinstance(args.crop_input, bool):
+            crop_input = args.crop_input
+        else:
+            raise ValueError("CROP_INPUT must be a boolean or string representing a boolean.")
+
         in_mqtt_config = parse_config_string(in_mqtt)
         out_mqtt_config = parse_config_string(out_mqtt)
 
         # Create input/output interfaces
-        input_video_interface = RTSPInput(config=in_rtsp_config)
         input_message_interface = MQTTInput(config=in_mqtt_config)
-        input_interface = MultiInputInterface([input_video_interface, input_message_interface])
+        if crop_input:
+            # crops and boxes come from the crop service, no video decoding here
+            input_interface = OrderedInputInterface(input_message_interface)
+        else:
+            input_video_interface = RTSPInput(config=parse_config_string(in_rtsp))
+            input_interface = MultiInputInterface([input_video_interface, input_message_interface])
         output_interface = MQTTOutput(config=out_mqtt_config)
         
         await input_interface.initialize()
         await output_interface.initialize()
         
+        if isinstance(args.batched, str):
+            batched = args.batched.lower() in ('true', '1', 'yes')
+        elif isinstance(args.batched, bool):
+            batched = args.batched
+        else:
+            raise ValueError("BATCHED must be a boolean or string representing a boolean.")
+
+        if isinstance(args.pose_reuse, str):
+            pose_reuse = args.pose_reuse.lower() in ('true', '1', 'yes')
+        elif isinstance(args.pose_reuse, bool):
+            pose_reuse = args.pose_reuse
+        else:
+            raise ValueError("POSE_REUSE must be a boolean or string representing a boolean.")
+
         # Create model configuration
         model_config = dict(
             onnx_model=args.model_url if hasattr(args, 'model_url') and args.model_url is not None else \
                 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/rtmpose-m_simcc-body7_pt-body7_420e-256x192-e48f03d0_20230504.zip',
             model_input_size=model_input_size,
             backend=backend,
+            max_age_ms=args.max_age_ms,
+            batched=batched,
+            pose_reuse=pose_reuse,
+            pose_reuse_iou=float(args.pose_reuse_iou),
+            pose_reuse_scale=float(args.pose_reuse_scale),
+            pose_reuse_max_age=int(args.pose_reuse_max_age),
+            ort_config=ort_config_from_args(args),
+            crop_input=crop_input,
+            static_frame_thr=float(args.static_frame_thr),
         )
 
         monitor_task = asyncio.create_task(quick_debug())
@@ -97,6 +151,16 @@ async def main():
         # Convert devices string to list if needed
         devices = devices.split(',') if isinstance(devices, str) else [devices]
 
+        # BACKEND=auto: benchmark the CPU backends once per host and model, then use the cached choice
+        if crop_input and backend == 'auto':
+            model_config['backend'] = 'onnxruntime'  # BatchedRTMPose.from_crops needs an ONNX Runtime session
+        else:
+            model_config['backend'] = resolve_backend(backend, 'rtmpose', model_config['onnx_model'],
+                                                      model_input_size[::-1], devices=devices,
+                                                      batch=int(args.auto_batch), batched=batched,
+                                                      cache_path=args.backend_cache)
+        logger.info(f"  resolved backend: {model_config['backend']}")
+
         # Create processor with workers
         _, processor = create_a_processor(
             worker_class=RTMPoseWorker,
@@ -128,6 +192,11 @@ async def main():
 # Debug monitoring function
 async def quick_debug():
     while True:
+        if not isinstance(input_interface, MultiInputInterface):
+            logging.info(f"ORDERED Q: {input_interface.ordered_queue.qsize()}")
+            await asyncio.sleep(1)
+            continue
+
         main_q = input_interface._queue.qsize()
         sync_dict = len(input_interface._data_dict)
         
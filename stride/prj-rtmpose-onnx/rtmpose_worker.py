@@ -4,10 +4,19 @@ RTMPose Pose Estimation Service using the simplified base framework with multi-G
 Reads RTSP frames + MQTT DET Bbox, runs RTMPose detection, publishes keypoints to MQTT.
 """
 
+import logging
 from typing import Any, Dict
+import numpy as np
 
 from contanos.base_worker import BaseWorker
 from rtmlib.tools.pose_estimation import RTMPose
+from pelpers.staleness import StalenessGuard
+from pelpers.batched_rtmpose import BatchedRTMPose
+from pelpers.pose_cache import PoseCache
+from pelpers.ort_tuning import tune_session
+from pelpers.crop_transport import CropReader
+from pelpers.folded_preprocess import uint8_input
+from pelpers.frame_change import StaticFrameDetector
 class RTMPoseWorker(BaseWorker):
     """RTMPose detection processor with multi-GPU parallel processing."""
     
@@ -19,10 +28,88 @@ class RTMPoseWorker(BaseWorker):
                          input_interface, output_interface)
     
     def _model_init(self):
-        self.model = RTMPose(**self.model_config,
-                           device=self.device)  # Use the specific device for this model
+        model_config = dict(self.model_config)
+        self.staleness = StalenessGuard(model_config.pop('max_age_ms', None), name='RTMPose')
+        # pose_reuse=True: track-aware cache, only effective on ByteTrack input
+        pose_reuse = model_config.pop('pose_reuse', False)
+        reuse_config = dict(iou_thr=model_config.pop('pose_reuse_iou', 0.9),
+                            scale_thr=model_config.pop('pose_reuse_scale', 0.05),
+                            max_age=model_config.pop('pose_reuse_max_age', 5))
+        self.pose_cache = PoseCache(**reuse_config) if pose_reuse else None
+        # frozen / repeated frames with unchanged boxes re-emit the last poses (RTSP input only)
+        self.static_frames = StaticFrameDetector(model_config.pop('static_frame_thr', 0.0))
+        self._last_boxes, self._last_result = None, None
+        ort_config = model_config.pop('ort_config', None)
+        # crop_input=True: crops come from the crop service instead of the RTSP frame
+        self.crop_reader = CropReader() if model_config.pop('crop_input', False) else None
+        if self.crop_reader is not None:
+            model_config['batched'] = True
+        # batched=True runs all persons of a frame through one session run
+        pose_class = BatchedRTMPose if model_config.pop('batched', False) else RTMPose
+        self.model = pose_class(**model_config,
+                                device=self.device)  # Use the specific device for this model
+        if pose_class is RTMPose and uint8_input(self.model):
+            # rtmlib's per-box path can't feed uint8 models from cmds/fold_preprocess.py
+            logging.info("RTMPose model has folded preprocessing, using the batched path")
+            self.model = BatchedRTMPose(**model_config, device=self.device)
+        tune_session(self.model, ort_config)
         
     def _predict(self, input: Any, metadata: Any) -> Any:
+        ts = self.staleness.origin_ts(input, metadata)
+        if self.staleness.expired(ts):
+            return None
 
-        keypoints, keypoint_scores = self.model(input[0], input[1]['results']['bboxes'])
-        return {'scale': 1, 'keypoints': keypoints, 'keypoint_scores': keypoint_scores}
+        if self.crop_reader is not None:
+            return self._predict_crops(input, ts)
+
+        results = input[1]['results']
+        if not results.get('keyframe', True):
+            # YOLOX keyframe mode: no boxes on this frame, so no pose either; flagged as skipped
+            # (not "nobody in view"). Subscribe to the bytetrack topic to get pose, and the
+            # POSE_REUSE cache, on the predicted boxes instead
+            return {'scale': 1, 'keypoints': [], 'keypoint_scores': [], 'ts': ts,
+                    'keyframe': False, 'skipped': True}
+
+        bboxes = results['bboxes']
+        if results.get('scale', 1) != 1 and len(bboxes):
+            # boxes are in the detector's downscaled space (DETECT_SCALE), pose runs on the full frame
+            bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4) / results['scale']
+
+        track_ids = results.get('track_ids')
+        if self.static_frames.enabled:
+            # YOLOX re-emits identical boxes on static frames, ByteTrack keeps the same ids
+            boxes = (np.asarray(bboxes, dtype=np.float32).reshape(-1, 4), np.asarray(track_ids))
+            static = self.static_frames.is_static(input[0])
+            if static and self._last_result is not None and all(
+                    np.array_equal(a, b) for a, b in zip(boxes, self._last_boxes)):
+                return dict(self._last_result, ts=ts, repeated=True)
+            self._last_boxes = boxes
+            self._last_result = self._predict_boxes(input[0], bboxes, track_ids, ts, metadata)
+            return self._last_result
+        return self._predict_boxes(input[0], bboxes, track_ids, ts, metadata)
+
+    def _predict_boxes(self, image: np.ndarray, bboxes, track_ids, ts: float, metadata: Any) -> Dict:
+        if self.pose_cache is not None and track_ids is not None:
+            keypoints, keypoint_scores = self.pose_cache(self.model, image, bboxes, track_ids,
+                                                         self.pose_cache.frame_id(metadata))
+            return {'scale': 1, 'keypoints': keypoints, 'keypoint_scores': keypoint_scores,
+                    'track_ids': track_ids, 'ts': ts}
+
+        keypoints, keypoint_scores = self.model(image, bboxes)
+        return {'scale': 1, 'keypoints': keypoints, 'keypoint_scores': keypoint_scores, 'ts': ts}
+
+    def _predict_crops(self, input: Any, ts: float) -> Any:
+        if isinstance(input, list):
+            input = input[0]
+        results = input['results']
+        track_ids = results.get('track_ids', [])
+        if results['count'] == 0:
+            return {'scale': 1, 'keypoints': [], 'keypoint_scores': [], 'track_ids': track_ids, 'ts': ts}
+
+        crops = self.crop_reader.read(results)
+        if crops is None:
+            # the crop service already reused the shared memory slot, this frame is too old anyway
+            return None
+        keypoints, keypoint_scores = self.model.from_crops(crops, results['centers'], results['scales'])
+        return {'scale': 1, 'keypoints': keypoints, 'keypoint_scores': keypoint_scores,
+                'track_ids': track_ids, 'ts': ts}
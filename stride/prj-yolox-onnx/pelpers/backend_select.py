@@ -0,0 +1,200 @@
+import os
+import json
+import time
+import logging
+import platform
+import tempfile
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+CPU_BACKENDS = ('onnxruntime', 'openvino', 'opencv')
+_MODULES = {'onnxruntime': 'onnxruntime', 'openvino': 'openvino', 'opencv': 'cv2'}
+DEFAULT_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'stride', 'backend_choice.json')
+
+
+def available_backends() -> list:
+    """CPU inference backends whose Python package is importable here."""
+    found = []
+    for backend in CPU_BACKENDS:
+        try:
+            __import__(_MODULES[backend])
+            found.append(backend)
+        except ImportError:
+            pass
+    return found
+
+
+def resolve_model_path(onnx_model: str) -> str:
+    if os.path.exists(onnx_model):
+        return onnx_model
+    from rtmlib.tools.file import download_checkpoint
+    return download_checkpoint(onnx_model)
+
+
+class RawRunner:
+    """Runs an ONNX model on one backend with an NCHW float32 (or folded uint8 NHWC) batch.
+
+    Only the session call is timed, the same thing every backend does for
+    the rtmlib tools. OpenVINO models are reshaped per batch size, OpenCV DNN
+    and static-batch ONNX Runtime models only accept their own batch size.
+    """
+
+    def __init__(self, backend: str, model_path: str):
+        self.backend = backend
+        self.model_path = model_path
+        self._compiled = {}
+
+        import onnxruntime as ort
+        probe = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+        model_input = probe.get_inputs()[0]
+        self.input_name = model_input.name
+        self.uint8 = model_input.type == 'tensor(uint8)'
+        # None for a symbolic / dynamic batch axis
+        batch_dim = model_input.shape[0]
+        self.static_batch = batch_dim if isinstance(batch_dim, int) and batch_dim > 0 else None
+
+        if backend == 'onnxruntime':
+            self.session = probe
+        elif backend == 'openvino':
+            from openvino.runtime import Core
+            self.core = Core()
+        elif backend == 'opencv':
+            import cv2
+            self.session = cv2.dnn.readNetFromONNX(model_path)
+            self.session.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+            self.session.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        else:
+            raise ValueError(f"unknown CPU backend {backend!r}")
+
+    def make_input(self, batch: int, input_hw: Sequence[int], rng: np.random.Generator) -> np.ndarray:
+        h, w = input_hw
+        if self.uint8:
+            return rng.integers(0, 256, (batch, h, w, 3), dtype=np.uint8)
+        return rng.random((batch, 3, h, w), dtype=np.float32) * 255.0
+
+    def __call__(self, data: np.ndarray):
+        if self.backend == 'onnxruntime':
+            return self.session.run(None, {self.input_name: data})
+        if self.backend == 'openvino':
+            compiled = self._compiled.get(data.shape)
+            if compiled is None:
+                model = self.core.read_model(self.model_path)
+                model.reshape({model.input(0): list(data.shape)})
+                compiled = self.core.compile_model(model, 'CPU', {'PERFORMANCE_HINT': 'LATENCY'})
+                self._compiled[data.shape] = compiled
+            return list(compiled(data).values())
+        self.session.setInput(data)
+        return self.session.forward(self.session.getUnconnectedOutLayersNames())
+
+
+def time_runner(runner: RawRunner, data: np.ndarray, repeats: int = 20, warmup: int = 3) -> float:
+    """Median latency in ms of one call on ``data``."""
+    for _ in range(warmup):
+        runner(data)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        runner(data)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return float(np.median(samples))
+
+
+def _host_id() -> str:
+    cpu = platform.processor() or platform.machine()
+    try:
+        with open('/proc/cpuinfo') as f:
+            cpu = next((line.split(':', 1)[1].strip() for line in f if line.startswith('model name')), cpu)
+    except OSError:
+        pass
+    return f"{cpu}|{os.cpu_count()}"
+
+
+def _versions(backends) -> str:
+    versions = []
+    for backend in backends:
+        versions.append(f"{backend}={getattr(__import__(_MODULES[backend]), '__version__', '?')}")
+    return ','.join(versions)
+
+
+def _load_cache(path: str) -> Dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _store_cache(path: str, key: str, entry: Dict):
+    """Merge ``entry`` into the JSON cache, replacing the file atomically."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    cache = _load_cache(path)
+    cache[key] = entry
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def resolve_backend(backend: str, kind: str, onnx_model: str, input_hw: Sequence[int],
+                    devices: Sequence[str] = ('cpu',), batch: int = 1, batched: bool = True,
+                    cache_path: Optional[str] = None, repeats: int = 20) -> str:
+    """Turn ``backend='auto'`` into the fastest CPU backend for this model on this host.
+
+    Only picks between paths that run on every backend: rtmlib's plain
+    per-call path, and for ``batched=True`` the pelpers batched path on ONNX
+    Runtime (BatchedRTMPose), which falls back to rtmlib per box elsewhere.
+    Every available backend runs the model on a random input; the cost of a
+    frame is ``batch`` items in as few ONNX Runtime calls as the model's batch
+    axis allows with ``batched=True`` (chunks of a static batch, like
+    BatchedRTMPose), and ``batch`` calls of batch 1 otherwise. Models with
+    folded preprocessing (uint8 input) only run on the pelpers ONNX Runtime
+    paths and get onnxruntime without a benchmark; callers do the same for
+    the other ONNX Runtime only paths (TILE_GRID, CROP_INPUT). The winner is cached in
+    ``cache_path`` under the model, input size, batch, CPU and library
+    versions, so later starts skip the benchmark. GPU devices always get
+    onnxruntime. Any other ``backend`` value is returned unchanged.
+    """
+    if backend != 'auto':
+        return backend
+    if any(not str(device).startswith('cpu') for device in devices):
+        logging.info(f"backend=auto: {kind} runs on {list(devices)}, using onnxruntime")
+        return 'onnxruntime'
+
+    cache_path = cache_path or DEFAULT_CACHE
+    backends = available_backends()
+    key = '|'.join([kind, str(onnx_model), 'x'.join(str(v) for v in input_hw), f"batch{batch}",
+                    'batched' if batched else 'per-box', _host_id(), _versions(backends)])
+    cached = _load_cache(cache_path).get(key)
+    if cached is not None:
+        logging.info(f"backend=auto: {kind} -> {cached['backend']} (cached in {cache_path})")
+        return cached['backend']
+
+    model_path = resolve_model_path(onnx_model)
+    rng = np.random.default_rng(0)
+    costs = {}
+    for name in backends:
+        try:
+            runner = RawRunner(name, model_path)
+            if runner.uint8:
+                # rtmlib feeds float NCHW, only the pelpers ONNX Runtime paths feed uint8
+                logging.info(f"backend=auto: {kind} has folded preprocessing, using onnxruntime")
+                return 'onnxruntime'
+            if name == 'onnxruntime' and batched and batch > 1:
+                chunk = min(runner.static_batch or batch, batch)
+                calls = -(-batch // chunk)
+                cost = calls * time_runner(runner, runner.make_input(chunk, input_hw, rng), repeats)
+            else:
+                cost = batch * time_runner(runner, runner.make_input(1, input_hw, rng), repeats)
+            costs[name] = cost
+            logging.info(f"backend=auto: {kind} on {name}: {cost:.2f} ms/frame")
+        except Exception as e:
+            logging.info(f"backend=auto: {kind} can't run on {name} ({type(e).__name__}: {e})")
+    if not costs:
+        raise RuntimeError(f"backend=auto: no CPU backend could run {onnx_model}")
+
+    best = min(costs, key=costs.get)
+    _store_cache(cache_path, key, {'backend': best, 'ms_per_frame': costs, 'measured': time.time()})
+    logging.info(f"backend=auto: {kind} -> {best}, cached in {cache_path}")
+    return best
@@ -0,0 +1,29 @@
+import logging
+
+import numpy as np
+
+from rtmlib.tools.object_detection import YOLOX
+
+from pelpers.folded_preprocess import uint8_input
+
+
+class FoldedYOLOX(YOLOX):
+    """rtmlib YOLOX that also runs models with folded preprocessing.
+
+    For a uint8-input model the letterboxed image goes into the session
+    without rtmlib's HWC->NCHW transpose and float32 copy; any other model
+    runs exactly like ``YOLOX``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._folded = uint8_input(self)
+        if self._folded:
+            self._input_name = self.session.get_inputs()[0].name
+            self._output_names = [out.name for out in self.session.get_outputs()]
+            logging.info(f"{self.onnx_model}: preprocessing folded into the graph, feeding uint8 NHWC")
+
+    def inference(self, img: np.ndarray):
+        if not self._folded:
+            return super().inference(img)
+        return self.session.run(self._output_names, {self._input_name: img[None]})
@@ -0,0 +1,84 @@
+import logging
+
+
+class KeyframeScheduler:
+    """Decides on which frames YOLOX actually runs.
+
+    With ``detect_every=k`` a frame is a keyframe once its id is at least k
+    past the last keyframe (or went backwards: camera or stream restart), the
+    frames in between are published without boxes and flagged
+    ``keyframe: False`` so ByteTrack fills them with Kalman-predicted boxes.
+    Working on id gaps keeps detection going when ids are skipped (latest
+    frame mode, MAX_AGE_MS drops, static frames). Every worker keeps its own
+    schedule, so with several workers the detector runs somewhat more often
+    than every k frames, never less. With ``adaptive=True`` the interval
+    starts at k and is halved whenever the person count of consecutive
+    keyframes changes by more than ``change_thr``, then grows back by one
+    per stable keyframe; that state is per worker too, so YOLOX main only
+    allows adaptive mode with a single worker. Detector load drops by up to
+    a factor of k.
+    """
+
+    def __init__(self, detect_every: int = 1, adaptive: bool = False,
+                 change_thr: float = 0.2, log_every: int = 500):
+        self.detect_every = max(1, int(detect_every))
+        self.adaptive = adaptive
+        self.change_thr = change_thr
+        self.log_every = log_every
+
+        self.interval = self.detect_every
+        self.last_keyframe = None
+        self._frame_counter = 0
+        self._last_count = None
+
+        self.keyframe_count = 0
+        self.skipped_count = 0
+
+    def frame_id(self, metadata) -> int:
+        """Frame number from ``frame_id_str`` ('...FRAME:123'), else a local counter."""
+        self._frame_counter += 1
+        if isinstance(metadata, dict) and metadata.get('frame_id_str'):
+            try:
+                return int(str(metadata['frame_id_str']).split('FRAME:')[-1])
+            except ValueError:
+                pass
+        return self._frame_counter
+
+    def is_keyframe(self, frame_id: int) -> bool:
+        if self.detect_every == 1:
+            self.keyframe_count += 1
+            return True
+
+        # frame ids may jump (latest-frame mode, dropped or static frames) or restart (stream loop)
+        last = self.last_keyframe
+        if last is None or frame_id < last or frame_id - last >= self.interval:
+            self.last_keyframe = frame_id
+            self.keyframe_count += 1
+            self._log()
+            return True
+
+        self.skipped_count += 1
+        self._log()
+        return False
+
+    def observe(self, count: int) -> None:
+        """Feed the person count of the last keyframe to the adaptive policy."""
+        if not self.adaptive or self.detect_every == 1:
+            return
+
+        # rtmlib's YOLOX returns boxes only (scores are all ones), the count is the signal
+        if self._last_count is not None:
+            if abs(count - self._last_count) / max(self._last_count, 1) > self.change_thr:
+                self.interval = max(1, self.interval // 2)
+            else:
+                self.interval = min(self.detect_every, self.interval + 1)
+
+        self._last_count = count
+
+    def _log(self):
+        total = self.keyframe_count + self.skipped_count
+        if total % self.log_every == 0:
+            logging.info(
+                f"KeyframeScheduler: {self.keyframe_count} keyframes, {self.skipped_count} skipped "
+                f"({self.keyframe_count / total:.1%} detector load), interval {self.interval}"
+            )
@@ -0,0 +1,98 @@
+import logging
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """Even-odd ray casting of (N, 2) points against an (M, 2) polygon, all edges at once."""
+    points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+    if len(points) == 0:
+        return np.zeros((0,), dtype=bool)
+    x, y = points[:, 0:1], points[:, 1:2]                    # (N, 1)
+    x1, y1 = polygon[:, 0], polygon[:, 1]                     # (M,)
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+    crosses = (y1 > y) != (y2 > y)                            # edge spans the point's scanline
+    dy = np.where(y2 == y1, 1.0, y2 - y1)                     # horizontal edges never cross
+    x_cross = x1 + (y - y1) * (x2 - x1) / dy
+    return np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
+
+
+class PitchROI:
+    """Static pitch polygon plus box size limits for the YOLOX worker.
+
+    ``polygon`` is a list of (x, y) full-frame points. The detector only
+    sees the polygon's bounding rectangle (``crop``), and detections whose
+    feet (bottom center) fall outside the polygon, or whose full-frame width
+    / height are outside ``min_box`` / ``max_box``, are dropped before
+    publishing (``keep``). Spectators, ball boys and camera operators then
+    never reach ByteTrack, RTMPose, JerseyOCR or the annotator.
+
+    Everything works in the detector's ``scale`` space (DETECT_SCALE): the
+    polygon is scaled once, box sizes are compared at full resolution.
+    """
+
+    def __init__(self, polygon: Optional[Sequence] = None,
+                 min_box: Optional[Sequence[float]] = None,
+                 max_box: Optional[Sequence[float]] = None,
+                 scale: float = 1.0,
+                 log_every: int = 500):
+        self.scale = scale
+        self.polygon = None
+        self.rect = None
+        if polygon is not None:
+            polygon = np.asarray(polygon, dtype=np.float32).reshape(-1, 2)
+            if len(polygon) < 3:
+                raise ValueError(f"PITCH_ROI needs at least 3 points, got {len(polygon)}")
+            self.polygon = polygon * scale
+            x1, y1 = np.floor(polygon.min(axis=0)).astype(int)
+            x2, y2 = np.ceil(polygon.max(axis=0)).astype(int)
+            self.rect = (int(max(0, x1)), int(max(0, y1)), int(x2), int(y2))
+        self.min_box = None if min_box is None else np.asarray(min_box, dtype=np.float32).reshape(2)
+        self.max_box = None if max_box is None else np.asarray(max_box, dtype=np.float32).reshape(2)
+        self.log_every = log_every
+
+        self.frame_count = 0
+        self.kept_count = 0
+        self.outside_count = 0
+        self.size_count = 0
+
+    @property
+    def active(self) -> bool:
+        return self.polygon is not None or self.min_box is not None or self.max_box is not None
+
+    def crop(self, frame: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """View of the polygon's bounding rectangle and its full-frame (x, y) offset."""
+        if self.rect is None:
+            return frame, (0, 0)
+        x1, y1, x2, y2 = self.rect
+        return frame[y1:y2, x1:x2], (x1, y1)
+
+    def keep(self, bboxes: np.ndarray) -> np.ndarray:
+        """Boolean mask over (N, 4) xyxy boxes in ``scale`` space."""
+        bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+        keep = np.ones(len(bboxes), dtype=bool)
+        if len(bboxes) == 0:
+            return keep
+
+        if self.min_box is not None or self.max_box is not None:
+            wh = (bboxes[:, 2:4] - bboxes[:, 0:2]) / self.scale
+            if self.min_box is not None:
+                keep &= np.all(wh >= self.min_box, axis=1)
+            if self.max_box is not None:
+                keep &= np.all(wh <= self.max_box, axis=1)
+            self.size_count += int(np.count_nonzero(~keep))
+
+        if self.polygon is not None:
+            feet = np.stack([(bboxes[:, 0] + bboxes[:, 2]) * 0.5, bboxes[:, 3]], axis=1)
+            inside = points_in_polygon(feet, self.polygon)
+            self.outside_count += int(np.count_nonzero(keep & ~inside))
+            keep &= inside
+
+        self.kept_count += int(np.count_nonzero(keep))
+        self.frame_count += 1
+        if self.frame_count % self.log_every == 0:
+            logging.info(f"PitchROI: {self.kept_count} boxes kept, {self.outside_count} outside the pitch, "
+                         f"{self.size_count} outside the size limits over {self.frame_count} frames")
+        return keep
@@ -0,0 +1,189 @@
+import cv2
+import numpy as np
+
+from rtmlib.tools.object_detection import YOLOX
+from pelpers.folded_preprocess import uint8_input
+
+
+def tile_layout(roi, grid, overlap):
+    """Split ``roi`` (x1, y1, x2, y2) into ``grid`` (rows, cols) overlapping tiles.
+
+    Returns an int array of shape (rows * cols, 4) in xyxy pixel coordinates.
+    """
+    x1, y1, x2, y2 = roi
+    rows, cols = grid
+    roi_w, roi_h = x2 - x1, y2 - y1
+
+    tile_w = roi_w / (cols - (cols - 1) * overlap)
+    tile_h = roi_h / (rows - (rows - 1) * overlap)
+    xs = x1 + np.arange(cols) * tile_w * (1 - overlap)
+    ys = y1 + np.arange(rows) * tile_h * (1 - overlap)
+
+    tx, ty = np.meshgrid(xs, ys)
+    tiles = np.stack([tx.ravel(), ty.ravel(), tx.ravel() + tile_w, ty.ravel() + tile_h], axis=1)
+    tiles = np.round(tiles).astype(np.int32)
+    tiles[:, [0, 2]] = np.clip(tiles[:, [0, 2]], x1, x2)
+    tiles[:, [1, 3]] = np.clip(tiles[:, [1, 3]], y1, y2)
+    return tiles
+
+
+def nms_matrix(boxes, scores, thr, metric='iou'):
+    """Greedy NMS over a precomputed pairwise overlap matrix.
+
+    All overlaps are computed in one broadcast, the greedy pass then only
+    does boolean row operations. ``metric='ios'`` (intersection over the
+    smaller box) also merges boxes truncated at tile borders with their
+    full counterpart. Returns the kept indices, highest score first.
+    """
+    if len(boxes) == 0:
+        return np.empty((0,), dtype=np.int64)
+
+    order = np.argsort(-scores, kind='stable')
+    b = boxes[order]
+    areas = np.maximum(0.0, b[:, 2] - b[:, 0]) * np.maximum(0.0, b[:, 3] - b[:, 1])
+
+    iw = np.clip(np.minimum(b[:, None, 2], b[None, :, 2]) - np.maximum(b[:, None, 0], b[None, :, 0]), 0, None)
+    ih = np.clip(np.minimum(b[:, None, 3], b[None, :, 3]) - np.maximum(b[:, None, 1], b[None, :, 1]), 0, None)
+    inter = iw * ih
+    if metric == 'ios':
+        denom = np.minimum(areas[:, None], areas[None, :])
+    else:
+        denom = areas[:, None] + areas[None, :] - inter
+    overlap = inter / np.maximum(denom, 1e-9)
+
+    # a box can only be suppressed by a higher-scored one
+    suppress = np.triu(overlap > thr, k=1)
+    keep = np.ones(len(b), dtype=bool)
+    for i in range(len(b)):
+        if keep[i]:
+            keep &= ~suppress[i]
+    return order[keep]
+
+
+class TiledYOLOX(YOLOX):
+    """YOLOX over overlapping high-resolution tiles in one batched run.
+
+    Far-side players in a 1080p wide shot are only a few pixels tall after
+    letterboxing to 640x640. This splits the frame (or a pitch ROI) into a
+    ``tile_grid`` of overlapping tiles, letterboxes every tile into one
+    preallocated NCHW batch, runs a single session call and merges all tile
+    detections with one matrix NMS. With ``include_full=True`` the whole ROI
+    is added as an extra tile so large, close players cut by tile borders are
+    still detected in one piece.
+
+    Returns ``(bboxes, scores)`` in frame coordinates, like the YOLOX worker
+    expects. Static-batch models are run tile by tile; models with folded
+    preprocessing get the letterboxed uint8 tiles directly. ONNX Runtime
+    backend only.
+    """
+
+    def __init__(self, *args,
+                 tile_grid=(2, 2),
+                 tile_overlap: float = 0.2,
+                 roi=None,
+                 include_full: bool = True,
+                 merge_metric: str = 'iou',
+                 **kwargs):
+        # the batched tile run goes through the ONNX Runtime session directly
+        if kwargs.get('backend', 'onnxruntime') != 'onnxruntime':
+            raise ValueError(f"TiledYOLOX needs backend='onnxruntime', got '{kwargs['backend']}'")
+        super().__init__(*args, **kwargs)
+        self.tile_grid = tuple(int(v) for v in tile_grid)
+        self.tile_overlap = float(tile_overlap)
+        self.roi = None if roi is None else tuple(int(v) for v in roi)
+        self.include_full = include_full
+        self.merge_metric = merge_metric
+
+        self._frame_shape = None
+        self._tiles = None
+        self._padded = None   # (B, H, W, 3) uint8 letterbox target
+        self._batch = None    # (B, 3, H, W) float32 session input
+        self._grids = None
+
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        batch_dim = model_input.shape[0]
+        self._static_batch = isinstance(batch_dim, int) and batch_dim > 0
+        self._folded = uint8_input(self)
+
+    def _prepare(self, frame_shape):
+        """(Re)build the tile layout and buffers when the frame size changes."""
+        if self._frame_shape == frame_shape:
+            return
+        h, w = frame_shape[:2]
+        roi = self.roi if self.roi is not None else (0, 0, w, h)
+        roi = (max(0, roi[0]), max(0, roi[1]), min(w, roi[2]), min(h, roi[3]))
+
+        tiles = tile_layout(roi, self.tile_grid, self.tile_overlap)
+        if self.include_full:
+            tiles = np.vstack([tiles, np.asarray([roi], dtype=np.int32)])
+        self._tiles = tiles
+
+        in_h, in_w = self.model_input_size
+        tile_w = (tiles[:, 2] - tiles[:, 0]).astype(np.float32)
+        tile_h = (tiles[:, 3] - tiles[:, 1]).astype(np.float32)
+        self._ratios = np.minimum(in_h / tile_h, in_w / tile_w)
+
+        self._padded = np.full((len(tiles), in_h, in_w, 3), 114, dtype=np.uint8)
+        self._batch = None if self._folded else np.empty((len(tiles), 3, in_h, in_w), dtype=np.float32)
+        self._frame_shape = frame_shape
+
+    def __call__(self, image: np.ndarray):
+        self._prepare(image.shape)
+        batch = self._preprocess_tiles(image)
+        outputs = self._inference_tiles(batch)
+        boxes, scores = self._decode(outputs)
+
+        keep = nms_matrix(boxes, scores, self.nms_thr, metric=self.merge_metric)
+        return boxes[keep], scores[keep]
+
+    def _preprocess_tiles(self, image: np.ndarray) -> np.ndarray:
+        for i, (x1, y1, x2, y2) in enumerate(self._tiles):
+            ratio = self._ratios[i]
+            rw, rh = int((x2 - x1) * ratio), int((y2 - y1) * ratio)
+            self._padded[i, :rh, :rw] = cv2.resize(image[y1:y2, x1:x2], (rw, rh),
+                                                   interpolation=cv2.INTER_LINEAR)
+        if self._folded:
+            return self._padded
+        np.copyto(self._batch, self._padded.transpose(0, 3, 1, 2), casting='unsafe')
+        return self._batch
+
+    def _inference_tiles(self, batch: np.ndarray):
+        if not self._static_batch:
+            return self.session.run(None, {self._input_name: batch})
+        # kept across runs: with IO_BINDING the session reuses its output buffers
+        outputs = [[out.copy() for out in self.session.run(None, {self._input_name: batch[i:i + 1]})]
+                   for i in range(len(batch))]
+        return [np.concatenate([out[k] for out in outputs]) for k in range(len(outputs[0]))]
+
+    def _decode(self, outputs):
+        """Tile outputs -> flat (boxes, scores) in frame coordinates."""
+        dets = outputs[0]
+        offsets = self._tiles[:, [0, 1, 0, 1]].astype(np.float32)
+
+        if dets.shape[-1] == 5:
+            # onnx contains nms module: (B, N, 5) xyxy + score
+            boxes = dets[..., :4] / self._ratios[:, None, None] + offsets[:, None, :]
+            scores = dets[..., 4]
+            valid = scores > 0.3
+            return boxes[valid], scores[valid]
+
+        # raw head output: (B, N, 4 + 1 + num_classes)
+        if self._grids is None:
+            grids, strides = [], []
+            for stride in (8, 16, 32):
+                hsize, wsize = self.model_input_size[0] // stride, self.model_input_size[1] // stride
+                xv, yv = np.meshgrid(np.arange(wsize), np.arange(hsize))
+                grids.append(np.stack((xv, yv), 2).reshape(-1, 2))
+                strides.append(np.full((hsize * wsize, 1), stride))
+            self._grids = (np.concatenate(grids).astype(np.float32), np.concatenate(strides).astype(np.float32))
+        grids, strides = self._grids
+
+        xy = (dets[..., :2] + grids) * strides
+        wh = np.exp(dets[..., 2:4]) * strides
+        scores = dets[..., 4] * dets[..., 5]  # objectness * person class
+        boxes = np.concatenate([xy - wh / 2, xy + wh / 2], axis=-1)
+        boxes = boxes / self._ratios[:, None, None] + offsets[:, None, :]
+
+        valid = scores > self.score_thr
+        return boxes[valid], scores[valid]
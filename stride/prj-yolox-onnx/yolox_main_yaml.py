@@ -14,12 +14,15 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 # Import your modules here
 from yolox_worker import YOLOXWorker
 from contanos.io.rtsp_input_interface import RTSPInput
+from pelpers.latest_frame_input import create_input
 from contanos.io.mqtt_output_interface import MQTTOutput
 from contanos.helpers.create_a_processor import create_a_processor
 from contanos.helpers.start_a_service import start_a_service
 from contanos.utils.create_args import add_argument, add_service_args, add_compute_args
 from contanos.utils.setup_logging import setup_logging
 from contanos.utils.parse_config_string import parse_config_string
+from pelpers.ort_tuning import add_ort_args, ort_config_from_args
+from pelpers.backend_select import resolve_backend
 
 
 def parse_args():
@@ -32,9 +35,22 @@ def parse_args():
     add_argument(parser, 'devices', 'DEVICES', 'cuda:3')
     add_argument(parser, 'model_input_size', 'MODEL_INPUT_SIZE', '640,640')
     add_argument(parser, 'model_url', 'MODEL_URL', 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/yolox_m_8xb8-300e_humanart-c2c7a14a.zip')
+    add_argument(parser, 'max_age_ms', 'MAX_AGE_MS', None)
+    add_argument(parser, 'tile_grid', 'TILE_GRID', None)        # e.g. '2,3' (rows,cols), unset = single pass
+    add_argument(parser, 'tile_overlap', 'TILE_OVERLAP', 0.2)
+    add_argument(parser, 'tile_roi', 'TILE_ROI', None)          # e.g. '0,200,1920,1080' pitch ROI in x1,y1,x2,y2
+    add_argument(parser, 'detect_scale', 'DETECT_SCALE', 1.0)     # e.g. 0.5: detect on a half-resolution frame
+    add_argument(parser, 'detect_every', 'DETECT_EVERY', 1)     # k > 1: detect on keyframes only, ByteTrack predicts in between
+    add_argument(parser, 'adaptive_keyframes', 'ADAPTIVE_KEYFRAMES', False)
+    add_argument(parser, 'pitch_roi', 'PITCH_ROI', None)        # e.g. '80,300,1840,300,1920,1080,0,1080' polygon x,y,...
+    add_argument(parser, 'min_box_size', 'MIN_BOX_SIZE', None)  # e.g. '8,20' w,h in full-frame pixels
+    add_argument(parser, 'max_box_size', 'MAX_BOX_SIZE', None)  # e.g. '300,600'
+    add_argument(parser, 'static_frame_thr', 'STATIC_FRAME_THR', 0)  # e.g. 1.0: re-emit detections on frozen frames
 
     add_service_args(parser)
     add_compute_args(parser)
+    add_ort_args(parser)
+    add_argument(parser, 'backend_cache', 'BACKEND_CACHE', None)  # BACKEND=auto decisions, default ~/.cache/stride
     
     return parser.parse_args()
 
@@ -52,6 +68,28 @@ async def main():
     # Model input size from YAML or CLI
     model_input_size = args.model_input_size.split(',') if isinstance(args.model_input_size, str) else args.model_input_size
     model_input_size = [int(size) for size in model_input_size]
+
+    # Optional tiling mode for small, distant players
+    tile_grid = [int(v) for v in args.tile_grid.split(',')] if args.tile_grid else None
+    tile_roi = [int(v) for v in args.tile_roi.split(',')] if args.tile_roi else None
+    if tile_grid and backend not in ('auto', 'onnxruntime'):
+        raise ValueError(f"TILE_GRID needs BACKEND=onnxruntime (or auto), got BACKEND={backend}")
+
+    # Optional pitch polygon and box size limits
+    pitch_roi = [float(v) for v in args.pitch_roi.split(',')] if args.pitch_roi else None
+    if pitch_roi is not None and (len(pitch_roi) % 2 or len(pitch_roi) < 6):
+        raise ValueError("PITCH_ROI must be at least 3 x,y points: x1,y1,x2,y2,x3,y3,...")
+    pitch_roi = [pitch_roi[i:i + 2] for i in range(0, len(pitch_roi), 2)] if pitch_roi else None
+    min_box_size = [float(v) for v in args.min_box_size.split(',')] if args.min_box_size else None
+    max_box_size = [float(v) for v in args.max_box_size.split(',')] if args.max_box_size else None
+
+    # Optional keyframe mode
+    if isinstance(args.adaptive_keyframes, str):
+        adaptive_keyframes = args.adaptive_keyframes.lower() in ('true', '1', 'yes')
+    elif isinstance(args.adaptive_keyframes, bool):
+        adaptive_keyframes = args.adaptive_keyframes
+    else:
+        raise ValueError("ADAPTIVE_KEYFRAMES must be a boolean or string representing a boolean.")
     
     # Setup logging
     setup_logging(log_level)
@@ -63,6 +101,13 @@ async def main():
     logger.info(f"  devices: {devices}")
     logger.info(f"  model_input_size: {model_input_size}")
     logger.info(f"  backend: {backend}")
+    logger.info(f"  ort_config: {ort_config_from_args(args)}")
+    logger.info(f"  max_age_ms: {args.max_age_ms}")
+    logger.info(f"  tile_grid: {tile_grid}, tile_overlap: {args.tile_overlap}, tile_roi: {tile_roi}")
+    logger.info(f"  detect_scale: {args.detect_scale}")
+    logger.info(f"  detect_every: {args.detect_every}, adaptive_keyframes: {adaptive_keyframes}")
+    logger.info(f"  pitch_roi: {pitch_roi}, min_box_size: {min_box_size}, max_box_size: {max_box_size}")
+    logger.info(f"  static_frame_thr: {args.static_frame_thr}")
     logger.info(f"  log_level: {log_level}")
     
     try:
@@ -70,7 +115,8 @@ async def main():
         out_mqtt_config = parse_config_string(out_mqtt)
         
         # Create input/output interfaces
-        input_interface = RTSPInput(config=in_rtsp_config)
+        # mode=latest in IN_RTSP_URL keeps only the newest frame(s) instead of queuing
+        input_interface = create_input(RTSPInput, in_rtsp_config)
         output_interface = MQTTOutput(config=out_mqtt_config)
         
         await input_interface.initialize()
@@ -82,10 +128,35 @@ async def main():
                 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/yolox_m_8xb8-300e_humanart-c2c7a14a.zip',
             model_input_size=model_input_size,
             backend=backend,
+            max_age_ms=args.max_age_ms,
+            tile_grid=tile_grid,
+            tile_overlap=float(args.tile_overlap),
+            roi=tile_roi,
+            detect_scale=float(args.detect_scale),
+            detect_every=int(args.detect_every),
+            adaptive_keyframes=adaptive_keyframes,
+            pitch_roi=pitch_roi,
+            min_box_size=min_box_size,
+            max_box_size=max_box_size,
+            static_frame_thr=float(args.static_frame_thr),
+            ort_config=ort_config_from_args(args),
         )
 
         # Convert devices string to list if needed
         devices = devices.split(',') if isinstance(devices, str) else [devices]
+
+        # the adaptive keyframe interval is per-worker state, several workers would each follow their own
+        if adaptive_keyframes and int(args.detect_every) > 1 and len(devices) * int(args.num_workers_per_device) > 1:
+            raise ValueError("ADAPTIVE_KEYFRAMES needs a single YOLOX worker (one device, NUM_WORKERS_PER_DEVICE=1)")
+
+        # BACKEND=auto: benchmark the CPU backends once per host and model, then use the cached choice
+        if tile_grid and backend == 'auto':
+            model_config['backend'] = 'onnxruntime'  # TiledYOLOX needs an ONNX Runtime session
+        else:
+            model_config['backend'] = resolve_backend(backend, 'yolox', model_config['onnx_model'],
+                                                      model_input_size, devices=devices,
+                                                      cache_path=args.backend_cache)
+        logger.info(f"  resolved backend: {model_config['backend']}")
         # Create processor with workers
         _, processor = create_a_processor(
             worker_class=YOLOXWorker,
@@ -6,11 +6,18 @@ Reads RTSP frames, runs YOLOX detection, publishes bounding boxes to MQTT.
 import os
 import sys
 from typing import Any, Dict
+import cv2
 import numpy as np
 # sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
 
 from contanos.base_worker import BaseWorker
-from rtmlib.tools.object_detection import YOLOX
+from pelpers.staleness import StalenessGuard
+from pelpers.tiled_yolox import TiledYOLOX
+from pelpers.keyframes import KeyframeScheduler
+from pelpers.ort_tuning import tune_session
+from pelpers.folded_yolox import FoldedYOLOX
+from pelpers.pitch_roi import PitchROI
+from pelpers.frame_change import StaticFrameDetector
 class YOLOXWorker(BaseWorker):
     """YOLOX detection processor with multi-GPU parallel processing."""
     
@@ -22,10 +29,54 @@ class YOLOXWorker(BaseWorker):
                          input_interface, output_interface)
     
     def _model_init(self):
-        self.model = YOLOX(**self.model_config,
-                           device=self.device)  # Use the specific device for this model
+        model_config = dict(self.model_config)
+        self.staleness = StalenessGuard(model_config.pop('max_age_ms', None), name='YOLOX')
+        self.keyframes = KeyframeScheduler(model_config.pop('detect_every', 1),
+                                           adaptive=model_config.pop('adaptive_keyframes', False))
+        # frozen / repeated frames re-emit the last detections instead of running the model
+        self.static_frames = StaticFrameDetector(model_config.pop('static_frame_thr', 0.0))
+        self._last_result = None
+        ort_config = model_config.pop('ort_config', None)
+        # detect on a downscaled frame, boxes are published in that space with scale=detect_scale
+        self.detect_scale = float(model_config.pop('detect_scale', 1.0) or 1.0)
+        # static pitch polygon: detect on its bounding rectangle only, drop boxes whose feet are outside
+        self.pitch_roi = PitchROI(model_config.pop('pitch_roi', None),
+                                  min_box=model_config.pop('min_box_size', None),
+                                  max_box=model_config.pop('max_box_size', None),
+                                  scale=self.detect_scale)
+        if model_config.get('roi') is not None:
+            # TILE_ROI is in full-frame coordinates, the tiler sees the cropped and scaled frame
+            x0, y0 = self.pitch_roi.rect[:2] if self.pitch_roi.rect is not None else (0, 0)
+            model_config['roi'] = [int(round((v - off) * self.detect_scale))
+                                   for v, off in zip(model_config['roi'], (x0, y0, x0, y0))]
+        if model_config.get('tile_grid'):
+            # high-resolution mode: overlapping tiles in one batched run
+            self.model = TiledYOLOX(**model_config, device=self.device)
+        else:
+            for key in ('tile_grid', 'tile_overlap', 'roi'):
+                model_config.pop(key, None)
+            # plain rtmlib YOLOX, plus uint8 input for models from cmds/fold_preprocess.py
+            self.model = FoldedYOLOX(**model_config,
+                               device=self.device)  # Use the specific device for this model
+        tune_session(self.model, ort_config)
         
     def _predict(self, input: Any, metadata: Any=None) -> Any:
+        ts = self.staleness.origin_ts(input, metadata)
+        if self.staleness.expired(ts):
+            return None
+
+        if not self.keyframes.is_keyframe(self.keyframes.frame_id(metadata)):
+            # still published so ByteTrack sees every frame and fills in predicted boxes
+            return {'scale': self.detect_scale, 'bboxes': [], 'det_scores': [], 'classes': [], 'ts': ts,
+                    'keyframe': False}
+
+        if self.static_frames.is_static(input) and self._last_result is not None:
+            return dict(self._last_result, ts=ts, repeated=True)
+
+        input, (x0, y0) = self.pitch_roi.crop(input)
+        if self.detect_scale != 1.0:
+            input = cv2.resize(input, None, fx=self.detect_scale, fy=self.detect_scale,
+                               interpolation=cv2.INTER_AREA)
         model_output = self.model(input)
         
         # Handle the case where model returns only bboxes
@@ -36,4 +87,15 @@ class YOLOXWorker(BaseWorker):
             bboxes = model_output
             det_scores = np.ones(len(bboxes))  # Default confidence scores
 
-        return {'scale': 1, 'bboxes': bboxes, 'det_scores': det_scores, 'classes': [-1] * len(det_scores)}
+        if self.pitch_roi.active:
+            bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+            if x0 or y0:
+                # back from the cropped rectangle to (scaled) frame coordinates
+                bboxes += np.asarray([x0, y0, x0, y0], dtype=np.float32) * self.detect_scale
+            keep = self.pitch_roi.keep(bboxes)
+            bboxes, det_scores = bboxes[keep], np.asarray(det_scores)[keep]
+        self.keyframes.observe(len(det_scores))
+
+        self._last_result = {'scale': self.detect_scale, 'bboxes': bboxes, 'det_scores': det_scores,
+                             'classes': [-1] * len(det_scores), 'ts': ts, 'keyframe': True}
+        return self._last_result
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Linear assignment solvers on ByteTrack cost matrices: lapjv, scipy, greedy, sparse and auto.
+
+The cost matrices are the first-round ByteTrack costs (1 - IoU fused with
+the detection score, thresh 0.8) between consecutive frames of the
+synthetic sequence of test_bytetrack_scaling.py: 'broadcast' is ~22 people
+per 1080p frame, 'crowd' ~88 (fan zone, drills), 'pileup' ~350 (every box
+overlaps several others, worst case for the shortcuts). Prints the median
+time per solve and whether each solver found the lapjv matching; the
+``solve_auto`` policy in boxmot/utils/matching.py is read off this table.
+
+Usage:
+  python test_scripts/test_assignment_solvers.py --counts 10,25,50,100,200,500,1000
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-bytetrack-cpu")))
+
+from boxmot.trackers.bytetrack.vectorized_bytetrack import _fuse_score
+from boxmot.utils.matching import SOLVERS, iou_distance, linear_assignment
+from test_bytetrack_scaling import synthetic_sequence
+
+SCENES = {'broadcast': 22.0, 'crowd': 88.0, 'pileup': 350.0}
+
+
+def cost_matrices(n, pairs, per_frame, seed, sparse=False):
+    sequence = synthetic_sequence(n, pairs + 1, np.random.default_rng(seed), per_frame=per_frame)
+    return [_fuse_score(iou_distance(a[:, :4], b[:, :4], sparse=sparse), b[:, 4])
+            for a, b in zip(sequence[:-1], sequence[1:])]
+
+
+def time_solver(costs, solver, thresh, repeats):
+    times, results = [], []
+    for cost in costs:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            matches, _, _ = linear_assignment(cost, thresh, solver=solver)
+        times.append((time.perf_counter() - start) * 1e6 / repeats)
+        results.append(matches)
+    return float(np.median(times)), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Linear assignment solver comparison")
+    parser.add_argument('--counts', default='10,25,50,100,200,500,1000')
+    parser.add_argument('--scenes', default='broadcast,crowd,pileup')
+    parser.add_argument('--solvers', default='lapjv,scipy,greedy,sparse,auto')
+    parser.add_argument('--pairs', type=int, default=20, help='frame pairs (cost matrices) per size')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--thresh', type=float, default=0.8)
+    parser.add_argument('--max-scipy', type=int, default=500, help='skip scipy above this size (slow)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    solvers = args.solvers.split(',')
+
+    header = " | ".join(f"{name:>12}" for name in solvers)
+    for scene in args.scenes.split(','):
+        print(f"\n{scene}: median us per solve (* = different matching than lapjv)")
+        print(f"{'n':>5} {'conflicts':>9} | {header}")
+        print("-" * (18 + 15 * len(solvers)))
+        for n in (int(v) for v in args.counts.split(',')):
+            costs = cost_matrices(n, args.pairs, SCENES[scene], args.seed)
+            # rows with more than one eligible pair, the part the shortcuts cannot take
+            conflicts = np.mean([((c <= args.thresh).sum(1) > 1).mean() for c in costs])
+            _, reference = time_solver(costs, 'lapjv', args.thresh, 1)
+            cells = []
+            for solver in solvers:
+                if solver == 'scipy' and n > args.max_scipy:
+                    cells.append(f"{'-':>12}")
+                    continue
+                t, results = time_solver(costs, solver, args.thresh, args.repeats)
+                same = all(np.array_equal(a, b) for a, b in zip(results, reference))
+                cells.append(f"{t:>11.0f}{' ' if same else '*'}")
+            print(f"{n:>5} {conflicts:>9.1%} | " + " | ".join(cells))
+
+    print(f"\nsolvers: {sorted(SOLVERS)}")
+
+
+if __name__ == "__main__":
+    main()
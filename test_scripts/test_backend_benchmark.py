@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+CPU inference backend benchmark for YOLOX, RTMPose and the JerseyOCR model.
+
+Loads every model on each available CPU backend (ONNX Runtime, OpenVINO,
+OpenCV DNN; plus PyTorch for JerseyOCR) with pelpers.backend_select, the
+same runner BACKEND=auto uses at service startup, and reports the median
+latency at batch 1 and the throughput at batch N. The JerseyOCR network is
+exported to ONNX first (random weights unless --jerseyocr-weights is given,
+which does not change the timing).
+
+Backends that can't run a model or batch size (e.g. static-batch exports
+on OpenCV DNN) are reported as n/a.
+
+Usage:
+  python test_scripts/test_backend_benchmark.py --batch 16
+  python test_scripts/test_backend_benchmark.py --models rtmpose --rtmpose models/rtmpose_m_int8.onnx --batch 25
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-rtmpose-onnx")))
+
+from pelpers.backend_select import RawRunner, available_backends, resolve_model_path, time_runner
+
+YOLOX_URL = ('https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+             'yolox_m_8xb8-300e_humanart-c2c7a14a.zip')
+RTMPOSE_URL = ('https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+               'rtmpose-m_simcc-body7_pt-body7_420e-256x192-e48f03d0_20230504.zip')
+
+
+def export_jerseyocr(weights, use_small, out_path):
+    """Export JerseyOCRMobileNet with a dynamic batch axis, returns the torch module too."""
+    import importlib.util
+    import torch
+    # 'pelpers' is already the RTMPose package here, load the JerseyOCR architecture by path
+    arch_path = os.path.join(os.path.dirname(__file__), "../stride/prj-jerseyocr-gpu/pelpers/jomn_arch.py")
+    spec = importlib.util.spec_from_file_location('jomn_arch', os.path.abspath(arch_path))
+    jomn_arch = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(jomn_arch)
+    JerseyOCRMobileNet = jomn_arch.JerseyOCRMobileNet
+
+    model = JerseyOCRMobileNet(pretrained=False, use_small=use_small)
+    if weights:
+        checkpoint = torch.load(weights, map_location='cpu')
+        model.load_state_dict(checkpoint["model"] if isinstance(checkpoint, dict) and "model" in checkpoint
+                              else checkpoint)
+    model.eval()
+    torch.onnx.export(model, torch.zeros(1, 3, 256, 192), out_path, input_names=['input'],
+                      output_names=['len_logits', 'd1_logits', 'd2_logits'],
+                      dynamic_axes={'input': {0: 'batch'}}, opset_version=13)
+    return model
+
+
+class TorchRunner:
+    """PyTorch CPU inference with the RawRunner call signature."""
+
+    def __init__(self, model):
+        import torch
+        self.torch = torch
+        self.model = model
+
+    def make_input(self, batch, input_hw, rng):
+        return rng.random((batch, 3) + tuple(input_hw), dtype=np.float32)
+
+    def __call__(self, data):
+        with self.torch.no_grad():
+            return self.model(self.torch.from_numpy(data))
+
+
+def bench(runner, batch, input_hw, rng, repeats):
+    """(batch-1 latency ms, batch-N throughput items/s), None where the backend fails."""
+    results = []
+    for n in (1, batch):
+        try:
+            ms = time_runner(runner, runner.make_input(n, input_hw, rng), repeats)
+            results.append(ms if n == 1 else n * 1000.0 / ms)
+        except Exception as e:
+            print(f"    {getattr(runner, 'backend', 'torch')} batch {n}: {type(e).__name__}: {str(e)[:100]}")
+            results.append(None)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU inference backend benchmark")
+    parser.add_argument('--models', default='yolox,rtmpose,jerseyocr')
+    parser.add_argument('--yolox', default=YOLOX_URL, help='onnx file or rtmlib zip url')
+    parser.add_argument('--yolox-input-size', default='640,640', help='h,w')
+    parser.add_argument('--rtmpose', default=RTMPOSE_URL, help='onnx file or rtmlib zip url')
+    parser.add_argument('--rtmpose-input-size', default='192,256', help='w,h')
+    parser.add_argument('--jerseyocr-weights', default=None)
+    parser.add_argument('--use-small', action='store_true', help='JerseyOCR small backbone')
+    parser.add_argument('--batch', type=int, default=16, help='N for the throughput column')
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    backends = available_backends()
+    wanted = args.models.split(',')
+    print(f"Available CPU backends: {', '.join(backends)}; {os.cpu_count()} CPUs")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = []
+        if 'yolox' in wanted:
+            jobs.append(('yolox', resolve_model_path(args.yolox),
+                         tuple(int(v) for v in args.yolox_input_size.split(',')), None))
+        if 'rtmpose' in wanted:
+            w, h = (int(v) for v in args.rtmpose_input_size.split(','))
+            jobs.append(('rtmpose', resolve_model_path(args.rtmpose), (h, w), None))
+        if 'jerseyocr' in wanted:
+            # JerseyOCR is a PyTorch model in the service, compare it against its own ONNX export
+            try:
+                path = os.path.join(tmp, 'jerseyocr.onnx')
+                torch_model = export_jerseyocr(args.jerseyocr_weights, args.use_small, path)
+                jobs.append(('jerseyocr', path, (256, 192), torch_model))
+            except ImportError as e:
+                print(f"Skipping jerseyocr: {e}")
+
+        for kind, path, input_hw, torch_model in jobs:
+            print(f"\n{kind}: {os.path.basename(path)}, input {input_hw[0]}x{input_hw[1]}")
+            runners = []
+            for backend in backends:
+                try:
+                    runners.append((backend, RawRunner(backend, path)))
+                except Exception as e:
+                    print(f"    {backend}: can't load ({type(e).__name__}: {str(e)[:100]})")
+            if torch_model is not None:
+                runners.append(('torch', TorchRunner(torch_model)))
+            for backend, runner in runners:
+                start = time.perf_counter()
+                latency, throughput = bench(runner, args.batch, input_hw, rng, args.repeats)
+                rows.append((kind, backend, latency, throughput))
+                print(f"    {backend}: done in {time.perf_counter() - start:.1f}s")
+
+    def fmt(value, unit):
+        return f"{value:>9.2f}{unit}" if value is not None else f"{'n/a':>{9 + len(unit)}}"
+
+    print(f"\n{'model':>10} {'backend':>12} | {'batch 1 p50':>13} | {f'batch {args.batch} throughput':>22}")
+    print("-" * 66)
+    for kind, backend, latency, throughput in rows:
+        print(f"{kind:>10} {backend:>12} | {fmt(latency, 'ms'):>13} | {fmt(throughput, ' items/s'):>22}")
+
+    print("\nfastest per model (batch 1 / batch N):")
+    for kind in dict.fromkeys(row[0] for row in rows):
+        lat = [(r[2], r[1]) for r in rows if r[0] == kind and r[2] is not None]
+        thr = [(r[3], r[1]) for r in rows if r[0] == kind and r[3] is not None]
+        print(f"  {kind}: {min(lat)[1] if lat else 'n/a'} / {max(thr)[1] if thr else 'n/a'}")
+    print("\nServices pick this automatically with BACKEND=auto (YOLOX, RTMPose).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+ByteTrack per-frame latency vs. number of tracks: STrack objects vs. TrackStore arrays.
+
+Runs boxmot's ByteTrack (one STrack object per track and per detection)
+and VectorizedByteTrack (struct-of-arrays TrackStore) on the same synthetic
+sequence: N people walking with constant velocity plus jitter, missed and
+low-confidence detections, false positives and people leaving / entering.
+The scene grows with N so the density stays that of a broadcast frame.
+Also checks that both trackers return the same ids and boxes on every frame
+(with --kalman-dtype float32 the arrays tracker runs its Kalman filter in
+single precision and only approximately matches).
+
+Usage:
+  python test_scripts/test_bytetrack_scaling.py --counts 20,50,100,200,500 --frames 300
+"""
+
+import os
+import sys
+import time
+import argparse
+import functools
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-bytetrack-cpu")))
+
+from boxmot.trackers.bytetrack.bytetrack import ByteTrack
+from boxmot.trackers.bytetrack.vectorized_bytetrack import VectorizedByteTrack
+
+
+def synthetic_sequence(n, frames, rng, **kwargs):
+    """List of (M, 6) detection arrays (x1, y1, x2, y2, conf, cls) for ``n`` people."""
+    return list(synthetic_frames(n, frames, rng, **kwargs))
+
+
+def synthetic_frames(n, frames, rng, miss=0.1, low_conf=0.15, false_pos=0.02, turnover=0.005, per_frame=22.0):
+    """Generator version of ``synthetic_sequence``, for sequences too long to keep in memory."""
+    width = height = np.sqrt(n * 1920 * 1080 / per_frame)  # ~22 players on a 1080p frame
+    pos = rng.uniform(0, 1, (n, 2)) * (width, height)
+    vel = rng.normal(0, 2.0, (n, 2))
+    size = np.stack([rng.uniform(20, 45, n), rng.uniform(60, 130, n)], axis=1)
+
+    for _ in range(frames):
+        reborn = rng.random(n) < turnover
+        pos[reborn] = rng.uniform(0, 1, (reborn.sum(), 2)) * (width, height)
+        vel += rng.normal(0, 0.3, (n, 2))
+        pos = np.clip(pos + vel, 0, (width, height))
+
+        seen = rng.random(n) > miss
+        centers = pos[seen] + rng.normal(0, 1.5, (seen.sum(), 2))
+        wh = size[seen] * rng.uniform(0.95, 1.05, (seen.sum(), 2))
+        conf = np.where(rng.random(seen.sum()) < low_conf, rng.uniform(0.15, 0.45, seen.sum()),
+                        rng.uniform(0.5, 0.95, seen.sum()))
+
+        n_fp = rng.binomial(n, false_pos)
+        centers = np.concatenate([centers, rng.uniform(0, 1, (n_fp, 2)) * (width, height)])
+        wh = np.concatenate([wh, rng.uniform(20, 60, (n_fp, 2))])
+        conf = np.concatenate([conf, rng.uniform(0.1, 0.6, n_fp)])
+
+        dets = np.concatenate([centers - wh / 2, centers + wh / 2, conf[:, None], np.zeros((len(conf), 1))], axis=1)
+        yield dets[rng.permutation(len(dets))]
+
+
+def run(tracker_class, sequence, keyframe_every=0):
+    """(per-frame ms list, outputs list) of one pass over the sequence."""
+    tracker = tracker_class()  # own id counter, ids start at 1
+    times, outputs = [], []
+    for i, dets in enumerate(sequence):
+        start = time.perf_counter()
+        if keyframe_every and i % keyframe_every:
+            out = tracker.predict_only()
+        else:
+            out = tracker.update(dets)
+        times.append((time.perf_counter() - start) * 1000.0)
+        outputs.append(np.asarray(out).reshape(-1, 8))
+    return times, outputs
+
+
+def compare(outputs_a, outputs_b):
+    """(identical, max abs box difference) over all frames."""
+    max_diff = 0.0
+    for a, b in zip(outputs_a, outputs_b):
+        if a.shape != b.shape or not np.array_equal(a[:, 4], b[:, 4]):
+            return False, float('nan')
+        max_diff = max(max_diff, float(np.abs(a - b).max(initial=0.0)))
+    return max_diff < 1e-6, max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ByteTrack objects vs. struct-of-arrays scaling")
+    parser.add_argument('--counts', default='20,50,100,200,500')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30, help='frames excluded from the timing (track birth)')
+    parser.add_argument('--keyframe-every', type=int, default=0, help='k > 1: predict_only between keyframes')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--kalman-dtype', default='float64', choices=['float64', 'float32'])
+    args = parser.parse_args()
+
+    print(f"{'tracks':>7} | {'objects p50':>12} {'arrays p50':>11} | {'objects p90':>12} {'arrays p90':>11} | "
+          f"{'speedup':>7} | identical")
+    print("-" * 88)
+    for n in (int(v) for v in args.counts.split(',')):
+        sequence = synthetic_sequence(n, args.frames, np.random.default_rng(args.seed))
+        t_obj, out_obj = run(ByteTrack, sequence, args.keyframe_every)
+        vectorized = functools.partial(VectorizedByteTrack, kalman_dtype=np.dtype(args.kalman_dtype))
+        t_vec, out_vec = run(vectorized, sequence, args.keyframe_every)
+        identical, max_diff = compare(out_obj, out_vec)
+
+        t_obj, t_vec = np.asarray(t_obj[args.warmup:]), np.asarray(t_vec[args.warmup:])
+        print(f"{n:>7} | {np.median(t_obj):>10.2f}ms {np.median(t_vec):>9.2f}ms | "
+              f"{np.percentile(t_obj, 90):>10.2f}ms {np.percentile(t_vec, 90):>9.2f}ms | "
+              f"{np.median(t_obj) / np.median(t_vec):>6.2f}x | {'yes' if identical else 'NO'} "
+              f"(max diff {max_diff:.1e}, {np.mean([len(o) for o in out_vec]):.0f} tracks/frame)")
+
+
+if __name__ == "__main__":
+    main()
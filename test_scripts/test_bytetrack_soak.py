@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+ByteTrack soak test: RSS, per-frame latency and track list sizes over a long synthetic match.
+
+Feeds one tracker a synthetic sequence of --minutes at --fps (90 minutes,
+30 fps = 162k frames by default) with players leaving / entering and false
+positives, so tens of thousands of tracks are born and removed. Prints one
+line per --window minutes: process RSS, p50 / p99 latency of the window and
+``tracker.memory_stats()``. With bounded track retention every column stays
+flat; a growing removed list shows up as rising RSS and latency.
+
+Usage:
+  python test_scripts/test_bytetrack_soak.py --tracker arrays --minutes 90
+  python test_scripts/test_bytetrack_soak.py --tracker objects --minutes 20 --turnover 0.02
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-bytetrack-cpu")))
+
+from boxmot.trackers.bytetrack.bytetrack import ByteTrack
+from boxmot.trackers.bytetrack.vectorized_bytetrack import VectorizedByteTrack
+from pelpers.memory_stats import rss_mb
+from test_bytetrack_scaling import synthetic_frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ByteTrack memory / latency soak test")
+    parser.add_argument('--tracker', default='arrays', choices=['arrays', 'objects'])
+    parser.add_argument('--people', type=int, default=22)
+    parser.add_argument('--minutes', type=float, default=90)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--window', type=float, default=5, help='minutes per report line')
+    parser.add_argument('--turnover', type=float, default=0.005, help='per-frame probability a person is replaced')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    frames = int(args.minutes * 60 * args.fps)
+    window = max(int(args.window * 60 * args.fps), 1)
+    tracker = VectorizedByteTrack() if args.tracker == 'arrays' else ByteTrack()
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{args.tracker}: {args.people} people, {frames} frames, report every {window} frames")
+    print(f"{'minute':>7} | {'rss MB':>8} | {'p50 ms':>7} {'p99 ms':>7} | {'ids':>7} | memory_stats")
+    print("-" * 90)
+    start_rss = rss_mb()
+    times = []
+    for i, dets in enumerate(synthetic_frames(args.people, frames, rng, turnover=args.turnover)):
+        start = time.perf_counter()
+        tracker.update(dets)
+        times.append((time.perf_counter() - start) * 1000.0)
+        if (i + 1) % window == 0 or i + 1 == frames:
+            p50, p99 = np.percentile(times, [50, 99])
+            rss = rss_mb()
+            print(f"{(i + 1) / args.fps / 60:>7.1f} | {rss:>8.1f} | {p50:>7.2f} {p99:>7.2f} | "
+                  f"{tracker.id_counter.count:>7} | {tracker.memory_stats()}")
+            times = []
+    print(f"RSS growth: {rss_mb() - start_rss:+.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
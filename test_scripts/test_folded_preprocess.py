@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Original vs folded-preprocessing YOLOX / RTMPose: host time, session time and output drift.
+
+Runs both models through the same classes the workers use (FoldedYOLOX /
+BatchedRTMPose, which detect the uint8 input of a folded model) and times
+the host-side preprocessing (letterbox or affine warp, plus the cast /
+normalize / transpose that folding removes) and the session run
+separately. Also prints the max abs difference of the raw model outputs,
+which should be float32 rounding only.
+
+Frames come from --video or are random. Folded models come from
+cmds/fold_preprocess.py.
+
+Usage:
+  python test_scripts/test_folded_preprocess.py --kind yolox --folded models/yolox_m_folded.onnx
+  python test_scripts/test_folded_preprocess.py --kind rtmpose --folded models/rtmpose_m_folded.onnx \
+      --video capture.mp4 --persons 25
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+KIND_DIRS = {'yolox': 'prj-yolox-onnx', 'rtmpose': 'prj-rtmpose-onnx'}
+DEFAULT_MODELS = {
+    'yolox': 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+             'yolox_m_8xb8-300e_humanart-c2c7a14a.zip',
+    'rtmpose': 'https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+               'rtmpose-m_simcc-body7_pt-body7_420e-256x192-e48f03d0_20230504.zip',
+}
+
+
+def load_frames(video, count, rng):
+    if video is None:
+        return [rng.integers(0, 256, (1080, 1920, 3), dtype=np.uint8) for _ in range(count)]
+    frames = []
+    cap = cv2.VideoCapture(video)
+    while len(frames) < count:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def random_boxes(frame, count, rng):
+    h, w = frame.shape[:2]
+    x1 = rng.uniform(0, w - 80, count)
+    y1 = rng.uniform(0, h - 200, count)
+    bw = rng.uniform(30, 80, count)
+    bh = rng.uniform(80, 200, count)
+    return np.stack([x1, y1, x1 + bw, y1 + bh], axis=1).astype(np.float32)
+
+
+def yolox_steps(model, frame):
+    """(host ms, session ms, outputs) of one YOLOX frame."""
+    start = time.perf_counter()
+    img, _ = model.preprocess(frame)
+    if not model._folded:
+        # what rtmlib's inference does before session.run
+        tensor = np.ascontiguousarray(img.transpose(2, 0, 1), dtype=np.float32)[None]
+        feed = {model.session.get_inputs()[0].name: tensor}
+    else:
+        feed = {model.session.get_inputs()[0].name: img[None]}
+    host = time.perf_counter()
+    outputs = model.session.run(None, feed)
+    return (host - start) * 1000.0, (time.perf_counter() - host) * 1000.0, outputs
+
+
+def rtmpose_steps(model, frame, boxes):
+    """(host ms, session ms, outputs) of one RTMPose frame."""
+    from pelpers.crop_transport import crop_layout
+    start = time.perf_counter()
+    centers, scales = crop_layout(boxes, model.model_input_size, model.padding)
+    batch = model._preprocess(frame, centers, scales)
+    host = time.perf_counter()
+    outputs = model._inference(batch)
+    return (host - start) * 1000.0, (time.perf_counter() - host) * 1000.0, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Folded vs host preprocessing benchmark")
+    parser.add_argument('--kind', choices=tuple(KIND_DIRS), required=True)
+    parser.add_argument('--model', default=None, help='original onnx file or rtmlib zip url')
+    parser.add_argument('--folded', required=True, help='output of cmds/fold_preprocess.py')
+    parser.add_argument('--video', default=None)
+    parser.add_argument('--frames', type=int, default=50)
+    parser.add_argument('--persons', type=int, default=25, help='RTMPose boxes per frame')
+    parser.add_argument('--input-size', default=None, help='YOLOX h,w (640,640) or RTMPose w,h (192,256)')
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride", KIND_DIRS[args.kind])))
+    rng = np.random.default_rng(0)
+    frames = load_frames(args.video, args.frames, rng)
+    model_path = args.model or DEFAULT_MODELS[args.kind]
+
+    if args.kind == 'yolox':
+        from pelpers.folded_yolox import FoldedYOLOX
+        input_size = tuple(int(v) for v in (args.input_size or '640,640').split(','))
+        models = {name: FoldedYOLOX(path, model_input_size=input_size, backend='onnxruntime', device='cpu')
+                  for name, path in (('original', model_path), ('folded', args.folded))}
+        steps = {name: (lambda m: lambda frame, boxes: yolox_steps(m, frame))(m) for name, m in models.items()}
+    else:
+        from pelpers.batched_rtmpose import BatchedRTMPose
+        input_size = tuple(int(v) for v in (args.input_size or '192,256').split(','))
+        models = {name: BatchedRTMPose(path, model_input_size=input_size, backend='onnxruntime', device='cpu')
+                  for name, path in (('original', model_path), ('folded', args.folded))}
+        steps = {name: (lambda m: lambda frame, boxes: rtmpose_steps(m, frame, boxes))(m)
+                 for name, m in models.items()}
+    if not models['folded']._folded:
+        raise SystemExit(f"{args.folded} does not take uint8 input, export it with cmds/fold_preprocess.py")
+
+    boxes = [random_boxes(frame, args.persons, rng) for frame in frames]
+    for step in steps.values():
+        step(frames[0], boxes[0])  # warmup
+
+    timings = {name: ([], []) for name in steps}
+    max_diff = 0.0
+    for frame, frame_boxes in zip(frames, boxes):
+        outputs = {}
+        for name, step in steps.items():
+            host_ms, session_ms, outputs[name] = step(frame, frame_boxes)
+            timings[name][0].append(host_ms)
+            timings[name][1].append(session_ms)
+        for a, b in zip(outputs['original'], outputs['folded']):
+            if a.shape == b.shape:
+                max_diff = max(max_diff, float(np.abs(a - b).max(initial=0.0)))
+
+    print(f"\n{args.kind}, {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}"
+          + (f", {args.persons} persons" if args.kind == 'rtmpose' else ''))
+    print(f"{'model':>10} | {'host p50':>9} {'session p50':>12} {'total p50':>10}")
+    print("-" * 50)
+    totals = {}
+    for name, (host, session) in timings.items():
+        totals[name] = float(np.median(np.asarray(host) + np.asarray(session)))
+        print(f"{name:>10} | {np.median(host):>7.2f}ms {np.median(session):>10.2f}ms {totals[name]:>8.2f}ms")
+    print(f"\nspeedup {totals['original'] / totals['folded']:.2f}x, max abs output difference {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
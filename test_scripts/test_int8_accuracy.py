@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+INT8 vs FP32 YOLOX / RTMPose on a recorded clip: speedup and accuracy loss.
+
+Detection: ms/frame of both detectors, AP@0.5 of the INT8 detector with the
+FP32 detections as reference and, if a MOT-format gt.txt is given, AP@0.5 of
+both against the ground truth.
+Pose: both pose models run on the same boxes (FP32 detections, or gt boxes)
+through BatchedRTMPose like the worker does; reports ms/frame, mean keypoint
+error in px and normalized by the box diagonal, and PCK@0.05 of INT8 vs FP32.
+
+Either model pair can be left out. Models come from cmds/quantize_int8.py.
+
+Usage:
+  python test_scripts/test_int8_accuracy.py --video capture.mp4 --frames 300 \
+      --yolox-int8 models/yolox_m_int8.onnx --rtmpose-int8 models/rtmpose_m_int8.onnx
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-rtmpose-onnx")))
+
+from rtmlib.tools.object_detection import YOLOX
+from pelpers.batched_rtmpose import BatchedRTMPose
+
+YOLOX_FP32 = ('https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+              'yolox_m_8xb8-300e_humanart-c2c7a14a.zip')
+RTMPOSE_FP32 = ('https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+                'rtmpose-m_simcc-body7_pt-body7_420e-256x192-e48f03d0_20230504.zip')
+
+
+def load_mot_gt(path):
+    """frame -> (N, 4) xyxy boxes."""
+    gt = defaultdict(list)
+    data = np.loadtxt(path, delimiter=',', ndmin=2)
+    for row in data:
+        frame, x, y, w, h = int(row[0]), row[2], row[3], row[4], row[5]
+        gt[frame].append([x, y, x + w, y + h])
+    return {k: np.asarray(v, dtype=np.float32) for k, v in gt.items()}
+
+
+def split_output(output):
+    """rtmlib versions return either boxes or (boxes, scores)."""
+    if isinstance(output, tuple):
+        boxes, scores = output
+    else:
+        boxes, scores = output, np.ones(len(output))
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4), np.asarray(scores, dtype=np.float32).reshape(-1)
+
+
+def iou_matrix(a, b):
+    iw = np.clip(np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    ih = np.clip(np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    inter = iw * ih
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def average_precision(frames, iou_thr=0.5):
+    """VOC all-point AP over [(det_boxes, det_scores, ref_boxes), ...]."""
+    tp, scores, n_ref = [], [], 0
+    for det_boxes, det_scores, ref_boxes in frames:
+        n_ref += len(ref_boxes)
+        order = np.argsort(-det_scores)
+        used = np.zeros(len(ref_boxes), dtype=bool)
+        ious = iou_matrix(det_boxes[order], ref_boxes) if len(ref_boxes) else None
+        for rank, d in enumerate(order):
+            hit = False
+            if ious is not None:
+                cand = np.where(~used, ious[rank], 0.0)
+                best = int(np.argmax(cand))
+                if cand[best] >= iou_thr:
+                    used[best] = hit = True
+            tp.append(hit)
+            scores.append(det_scores[d])
+    if n_ref == 0 or not tp:
+        return float('nan')
+
+    order = np.argsort(-np.asarray(scores), kind='stable')
+    tp = np.asarray(tp)[order]
+    cum_tp = np.cumsum(tp)
+    recall = cum_tp / n_ref
+    precision = cum_tp / np.arange(1, len(tp) + 1)
+    precision = np.maximum.accumulate(precision[::-1])[::-1]
+    recall = np.concatenate([[0.0], recall])
+    return float(np.sum((recall[1:] - recall[:-1]) * precision))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - start) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 vs FP32 speed and accuracy")
+    parser.add_argument('--video', required=True)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--gt', default=None, help='MOT-format gt.txt, 1-indexed frames')
+    parser.add_argument('--yolox-fp32', default=YOLOX_FP32)
+    parser.add_argument('--yolox-int8', default=None)
+    parser.add_argument('--rtmpose-fp32', default=RTMPOSE_FP32)
+    parser.add_argument('--rtmpose-int8', default=None)
+    parser.add_argument('--det-input-size', default='640,640', help='h,w')
+    parser.add_argument('--pose-input-size', default='192,256', help='w,h')
+    args = parser.parse_args()
+
+    det_size = tuple(int(v) for v in args.det_input_size.split(','))
+    pose_size = tuple(int(v) for v in args.pose_input_size.split(','))
+    gt = load_mot_gt(args.gt) if args.gt else None
+
+    frames = []
+    cap = cv2.VideoCapture(args.video)
+    while len(frames) < args.frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    print(f"Loaded {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    det_fp32 = YOLOX(args.yolox_fp32, model_input_size=det_size, backend='onnxruntime', device='cpu')
+    det_int8 = YOLOX(args.yolox_int8, model_input_size=det_size, backend='onnxruntime', device='cpu') \
+        if args.yolox_int8 else None
+    pose_fp32 = BatchedRTMPose(args.rtmpose_fp32, model_input_size=pose_size, backend='onnxruntime', device='cpu') \
+        if args.rtmpose_int8 else None
+    pose_int8 = BatchedRTMPose(args.rtmpose_int8, model_input_size=pose_size, backend='onnxruntime', device='cpu') \
+        if args.rtmpose_int8 else None
+
+    for model in filter(None, (det_fp32, det_int8)):
+        model(frames[0])  # warmup
+
+    det_ms = defaultdict(list)
+    pose_ms = defaultdict(list)
+    vs_fp32, vs_gt_fp32, vs_gt_int8 = [], [], []
+    kpt_err, kpt_err_norm, pck = [], [], []
+
+    for idx, frame in enumerate(frames):
+        (boxes32, scores32), ms = timed(lambda f: split_output(det_fp32(f)), frame)
+        det_ms['fp32'].append(ms)
+        gt_boxes = gt.get(idx + 1, np.zeros((0, 4), np.float32)) if gt is not None else None
+
+        if det_int8 is not None:
+            (boxes8, scores8), ms = timed(lambda f: split_output(det_int8(f)), frame)
+            det_ms['int8'].append(ms)
+            vs_fp32.append((boxes8, scores8, boxes32))
+            if gt_boxes is not None:
+                vs_gt_int8.append((boxes8, scores8, gt_boxes))
+        if gt_boxes is not None:
+            vs_gt_fp32.append((boxes32, scores32, gt_boxes))
+
+        pose_boxes = gt_boxes if gt_boxes is not None else boxes32
+        if pose_int8 is not None and len(pose_boxes):
+            (k32, _), ms = timed(pose_fp32, frame, pose_boxes)
+            pose_ms['fp32'].append(ms)
+            (k8, _), ms = timed(pose_int8, frame, pose_boxes)
+            pose_ms['int8'].append(ms)
+
+            err = np.linalg.norm(k8 - k32, axis=-1)  # (N, K) px
+            diag = np.linalg.norm(pose_boxes[:, 2:4] - pose_boxes[:, 0:2], axis=1)[:, None]
+            kpt_err.append(err.ravel())
+            kpt_err_norm.append((err / diag).ravel())
+            pck.append((err <= 0.05 * diag).ravel())
+
+    print("\nDetection (YOLOX)")
+    fp32_ms = np.median(det_ms['fp32'])
+    print(f"  FP32: {fp32_ms:.1f} ms/frame")
+    if det_int8 is not None:
+        int8_ms = np.median(det_ms['int8'])
+        print(f"  INT8: {int8_ms:.1f} ms/frame ({fp32_ms / int8_ms:.2f}x)")
+        print(f"  AP@0.5 INT8 vs FP32 detections: {average_precision(vs_fp32):.4f}")
+    if gt is not None:
+        print(f"  AP@0.5 vs gt: FP32 {average_precision(vs_gt_fp32):.4f}", end='')
+        print(f", INT8 {average_precision(vs_gt_int8):.4f}" if det_int8 is not None else '')
+
+    if pose_int8 is not None and pose_ms['fp32']:
+        fp32_ms, int8_ms = np.median(pose_ms['fp32']), np.median(pose_ms['int8'])
+        kpt_err = np.concatenate(kpt_err)
+        print(f"\nPose (RTMPose, {len(kpt_err)} keypoints)")
+        print(f"  FP32: {fp32_ms:.1f} ms/frame")
+        print(f"  INT8: {int8_ms:.1f} ms/frame ({fp32_ms / int8_ms:.2f}x)")
+        print(f"  keypoint error INT8 vs FP32: mean {kpt_err.mean():.2f} px, median {np.median(kpt_err):.2f} px, "
+              f"normalized {np.concatenate(kpt_err_norm).mean():.4f}")
+        print(f"  PCK@0.05 INT8 vs FP32: {np.concatenate(pck).mean():.4f}")
+
+
+if __name__ == "__main__":
+    main()
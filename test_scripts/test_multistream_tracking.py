@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Multi-camera ByteTrack: one tracker per stream, streams sharded over replicas by consistent hashing.
+
+Feeds --streams synthetic cameras (the sequence of test_bytetrack_scaling.py,
+a different seed each), interleaved frame by frame as they arrive on the
+shared topic, through the worker's StreamTrackers, and checks:
+  * isolation: every stream gets exactly the ids and boxes of a tracker
+    that only ever saw that stream (ids from 1, per-tracker id counters);
+  * input order: the same interleaving, with every camera numbering its
+    frames FRAME:1.. and neighbouring messages swapped as on a busy
+    broker, read through the service's ORDER_BY=stream input
+    (StreamOrderedInput) comes out in frame order per stream and tracks
+    the same as above;
+  * sharding: how many streams each of --shards replicas owns, and how
+    many streams move when one replica is added;
+  * warm restart: with snapshots every --snapshot-every frames, a replica
+    restarted at --restart-at restores all of its streams up front
+    (restore_all) and continues with the ids and boxes of an uninterrupted run;
+  * throughput: --shards processes, each reading every message and keeping
+    only its own streams (as the replicas do), vs. the camera frame rate.
+
+Usage:
+  python test_scripts/test_multistream_tracking.py --streams 16 --people 22 --frames 600 --shards 1,2,4
+  python test_scripts/test_multistream_tracking.py --snapshot-every 100 --restart-at 350
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import functools
+import multiprocessing
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-bytetrack-cpu")))
+
+from boxmot.trackers.bytetrack.vectorized_bytetrack import VectorizedByteTrack
+from pelpers.stream_ordered_input import StreamOrderedInput, frame_number
+from pelpers.stream_trackers import ConsistentHashRing, StreamTrackers, stream_id_of
+from test_bytetrack_scaling import compare, run, synthetic_sequence
+
+
+def camera_sequences(args):
+    """{stream id: list of detection arrays}."""
+    return {f"cam{i}": synthetic_sequence(args.people, args.frames, np.random.default_rng(args.seed + i))
+            for i in range(args.streams)}
+
+
+def arrivals(sequences, seed):
+    """(stream id, frame index) in topic order: cameras interleave, each camera's frames stay in order."""
+    rng = np.random.default_rng(seed)
+    names = list(sequences)
+    order = np.repeat(np.arange(len(names)), [len(sequences[name]) for name in names])
+    rng.shuffle(order)
+    position = dict.fromkeys(names, 0)
+    for i in order:
+        name = names[i]
+        yield name, position[name]
+        position[name] += 1
+
+
+class TopicInput:
+    """Stands in for MQTTInput: replays (input, metadata) messages, then times out like an ended stream."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    async def initialize(self):
+        return True
+
+    async def read_data(self):
+        await asyncio.sleep(0)
+        if not self.messages:
+            raise TimeoutError("no more messages")
+        return self.messages.pop(0)
+
+
+def topic_messages(sequences, seed, swap=0.3):
+    """Messages of ``arrivals`` with overlapping FRAME:n ids per camera, a share ``swap`` of neighbours swapped."""
+    messages = [({'results': {'dets': sequences[name][i]}}, {'frame_id_str': f"{name}-FRAME:{i + 1}"})
+                for name, i in arrivals(sequences, seed)]
+    rng = np.random.default_rng(seed + 1)
+    for j in np.flatnonzero(rng.random(len(messages) - 1) < swap):
+        messages[j], messages[j + 1] = messages[j + 1], messages[j]
+    return messages
+
+
+async def read_ordered(messages):
+    """Every message read through StreamOrderedInput, in release order, plus its late/skipped counts."""
+    input_interface = StreamOrderedInput(TopicInput(messages), queue_max_len=len(messages) + 1)
+    await input_interface.initialize()
+    released = []
+    try:
+        while True:
+            released.append(await input_interface.read_data())
+    except TimeoutError:
+        pass
+    await input_interface.cleanup()
+    return released, input_interface.late_count, input_interface.skipped_count
+
+
+def replica(shard_index, shards, args):
+    """(frames tracked, seconds) of one replica over the whole topic."""
+    sequences = camera_sequences(args)
+    ring = ConsistentHashRing(shards)
+    streams = StreamTrackers(VectorizedByteTrack)
+    tracked = 0
+    start = time.perf_counter()
+    for name, i in arrivals(sequences, args.seed):
+        if ring.shard(name) != shard_index:
+            continue
+        streams.get(name).tracker.update(sequences[name][i])
+        tracked += 1
+    return tracked, time.perf_counter() - start
+
+
+def warm_restart(sequences, args, shards=2):
+    """(streams restored, restore ms, identical) for replica 0 of ``shards`` restarted at --restart-at."""
+    ring = ConsistentHashRing(shards)
+    owned = [name for name in sequences if ring.shard(name) == 0]
+    with tempfile.TemporaryDirectory() as directory:
+        streams = StreamTrackers(VectorizedByteTrack, directory, args.snapshot_every)
+        for name, i in arrivals(sequences, args.seed):
+            if name in owned and i < args.restart_at:
+                stream = streams.get(name)
+                stream.snapshots.record(stream.tracker, True, sequences[name][i])
+                stream.tracker.update(sequences[name][i])
+                stream.snapshots.maybe_save(stream.tracker)
+        for stream in streams.streams.values():
+            stream.snapshots.close()
+
+        # new process: nothing but the files on disk
+        start = time.perf_counter()
+        streams = StreamTrackers(VectorizedByteTrack, directory, args.snapshot_every)
+        restored = streams.restore_all(lambda stream_id: ring.shard(stream_id) == 0)
+        restore_ms = (time.perf_counter() - start) * 1000.0
+        identical = all(compare(run(VectorizedByteTrack, sequences[name])[1][args.restart_at:],
+                                [np.asarray(streams.get(name).tracker.update(dets)).reshape(-1, 8)
+                                 for dets in sequences[name][args.restart_at:]])[0] for name in owned)
+        for stream in streams.streams.values():
+            stream.snapshots.close()
+    return restored, len(owned), restore_ms, identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description="multi-stream ByteTrack with consistent-hash sharding")
+    parser.add_argument('--streams', type=int, default=16)
+    parser.add_argument('--people', type=int, default=22, help='people per camera')
+    parser.add_argument('--frames', type=int, default=600, help='frames per camera')
+    parser.add_argument('--fps', type=float, default=30.0, help='camera frame rate to keep up with')
+    parser.add_argument('--shards', default='1,2,4')
+    parser.add_argument('--snapshot-every', type=int, default=300, help='frames between snapshots (SNAPSHOT_EVERY)')
+    parser.add_argument('--restart-at', type=int, default=500, help='frame at which the replica restarts')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    sequences = camera_sequences(args)
+
+    # isolation: interleaved through StreamTrackers == every camera on its own tracker
+    streams = StreamTrackers(VectorizedByteTrack)
+    outputs = {name: [] for name in sequences}
+    for name, i in arrivals(sequences, args.seed):
+        outputs[name].append(np.asarray(streams.get(name).tracker.update(sequences[name][i])).reshape(-1, 8))
+    isolated = all(compare(run(VectorizedByteTrack, sequences[name])[1], outputs[name])[0] for name in sequences)
+    print(f"{args.streams} streams interleaved, same ids and boxes as one tracker per camera: "
+          f"{'yes' if isolated else 'NO'} (last ids: "
+          f"{', '.join(str(streams.get(name).tracker.id_counter.count) for name in list(sequences)[:4])}, ...)")
+
+    # input order: overlapping frame ids, locally reordered, through the ORDER_BY=stream input
+    released, late, skipped = asyncio.run(read_ordered(topic_messages(sequences, args.seed)))
+    streams = StreamTrackers(VectorizedByteTrack)
+    frames = {name: [] for name in sequences}
+    outputs = {name: [] for name in sequences}
+    for input, metadata in released:
+        name = stream_id_of(input, metadata)
+        frames[name].append(frame_number(metadata))
+        outputs[name].append(np.asarray(streams.get(name).tracker.update(input['results']['dets'])).reshape(-1, 8))
+    in_order = all(frames[name] == list(range(1, args.frames + 1)) for name in sequences)
+    ordered = in_order and all(compare(run(VectorizedByteTrack, sequences[name])[1], outputs[name])[0]
+                               for name in sequences)
+    print(f"{len(released)} messages with overlapping FRAME:n ids through StreamOrderedInput: every stream in "
+          f"frame order: {'yes' if in_order else 'NO'} ({late} late, {skipped} skipped), "
+          f"same ids and boxes: {'yes' if ordered else 'NO'}")
+
+    # warm restart: every owned stream restored before its next frame
+    restored, owned, restore_ms, identical = warm_restart(sequences, args)
+    print(f"restart of replica 0/2 at frame {args.restart_at}: {restored}/{owned} streams restored up front "
+          f"in {restore_ms:.0f} ms, same ids and boxes afterwards: {'yes' if identical else 'NO'}")
+
+    # sharding: streams per replica and streams moved by one more replica
+    for shards in (int(v) for v in args.shards.split(',')):
+        ring, grown = ConsistentHashRing(shards), ConsistentHashRing(shards + 1)
+        owned = np.bincount([ring.shard(name) for name in sequences], minlength=shards)
+        moved = sum(ring.shard(name) != grown.shard(name) for name in sequences)
+        print(f"{shards} replica(s): streams per replica {owned.tolist()}, {moved} move with {shards + 1} replicas")
+
+    print(f"\n{os.cpu_count()} CPUs (replicas beyond that share cores)")
+    print(f"{'replicas':>8} | {'wall s':>7} | {'frames/s':>9} | {'needed':>7} | {'slowest replica ms/frame':>24}")
+    print("-" * 70)
+    needed = args.streams * args.fps
+    total = args.streams * args.frames
+    for shards in (int(v) for v in args.shards.split(',')):
+        start = time.perf_counter()
+        with multiprocessing.Pool(shards) as pool:
+            results = pool.map(functools.partial(replica, shards=shards, args=args), range(shards))
+        wall = time.perf_counter() - start
+        # the busiest replica sets the pace, process start and sequence setup are not tracking
+        frames, seconds = max(results, key=lambda r: r[1])
+        print(f"{shards:>8} | {wall:>7.2f} | {total / seconds:>9.0f} | {needed:>7.0f} | "
+              f"{seconds * 1000.0 / max(frames, 1):>24.2f}")
+
+
+if __name__ == "__main__":
+    main()
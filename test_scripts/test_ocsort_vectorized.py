@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+OcSort per-frame latency vs. number of tracks: KalmanBoxTracker objects vs. OcSortTrackStore arrays.
+
+Runs boxmot's OcSort (one KalmanBoxTracker / KalmanFilterXYSR per track)
+and VectorizedOcSort (stacked filter state) on the same detections and
+checks that both return exactly the same ids and boxes on every frame.
+Detections are the synthetic sequence of test_bytetrack_scaling.py, or a
+recorded one: an .npz with one (M, 6) x1, y1, x2, y2, conf, cls array per
+frame, in key order (``np.savez(path, *frames)``).
+
+Usage:
+  python test_scripts/test_ocsort_vectorized.py --counts 20,50,100,200 --frames 300
+  python test_scripts/test_ocsort_vectorized.py --sequence match.npz --use-byte
+"""
+
+import os
+import sys
+import time
+import argparse
+import functools
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-bytetrack-cpu")))
+
+from boxmot.trackers.ocsort.ocsort import OcSort
+from boxmot.trackers.ocsort.vectorized_ocsort import VectorizedOcSort
+from boxmot.utils.iou import AssociationFunction
+from test_bytetrack_scaling import synthetic_sequence
+
+
+def reference_ocsort(**kwargs):
+    """OcSort with the association function setup_decorator would build from a frame of its w x h."""
+    tracker = OcSort(**kwargs)
+    tracker.asso_func = AssociationFunction(w=tracker.w, h=tracker.h, asso_mode=tracker.asso_func_name).asso_func
+    return tracker
+
+
+def run(tracker_class, sequence):
+    """(per-frame ms list, outputs list) of one pass over the sequence."""
+    tracker = tracker_class()  # resets the KalmanBoxTracker id counter
+    times, outputs = [], []
+    for dets in sequence:
+        start = time.perf_counter()
+        out = tracker.update(dets)
+        times.append((time.perf_counter() - start) * 1000.0)
+        outputs.append(np.asarray(out).reshape(-1, 8))
+    return times, outputs
+
+
+def first_difference(outputs_a, outputs_b):
+    """Index of the first frame whose outputs differ in any bit, or None."""
+    for i, (a, b) in enumerate(zip(outputs_a, outputs_b)):
+        if a.shape != b.shape or not np.array_equal(a, b, equal_nan=True):
+            return i
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OcSort objects vs. stacked state")
+    parser.add_argument('--counts', default='20,50,100,200')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--sequence', default=None, help='recorded detections (.npz), replaces --counts')
+    parser.add_argument('--miss', type=float, default=0.1, help='synthetic: per-frame missed detection rate')
+    parser.add_argument('--use-byte', action='store_true')
+    parser.add_argument('--warmup', type=int, default=30, help='frames excluded from the timing (track birth)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.sequence:
+        with np.load(args.sequence) as data:
+            sequences = [('recorded', [data[key] for key in data.files])]
+    else:
+        sequences = [(n, synthetic_sequence(n, args.frames, np.random.default_rng(args.seed), miss=args.miss))
+                     for n in (int(v) for v in args.counts.split(','))]
+
+    print(f"{'people':>8} | {'objects p50':>12} {'arrays p50':>11} | {'objects p90':>12} {'arrays p90':>11} | "
+          f"{'speedup':>7} | identical")
+    print("-" * 88)
+    for name, sequence in sequences:
+        t_obj, out_obj = run(functools.partial(reference_ocsort, use_byte=args.use_byte), sequence)
+        t_vec, out_vec = run(functools.partial(VectorizedOcSort, use_byte=args.use_byte), sequence)
+        diff = first_difference(out_obj, out_vec)
+
+        t_obj, t_vec = np.asarray(t_obj[args.warmup:]), np.asarray(t_vec[args.warmup:])
+        print(f"{name:>8} | {np.median(t_obj):>10.2f}ms {np.median(t_vec):>9.2f}ms | "
+              f"{np.percentile(t_obj, 90):>10.2f}ms {np.percentile(t_vec, 90):>9.2f}ms | "
+              f"{np.median(t_obj) / np.median(t_vec):>6.2f}x | "
+              f"{'yes' if diff is None else f'NO (frame {diff})'} "
+              f"({np.mean([len(o) for o in out_vec]):.0f} tracks/frame)")
+
+
+if __name__ == "__main__":
+    main()
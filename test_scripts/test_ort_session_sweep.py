@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Sweep ONNX Runtime session settings for a model on this host and print the best one.
+
+Tries every combination of graph optimization level, execution mode,
+intra-/inter-op thread counts, CPU memory arena and CPU I/O binding
+(pelpers.ort_tuning, the same code the YOLOX / RTMPose workers use) on a
+random input, and prints the median latency of each setting plus the
+fastest one as ORT_* / IO_BINDING environment lines for docker-compose.
+First checks that I/O binding returns the same outputs as a plain session
+when the outputs of --chunks runs are kept and concatenated (as the
+batched RTMPose chunks and the YOLOX tiles do).
+
+Usage:
+  python test_scripts/test_ort_session_sweep.py --model yolox_m.onnx --batch 1
+  python test_scripts/test_ort_session_sweep.py --model <rtmpose url> --batch 25 --threads 1,2,4,8
+"""
+
+import os
+import sys
+import time
+import argparse
+import itertools
+
+import numpy as np
+import onnxruntime as ort
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-yolox-onnx")))
+
+from pelpers.ort_tuning import BoundSession, session_options
+
+
+def resolve_model(path_or_url):
+    if os.path.exists(path_or_url):
+        return path_or_url
+    from rtmlib.tools.file import download_checkpoint
+    return download_checkpoint(path_or_url)
+
+
+def random_input(session, batch, input_size, rng):
+    """Random float32 input, symbolic dims filled from --batch / --input-size (h,w)."""
+    shape = list(session.get_inputs()[0].shape)
+    defaults = [batch, 3, input_size[0], input_size[1]]
+    shape = [d if isinstance(d, int) and d > 0 else defaults[i] for i, d in enumerate(shape)]
+    return rng.random(shape, dtype=np.float32) * 255.0
+
+
+def time_session(session, input_name, data, repeats, warmup=3):
+    for _ in range(warmup):
+        session.run(None, {input_name: data})
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        session.run(None, {input_name: data})
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return float(np.median(samples)), float(np.percentile(samples, 90))
+
+
+def check_bound_outputs(model, input_name, data, chunks, rng):
+    """BoundSession as the workers run it (outputs reused, chunk / tile loops copy what they keep) vs. a
+    plain session: (outputs reused across runs, concatenated outputs identical, max diff)."""
+    plain = ort.InferenceSession(model, providers=['CPUExecutionProvider'])
+    bound = BoundSession(ort.InferenceSession(model, providers=['CPUExecutionProvider']), reuse_outputs=True)
+    inputs = [rng.random(data.shape, dtype=np.float32) * 255.0 for _ in range(chunks)]
+    runs = [bound.run(None, {input_name: x}) for x in inputs[:2]]  # the first run allocates, the rest reuse
+    reused = bound.run(None, {input_name: inputs[0]})[0] is runs[1][0]
+    kept = [[out.copy() for out in bound.run(None, {input_name: x})] for x in inputs]
+    expected = [plain.run(None, {input_name: x}) for x in inputs]
+    max_diff = 0.0
+    for i in range(len(expected[0])):
+        a = np.concatenate([out[i] for out in kept])
+        b = np.concatenate([out[i] for out in expected])
+        if a.shape != b.shape:
+            return reused, False, float('nan')
+        max_diff = max(max_diff, float(np.abs(a.astype(np.float64) - b).max(initial=0.0)))
+    return reused, max_diff < 1e-4, max_diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX Runtime session settings sweep")
+    parser.add_argument('--model', required=True, help='ONNX file or rtmlib model zip url')
+    parser.add_argument('--batch', type=int, default=1, help='batch size for dynamic batch models')
+    parser.add_argument('--input-size', default='640,640', help='h,w for dynamic spatial dims')
+    parser.add_argument('--threads', default=None, help='intra-op thread counts, default 1,2,4,...,ncpu')
+    parser.add_argument('--inter-threads', default='1,2')
+    parser.add_argument('--graph-opts', default='basic,extended,all')
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--chunks', type=int, default=4, help='runs kept and concatenated in the I/O binding check')
+    args = parser.parse_args()
+
+    model = resolve_model(args.model)
+    input_size = [int(v) for v in args.input_size.split(',')]
+    ncpu = os.cpu_count() or 1
+    if args.threads:
+        threads = [int(v) for v in args.threads.split(',')]
+    else:
+        threads = sorted({min(t, ncpu) for t in (1, 2, 4, 8, 16)} | {ncpu})
+    inter_threads = [int(v) for v in args.inter_threads.split(',')]
+    graph_opts = args.graph_opts.split(',')
+
+    rng = np.random.default_rng(0)
+    probe = ort.InferenceSession(model, providers=['CPUExecutionProvider'])
+    input_name = probe.get_inputs()[0].name
+    data = random_input(probe, args.batch, input_size, rng)
+    print(f"Model {os.path.basename(model)}, input {input_name} {data.shape}, {ncpu} CPUs")
+    reused, identical, max_diff = check_bound_outputs(model, input_name, data, args.chunks, rng)
+    print(f"I/O binding, output buffers reused: {'yes' if reused else 'NO'}, {args.chunks} runs copied, "
+          f"concatenated, same as a plain session: {'yes' if identical else 'NO'} (max diff {max_diff:.1e})")
+
+    configs = []
+    for graph_opt, mode, intra, arena, binding in itertools.product(
+            graph_opts, ('sequential', 'parallel'), threads, (True, False), (False, True)):
+        for inter in (inter_threads if mode == 'parallel' else [1]):
+            configs.append(dict(graph_opt=graph_opt, execution_mode=mode, intra_threads=intra,
+                                inter_threads=inter, mem_arena=arena, io_binding=binding))
+
+    results = []
+    print(f"\n{'graph':>8} {'mode':>10} {'intra':>5} {'inter':>5} {'arena':>5} {'iobind':>6} | {'p50':>9} {'p90':>9}")
+    print("-" * 70)
+    for config in configs:
+        options = dict(config)
+        io_binding = options.pop('io_binding')
+        session = ort.InferenceSession(model, sess_options=session_options(**options),
+                                       providers=['CPUExecutionProvider'])
+        if io_binding:
+            session = BoundSession(session)
+        p50, p90 = time_session(session, input_name, data, args.repeats)
+        results.append((p50, p90, config))
+        print(f"{config['graph_opt']:>8} {config['execution_mode']:>10} {config['intra_threads']:>5} "
+              f"{config['inter_threads']:>5} {str(config['mem_arena']):>5} {str(io_binding):>6} | "
+              f"{p50:>7.2f}ms {p90:>7.2f}ms")
+
+    baseline = ort.InferenceSession(model, providers=['CPUExecutionProvider'])
+    base50, _ = time_session(baseline, input_name, data, args.repeats)
+    best50, best90, best = min(results, key=lambda r: r[0])
+
+    print(f"\nORT defaults: {base50:.2f}ms p50")
+    print(f"Best:         {best50:.2f}ms p50, {best90:.2f}ms p90 ({base50 / best50:.2f}x)")
+    print("\nenvironment:")
+    print(f"  - ORT_GRAPH_OPT={best['graph_opt']}")
+    print(f"  - ORT_EXECUTION_MODE={best['execution_mode']}")
+    print(f"  - ORT_INTRA_THREADS={best['intra_threads']}")
+    print(f"  - ORT_INTER_THREADS={best['inter_threads']}")
+    print(f"  - ORT_MEM_ARENA={best['mem_arena']}")
+    print(f"  - IO_BINDING={best['io_binding']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Per-frame RTMPose latency vs. number of persons, per-box vs. batched.
+
+Compares rtmlib's RTMPose (one session run per bbox) with
+pelpers.batched_rtmpose.BatchedRTMPose (one session run per frame) on CPU,
+using a synthetic 1080p frame and random person boxes. Also reports the
+max keypoint difference between both paths.
+
+Usage:
+  python test_scripts/test_rtmpose_batch_speed.py --counts 1,5,10,25,50 --repeats 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-rtmpose-onnx")))
+
+from rtmlib.tools.pose_estimation import RTMPose
+from pelpers.batched_rtmpose import BatchedRTMPose
+
+
+def random_person_boxes(n, width, height, rng):
+    """Upright person-like boxes scattered over the frame."""
+    h = rng.uniform(40, 260, size=n)
+    w = h * rng.uniform(0.3, 0.6, size=n)
+    x1 = rng.uniform(0, width - w)
+    y1 = rng.uniform(0, height - h)
+    return np.stack([x1, y1, x1 + w, y1 + h], axis=1)
+
+
+def time_call(model, frame, boxes, repeats, warmup=3):
+    for _ in range(warmup):
+        model(frame, boxes)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model(frame, boxes)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return float(np.median(samples)), float(np.percentile(samples, 90))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RTMPose per-box vs batched CPU latency")
+    parser.add_argument('--model', default='https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+                                          'rtmpose-m_simcc-body7_pt-body7_420e-256x192-e48f03d0_20230504.zip')
+    parser.add_argument('--input-size', default='192,256', help='model input size as w,h')
+    parser.add_argument('--counts', default='1,5,10,15,22,25,35,50')
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    model_input_size = tuple(int(v) for v in args.input_size.split(','))
+    counts = [int(v) for v in args.counts.split(',')]
+
+    per_box = RTMPose(onnx_model=args.model, model_input_size=model_input_size,
+                      backend='onnxruntime', device='cpu')
+    batched = BatchedRTMPose(onnx_model=args.model, model_input_size=model_input_size,
+                             backend='onnxruntime', device='cpu')
+    if batched._max_batch is not None:
+        print(f"Model has a static batch axis of {batched._max_batch}, batched path runs in chunks "
+              f"(cmds/fold_preprocess.py --dynamic-batch makes it dynamic)")
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(args.height, args.width, 3), dtype=np.uint8)
+
+    print(f"\n{'persons':>8} | {'per-box p50':>12} {'p90':>8} | {'batched p50':>12} {'p90':>8} | {'speedup':>7} | {'max |dk|':>9}")
+    print("-" * 80)
+    for n in counts:
+        boxes = random_person_boxes(n, args.width, args.height, rng)
+        ref_kpts, _ = per_box(frame, boxes)
+        new_kpts, _ = batched(frame, boxes)
+        diff = float(np.abs(ref_kpts - new_kpts).max())
+
+        a50, a90 = time_call(per_box, frame, boxes, args.repeats)
+        b50, b90 = time_call(batched, frame, boxes, args.repeats)
+        print(f"{n:>8} | {a50:>10.2f}ms {a90:>6.2f}ms | {b50:>10.2f}ms {b90:>6.2f}ms | {a50 / b50:>6.2f}x | {diff:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+ByteTrack warm restart: snapshot + detection journal, then restore after a simulated crash.
+
+Runs the worker's snapshot loop (journal every frame, snapshot every
+--every frames) on the synthetic sequence of test_bytetrack_scaling.py,
+drops the tracker at --crash (a fresh tracker, id counter reset, as in a
+new process), restores it from disk and checks that every later frame
+returns exactly the ids and boxes of an uninterrupted run. Also reports
+the snapshot write time and size and the restart time (load + replay of
+the journaled frames), the part that should stay under a second.
+'objects -> arrays' restores a ByteTrack snapshot into VectorizedByteTrack.
+
+Usage:
+  python test_scripts/test_tracker_snapshot.py --count 50 --frames 1200 --every 300 --crash 1190
+  python test_scripts/test_tracker_snapshot.py --classes 3 --per-class --keyframe-every 3
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import functools
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-bytetrack-cpu")))
+
+from boxmot.trackers.bytetrack.bytetrack import ByteTrack
+from boxmot.trackers.bytetrack.vectorized_bytetrack import VectorizedByteTrack
+from pelpers.tracker_snapshot import TrackerSnapshots
+from test_bytetrack_scaling import compare, run, synthetic_sequence
+
+
+def step(tracker, snapshots, dets, keyframe):
+    """One worker frame: journal, track, maybe snapshot. Returns (outputs, snapshot ms or None)."""
+    snapshots.record(tracker, keyframe, dets)
+    out = tracker.update(dets) if keyframe else tracker.predict_only()
+    last = snapshots.last_frame
+    start = time.perf_counter()
+    snapshots.maybe_save(tracker)
+    saved = (time.perf_counter() - start) * 1000.0 if snapshots.last_frame != last else None
+    return np.asarray(out).reshape(-1, 8), saved
+
+
+def crash_and_restore(before_class, after_class, sequence, args, directory):
+    """(outputs from --crash on, snapshot ms list, snapshot bytes, restart ms) of an interrupted run."""
+    path = os.path.join(directory, f"{before_class.func.__name__}_{after_class.func.__name__}.npz")
+    tracker, snapshots = before_class(), TrackerSnapshots(path, args.every)
+    save_ms = []
+    for i, dets in enumerate(sequence[:args.crash]):
+        keyframe = not (args.keyframe_every and i % args.keyframe_every)
+        _, saved = step(tracker, snapshots, dets, keyframe)
+        if saved is not None:
+            save_ms.append(saved)
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    snapshots.close()
+    del tracker, snapshots
+
+    # new process: nothing but the files on disk
+    start = time.perf_counter()
+    tracker, snapshots = after_class(), TrackerSnapshots(path, args.every)
+    snapshots.restore(tracker)
+    restart_ms = (time.perf_counter() - start) * 1000.0
+
+    outputs = []
+    for i, dets in enumerate(sequence[args.crash:], start=args.crash):
+        keyframe = not (args.keyframe_every and i % args.keyframe_every)
+        outputs.append(step(tracker, snapshots, dets, keyframe)[0])
+    snapshots.close()
+    return outputs, save_ms, size, restart_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ByteTrack snapshot / warm restart check")
+    parser.add_argument('--count', type=int, default=50, help='people in the synthetic scene')
+    parser.add_argument('--frames', type=int, default=1200)
+    parser.add_argument('--every', type=int, default=300, help='frames between snapshots (SNAPSHOT_EVERY)')
+    parser.add_argument('--crash', type=int, default=1190, help='frame at which the worker dies')
+    parser.add_argument('--keyframe-every', type=int, default=0, help='k > 1: predict_only between keyframes')
+    parser.add_argument('--classes', type=int, default=1, help='random detector classes')
+    parser.add_argument('--per-class', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    sequence = synthetic_sequence(args.count, args.frames, rng)
+    for dets in sequence:
+        dets[:, 5] = rng.integers(0, args.classes, len(dets))
+
+    objects = functools.partial(ByteTrack, per_class=args.per_class)
+    arrays = functools.partial(VectorizedByteTrack, per_class=args.per_class)
+    print(f"{'restart':>18} | {'snapshot':>9} {'size':>8} | {'restart':>9} {'replayed':>8} | identical")
+    print("-" * 70)
+    with tempfile.TemporaryDirectory() as directory:
+        for name, before, after in (('objects', objects, objects), ('arrays', arrays, arrays),
+                                    ('objects -> arrays', objects, arrays)):
+            _, reference = run(before, sequence, args.keyframe_every)
+            outputs, save_ms, size, restart_ms = crash_and_restore(before, after, sequence, args, directory)
+            identical, _ = compare(reference[args.crash:], outputs)
+            replayed = args.crash - (args.crash // args.every) * args.every
+            print(f"{name:>18} | {np.mean(save_ms) if save_ms else float('nan'):>7.2f}ms {size / 1024:>6.0f}kB | "
+                  f"{restart_ms:>7.1f}ms {replayed:>8} | {'yes' if identical else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Vendored helper modules: every copy of a shared pelpers module must be byte-identical.
+
+Each service image is built from its own directory (docker-compose
+``context: ./prj-...``), so helpers used by several services
+(staleness.py, latest_frame_input.py, ort_tuning.py, ...) are copied into
+each service's pelpers/. This compares the copies of each --modules entry
+found in more than one stride/prj-*/pelpers/ and exits non-zero if any
+differ. The fused detection + pose image (prj-detpose-onnx) merges the
+YOLOX and RTMPose pelpers/ into one package, which relies on the modules
+both services have being identical.
+
+Usage:
+  python test_scripts/test_vendored_pelpers.py
+  python test_scripts/test_vendored_pelpers.py --modules staleness.py,latest_frame_input.py
+"""
+
+import os
+import sys
+import glob
+import hashlib
+import argparse
+from collections import defaultdict
+
+VENDORED = ('staleness.py,latest_frame_input.py,ort_tuning.py,backend_select.py,crop_transport.py,frame_change.py,'
+            'folded_preprocess.py')
+STRIDE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride"))
+
+
+def vendored_copies(modules):
+    """{module file name: [path of every copy]} for ``modules`` present in more than one service."""
+    copies = defaultdict(list)
+    for path in sorted(glob.glob(os.path.join(STRIDE, "prj-*", "pelpers", "*.py"))):
+        name = os.path.basename(path)
+        if name in modules:
+            copies[name].append(path)
+    return {name: paths for name, paths in copies.items() if len(paths) > 1}
+
+
+def digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="check that vendored pelpers modules are identical")
+    parser.add_argument('--modules', default=VENDORED, help='comma separated module file names')
+    args = parser.parse_args()
+
+    modules = set(args.modules.split(','))
+    all_identical = True
+    for name, paths in sorted(vendored_copies(modules).items()):
+        digests = {path: digest(path) for path in paths}
+        identical = len(set(digests.values())) == 1
+        all_identical &= identical
+        services = ', '.join(os.path.basename(os.path.dirname(os.path.dirname(p))) for p in paths)
+        print(f"{name:>24} | {len(paths)} copies ({services}) | identical: {'yes' if identical else 'NO'}")
+        if not identical:
+            for path, value in digests.items():
+                print(f"{'':>24} |   {value}  {os.path.relpath(path, STRIDE)}")
+    sys.exit(0 if all_identical else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Throughput / recall of YOLOX: single 640 pass vs. tiled 640 vs. single 1280 pass.
+
+Reads frames from a video, runs each detector mode on CPU (or the given
+device) and reports ms/frame, FPS, detections per frame and, when a
+MOT-format ground truth file is given (SoccerNet gt.txt: frame,id,x,y,w,h,...),
+recall at IoU 0.5 overall and for small (far-side) persons.
+
+Usage:
+  python test_scripts/test_yolox_tiling.py --video SNMOT-153_1080p_30f.mp4 \
+      --gt SNMOT-153/gt/gt.txt --frames 200 --tile-grid 2,3 --tile-overlap 0.2
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../stride/prj-yolox-onnx")))
+
+from rtmlib.tools.object_detection import YOLOX
+from pelpers.tiled_yolox import TiledYOLOX
+
+
+def load_mot_gt(path):
+    """frame -> (N, 4) xyxy boxes."""
+    gt = defaultdict(list)
+    data = np.loadtxt(path, delimiter=',', ndmin=2)
+    for row in data:
+        frame, x, y, w, h = int(row[0]), row[2], row[3], row[4], row[5]
+        gt[frame].append([x, y, x + w, y + h])
+    return {k: np.asarray(v, dtype=np.float32) for k, v in gt.items()}
+
+
+def matched_mask(gt_boxes, det_boxes, iou_thr=0.5):
+    """Greedy one-to-one matching, returns a bool mask over gt boxes."""
+    hit = np.zeros(len(gt_boxes), dtype=bool)
+    if len(gt_boxes) == 0 or len(det_boxes) == 0:
+        return hit
+    iw = np.clip(np.minimum(gt_boxes[:, None, 2], det_boxes[None, :, 2])
+                 - np.maximum(gt_boxes[:, None, 0], det_boxes[None, :, 0]), 0, None)
+    ih = np.clip(np.minimum(gt_boxes[:, None, 3], det_boxes[None, :, 3])
+                 - np.maximum(gt_boxes[:, None, 1], det_boxes[None, :, 1]), 0, None)
+    inter = iw * ih
+    area_g = (gt_boxes[:, 2] - gt_boxes[:, 0]) * (gt_boxes[:, 3] - gt_boxes[:, 1])
+    area_d = (det_boxes[:, 2] - det_boxes[:, 0]) * (det_boxes[:, 3] - det_boxes[:, 1])
+    iou = inter / (area_g[:, None] + area_d[None, :] - inter)
+
+    used = np.zeros(len(det_boxes), dtype=bool)
+    for g, d in zip(*np.unravel_index(np.argsort(-iou, axis=None), iou.shape)):
+        if iou[g, d] < iou_thr:
+            break
+        if not hit[g] and not used[d]:
+            hit[g] = used[d] = True
+    return hit
+
+
+def as_boxes(output):
+    """rtmlib versions return either boxes or (boxes, scores)."""
+    boxes = output[0] if isinstance(output, tuple) else output
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YOLOX single-pass vs tiled throughput and recall")
+    parser.add_argument('--video', required=True)
+    parser.add_argument('--gt', default=None, help='MOT-format gt.txt, 1-indexed frames')
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--model', default='https://download.openmmlab.com/mmpose/v1/projects/rtmposev1/onnx_sdk/'
+                                          'yolox_m_8xb8-300e_humanart-c2c7a14a.zip')
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--tile-grid', default='2,3')
+    parser.add_argument('--tile-overlap', type=float, default=0.2)
+    parser.add_argument('--roi', default=None, help='x1,y1,x2,y2 pitch ROI for the tiled mode')
+    parser.add_argument('--small-px', type=float, default=50.0, help='gt height below which a person counts as small')
+    args = parser.parse_args()
+
+    tile_grid = [int(v) for v in args.tile_grid.split(',')]
+    roi = [int(v) for v in args.roi.split(',')] if args.roi else None
+    gt = load_mot_gt(args.gt) if args.gt else None
+
+    frames = []
+    cap = cv2.VideoCapture(args.video)
+    while len(frames) < args.frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    print(f"Loaded {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    modes = {}
+    modes['single-640'] = lambda: YOLOX(args.model, model_input_size=(640, 640), backend='onnxruntime', device=args.device)
+    modes[f'tiled-{tile_grid[0]}x{tile_grid[1]}'] = lambda: TiledYOLOX(
+        args.model, model_input_size=(640, 640), tile_grid=tile_grid, tile_overlap=args.tile_overlap,
+        roi=roi, backend='onnxruntime', device=args.device)
+    modes['single-1280'] = lambda: YOLOX(args.model, model_input_size=(1280, 1280), backend='onnxruntime', device=args.device)
+
+    print(f"\n{'mode':>14} | {'ms/frame':>9} {'fps':>7} | {'dets/frame':>10} | {'recall':>7} {'small':>7}")
+    print("-" * 68)
+    for name, build in modes.items():
+        try:
+            model = build()
+            as_boxes(model(frames[0]))  # warmup, also fails early for static 640 models at 1280
+        except Exception as e:
+            print(f"{name:>14} | skipped: {e}")
+            continue
+
+        n_dets, hits, total, small_hits, small_total = 0, 0, 0, 0, 0
+        elapsed = 0.0
+        for idx, frame in enumerate(frames):
+            start = time.perf_counter()
+            boxes = as_boxes(model(frame))
+            elapsed += time.perf_counter() - start
+            n_dets += len(boxes)
+
+            if gt is not None and (idx + 1) in gt:
+                gt_boxes = gt[idx + 1]
+                hit = matched_mask(gt_boxes, boxes)
+                small = (gt_boxes[:, 3] - gt_boxes[:, 1]) < args.small_px
+                hits += hit.sum()
+                total += len(gt_boxes)
+                small_hits += hit[small].sum()
+                small_total += small.sum()
+
+        ms = elapsed / len(frames) * 1000.0
+        recall = f"{hits / total:.3f}" if total else "n/a"
+        small_recall = f"{small_hits / small_total:.3f}" if small_total else "n/a"
+        print(f"{name:>14} | {ms:>9.1f} {1000.0 / ms:>7.1f} | {n_dets / len(frames):>10.1f} | {recall:>7} {small_recall:>7}")
+
+
+if __name__ == "__main__":
+    main()